@@ -0,0 +1,69 @@
+"""Add rate limit buckets
+
+Revision ID: 0c7e5b3a9d48
+Revises: b6e2d4a8c913
+Create Date: 2026-10-18 18:20:52.864017
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7e5b3a9d48'
+down_revision: Union[str, Sequence[str], None] = 'b6e2d4a8c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # UNLOGGED: Buckets dürfen bei einem Absturz verloren gehen
+    op.execute("""
+        CREATE UNLOGGED TABLE rate_limit_buckets (
+            key text NOT NULL PRIMARY KEY,
+            tokens double precision NOT NULL,
+            updated_at timestamptz NOT NULL
+        )
+    """)
+    op.create_index('ix_rate_limit_buckets_updated_at', 'rate_limit_buckets', ['updated_at'], unique=False)
+
+    # Liefert die Wartezeit in Sekunden; 0 = erlaubt, dann wurde aus allen
+    # Buckets ein Token genommen
+    op.execute("""
+        CREATE FUNCTION rate_limit_take(bucket_keys text[], capacity double precision, refill_rate double precision)
+        RETURNS double precision AS $$
+        DECLARE
+            now_ts timestamptz := clock_timestamp();
+            wait double precision;
+        BEGIN
+            INSERT INTO rate_limit_buckets (key, tokens, updated_at)
+            SELECT k, capacity, now_ts FROM unnest(bucket_keys) AS k ORDER BY k
+            ON CONFLICT (key) DO NOTHING;
+
+            -- feste Sperrreihenfolge, damit sich parallele Aufrufe nicht verklemmen
+            PERFORM 1 FROM rate_limit_buckets WHERE key = ANY(bucket_keys) ORDER BY key FOR UPDATE;
+
+            SELECT max((1 - LEAST(capacity, tokens + extract(epoch FROM now_ts - updated_at)::double precision * refill_rate)) / refill_rate)
+            INTO wait
+            FROM rate_limit_buckets WHERE key = ANY(bucket_keys);
+
+            UPDATE rate_limit_buckets
+            SET tokens = LEAST(capacity, tokens + extract(epoch FROM now_ts - updated_at)::double precision * refill_rate)
+                    - CASE WHEN wait <= 0 THEN 1 ELSE 0 END,
+                updated_at = now_ts
+            WHERE key = ANY(bucket_keys);
+
+            RETURN GREATEST(wait, 0);
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION IF EXISTS rate_limit_take(text[], double precision, double precision)")
+    op.drop_index('ix_rate_limit_buckets_updated_at', table_name='rate_limit_buckets')
+    op.execute("DROP TABLE rate_limit_buckets")
@@ -0,0 +1,49 @@
+"""Notify catalog version changes
+
+Revision ID: 1b6e0c8d92fa
+Revises: e5d18b3f7a64
+Create Date: 2026-10-18 13:05:12.640271
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b6e0c8d92fa'
+down_revision: Union[str, Sequence[str], None] = 'e5d18b3f7a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NOTIFY wird erst beim Commit zugestellt, Listener sehen also nur bestätigte Änderungen
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO catalog_versions (scope, version, updated_at)
+            VALUES (TG_ARGV[0], 1, clock_timestamp())
+            ON CONFLICT (scope) DO UPDATE
+            SET version = catalog_versions.version + 1, updated_at = clock_timestamp();
+            PERFORM pg_notify('catalog_versions', TG_ARGV[0]);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO catalog_versions (scope, version, updated_at)
+            VALUES (TG_ARGV[0], 1, clock_timestamp())
+            ON CONFLICT (scope) DO UPDATE
+            SET version = catalog_versions.version + 1, updated_at = clock_timestamp();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
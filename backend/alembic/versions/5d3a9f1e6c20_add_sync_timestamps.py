@@ -0,0 +1,35 @@
+"""Add sync timestamps
+
+Revision ID: 5d3a9f1e6c20
+Revises: f2b8c5d0e7a3
+Create Date: 2026-10-18 16:58:21.407316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d3a9f1e6c20'
+down_revision: Union[str, Sequence[str], None] = 'f2b8c5d0e7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('application_users', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.create_index('ix_application_users_user_id_updated_at', 'application_users', ['user_id', 'updated_at'], unique=False)
+
+    op.add_column('application_catalog', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.create_index('ix_application_catalog_updated_at', 'application_catalog', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_application_catalog_updated_at', table_name='application_catalog')
+    op.drop_column('application_catalog', 'updated_at')
+    op.drop_index('ix_application_users_user_id_updated_at', table_name='application_users')
+    op.drop_column('application_users', 'updated_at')
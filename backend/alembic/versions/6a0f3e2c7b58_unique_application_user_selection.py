@@ -0,0 +1,35 @@
+"""Unique application user selection
+
+Revision ID: 6a0f3e2c7b58
+Revises: 1b6e0c8d92fa
+Create Date: 2026-10-18 14:12:03.877450
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a0f3e2c7b58'
+down_revision: Union[str, Sequence[str], None] = '1b6e0c8d92fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Doppelte Einträge entfernen, der zuletzt angelegte bleibt erhalten
+    op.execute("""
+        DELETE FROM application_users a
+        USING application_users b
+        WHERE a.user_id = b.user_id
+            AND a.application_id = b.application_id
+            AND a.id < b.id
+    """)
+    op.create_unique_constraint('uq_application_users_user_application', 'application_users', ['user_id', 'application_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_application_users_user_application', 'application_users', type_='unique')
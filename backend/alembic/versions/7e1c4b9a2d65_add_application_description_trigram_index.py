@@ -0,0 +1,29 @@
+"""Add application description trigram index
+
+Revision ID: 7e1c4b9a2d65
+Revises: 0c7e5b3a9d48
+Create Date: 2026-10-18 20:12:37.418265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e1c4b9a2d65'
+down_revision: Union[str, Sequence[str], None] = '0c7e5b3a9d48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # für ":query <% description" in /api/search (als description %> :query);
+    # GIN, da hier nicht nach Abstand sortiert wird
+    op.create_index('ix_applications_description_trgm', 'applications', ['description'], unique=False, postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_description_trgm', table_name='applications', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
@@ -0,0 +1,28 @@
+"""Add application name/id index
+
+Revision ID: 8d41c7e2f5a9
+Revises: 3c2fd001584a
+Create Date: 2026-10-18 09:12:37.415201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41c7e2f5a9'
+down_revision: Union[str, Sequence[str], None] = '3c2fd001584a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_applications_name_id', 'applications', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_name_id', table_name='applications')
@@ -0,0 +1,35 @@
+"""Add foreign key indexes
+
+Revision ID: 9e4a7c1d3f02
+Revises: 6a0f3e2c7b58
+Create Date: 2026-10-18 14:48:26.301774
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a7c1d3f02'
+down_revision: Union[str, Sequence[str], None] = '6a0f3e2c7b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Der Join auf application_users (user_id, application_id) nutzt den
+    # Unique-Index uq_application_users_user_application
+    op.create_index(op.f('ix_applications_manufacturer_id'), 'applications', ['manufacturer_id'], unique=False)
+    op.create_index(op.f('ix_applications_languagemodel_id'), 'applications', ['languagemodel_id'], unique=False)
+    op.create_index(op.f('ix_applications_modelchoice_id'), 'applications', ['modelchoice_id'], unique=False)
+    op.create_index(op.f('ix_application_users_application_id'), 'application_users', ['application_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_application_users_application_id'), table_name='application_users')
+    op.drop_index(op.f('ix_applications_modelchoice_id'), table_name='applications')
+    op.drop_index(op.f('ix_applications_languagemodel_id'), table_name='applications')
+    op.drop_index(op.f('ix_applications_manufacturer_id'), table_name='applications')
@@ -0,0 +1,70 @@
+"""Add application catalog
+
+Revision ID: a7c3e91d4b20
+Revises: 4f9b2d6a1c37
+Create Date: 2026-10-18 11:42:17.503921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91d4b20'
+down_revision: Union[str, Sequence[str], None] = '4f9b2d6a1c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('application_catalog',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('manufacturer_id', sa.Integer(), nullable=True),
+    sa.Column('manufacturer_name', sa.String(), nullable=True),
+    sa.Column('languagemodel_id', sa.Integer(), nullable=True),
+    sa.Column('languagemodel_name', sa.String(), nullable=True),
+    sa.Column('modelchoice_id', sa.Integer(), nullable=True),
+    sa.Column('modelchoice_name', sa.String(), nullable=True),
+    sa.Column('areas', sa.JSON(), server_default=sa.text("'[]'"), nullable=False),
+    sa.ForeignKeyConstraint(['id'], ['applications.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_application_catalog_active_name_id', 'application_catalog', ['name', 'id'], unique=False, postgresql_where=sa.text('is_active'))
+
+    # vorhandene Anwendungen übernehmen
+    op.execute("""
+        INSERT INTO application_catalog (
+            id, name, description, is_active,
+            manufacturer_id, manufacturer_name,
+            languagemodel_id, languagemodel_name,
+            modelchoice_id, modelchoice_name,
+            areas
+        )
+        SELECT
+            a.id, a.name, a.description, a.is_active,
+            a.manufacturer_id, m.name,
+            a.languagemodel_id, lm.name,
+            a.modelchoice_id, mc.name,
+            COALESCE((
+                SELECT json_agg(json_build_object('id', ar.id, 'area', ar.area) ORDER BY ar.id)
+                FROM application_area_entry e
+                JOIN application_area ar ON ar.id = e.area_id
+                WHERE e.application_id = a.id
+            ), '[]'::json)
+        FROM applications a
+        JOIN manufacturers m ON m.id = a.manufacturer_id
+        JOIN language_models lm ON lm.id = a.languagemodel_id
+        JOIN model_choices mc ON mc.id = a.modelchoice_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_application_catalog_active_name_id', table_name='application_catalog', postgresql_where=sa.text('is_active'))
+    op.drop_table('application_catalog')
@@ -0,0 +1,96 @@
+"""Add application counts
+
+Revision ID: b6e2d4a8c913
+Revises: 5d3a9f1e6c20
+Create Date: 2026-10-18 17:41:09.227584
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d4a8c913'
+down_revision: Union[str, Sequence[str], None] = '5d3a9f1e6c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('application_counts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.Column('active', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # Statement-Trigger mit Übergangstabellen: ein UPDATE der Zählerzeile je
+    # Anweisung, auch beim Massenimport
+    op.execute("""
+        CREATE FUNCTION count_applications() RETURNS trigger AS $$
+        DECLARE
+            total_delta bigint := 0;
+            active_delta bigint := 0;
+            added bigint;
+            added_active bigint;
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                UPDATE application_counts SET total = 0, active = 0 WHERE id = 1;
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT count(*), count(*) FILTER (WHERE is_active) INTO added, added_active FROM new_rows;
+                total_delta := total_delta + added;
+                active_delta := active_delta + added_active;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                SELECT count(*), count(*) FILTER (WHERE is_active) INTO added, added_active FROM old_rows;
+                total_delta := total_delta - added;
+                active_delta := active_delta - added_active;
+            END IF;
+            IF total_delta <> 0 OR active_delta <> 0 THEN
+                UPDATE application_counts SET total = total + total_delta, active = active + active_delta WHERE id = 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE TRIGGER applications_count_insert
+        AFTER INSERT ON applications REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION count_applications()
+    """)
+    op.execute("""
+        CREATE TRIGGER applications_count_update
+        AFTER UPDATE ON applications REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION count_applications()
+    """)
+    op.execute("""
+        CREATE TRIGGER applications_count_delete
+        AFTER DELETE ON applications REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION count_applications()
+    """)
+    op.execute("""
+        CREATE TRIGGER applications_count_truncate
+        AFTER TRUNCATE ON applications
+        FOR EACH STATEMENT EXECUTE FUNCTION count_applications()
+    """)
+
+    # Tabelle bis zum Commit sperren, damit zwischen Zählung und Trigger nichts verloren geht
+    op.execute("LOCK TABLE applications IN SHARE MODE")
+    op.execute("""
+        INSERT INTO application_counts (id, total, active)
+        SELECT 1, count(*), count(*) FILTER (WHERE is_active) FROM applications
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in ('insert', 'update', 'delete', 'truncate'):
+        op.execute(f"DROP TRIGGER IF EXISTS applications_count_{trigger} ON applications")
+    op.execute("DROP FUNCTION IF EXISTS count_applications()")
+    op.drop_table('application_counts')
@@ -0,0 +1,35 @@
+"""Use GiST trigram indexes
+
+Revision ID: c3d7a2e94b16
+Revises: 9e4a7c1d3f02
+Create Date: 2026-10-18 15:31:08.642190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d7a2e94b16'
+down_revision: Union[str, Sequence[str], None] = '9e4a7c1d3f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GiST unterstützt neben % auch die Sortierung nach <-> (KNN), die
+    # GIN-Indizes werden damit überflüssig
+    op.drop_index('ix_manufacturer_name_trgm', table_name='manufacturers', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.drop_index('ix_application_name_trgm', table_name='applications', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_application_name_trgm_gist', 'applications', ['name'], unique=False, postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'})
+    op.create_index('ix_manufacturer_name_trgm_gist', 'manufacturers', ['name'], unique=False, postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_manufacturer_name_trgm_gist', table_name='manufacturers', postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'})
+    op.drop_index('ix_application_name_trgm_gist', table_name='applications', postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'})
+    op.create_index('ix_application_name_trgm', 'applications', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_manufacturer_name_trgm', 'manufacturers', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
@@ -0,0 +1,70 @@
+"""Add catalog versions
+
+Revision ID: e5d18b3f7a64
+Revises: a7c3e91d4b20
+Create Date: 2026-10-18 12:26:40.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5d18b3f7a64'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e91d4b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tabelle -> Zähler, der bei Änderungen hochgezählt wird
+VERSIONED_TABLES = {
+    'applications': 'applications',
+    'application_area_entry': 'applications',
+    'manufacturers': 'manufacturers',
+    'language_models': 'language_models',
+    'model_choices': 'model_choices',
+    'application_area': 'application_area',
+    'risk': 'risk',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('catalog_versions',
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+
+    op.execute("""
+        CREATE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO catalog_versions (scope, version, updated_at)
+            VALUES (TG_ARGV[0], 1, clock_timestamp())
+            ON CONFLICT (scope) DO UPDATE
+            SET version = catalog_versions.version + 1, updated_at = clock_timestamp();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table, scope in VERSIONED_TABLES.items():
+        op.execute(f"""
+            CREATE TRIGGER {table}_catalog_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version('{scope}')
+        """)
+
+    for scope in sorted(set(VERSIONED_TABLES.values())):
+        op.execute(f"INSERT INTO catalog_versions (scope, version, updated_at) VALUES ('{scope}', 1, now())")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_version()")
+    op.drop_table('catalog_versions')
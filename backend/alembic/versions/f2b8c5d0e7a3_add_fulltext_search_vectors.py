@@ -0,0 +1,43 @@
+"""Add full-text search vectors
+
+Revision ID: f2b8c5d0e7a3
+Revises: c3d7a2e94b16
+Create Date: 2026-10-18 16:12:44.918305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8c5d0e7a3'
+down_revision: Union[str, Sequence[str], None] = 'c3d7a2e94b16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Name (Gewicht A) und Beschreibung (Gewicht B), deutsch und englisch
+# normalisiert, da die Oberfläche zweisprachig ist
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('german', coalesce(name, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(name, '')), 'A')
+    || setweight(to_tsvector('german', coalesce(description, '')), 'B')
+    || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('applications', 'manufacturers'):
+        op.execute(f"ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED")
+    op.create_index('ix_applications_search_vector', 'applications', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_manufacturers_search_vector', 'manufacturers', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_manufacturers_search_vector', table_name='manufacturers', postgresql_using='gin')
+    op.drop_index('ix_applications_search_vector', table_name='applications', postgresql_using='gin')
+    op.drop_column('manufacturers', 'search_vector')
+    op.drop_column('applications', 'search_vector')
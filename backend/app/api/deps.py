@@ -1,31 +1,66 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app import auth, models
-from app.database import SessionLocal
+from app.config import settings
+from app.database import get_async_db, get_db
+from app.utils.user_cache import CachedUser, user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+def cached_user_for_token(payload: dict) -> CachedUser | None:
+    """Im zustandslosen Modus den User aus Cache oder Token-Claims liefern, sonst None."""
+    if not settings.jwt_stateless:
+        return None
+
+    user_id = payload.get("user_id")
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    # Claims nur verwenden, wenn der User seit Ausstellung des Tokens nicht geändert wurde
+    if "is_active" in payload and not user_cache.invalidated_since(user_id, payload.get("iat")):
+        return user_cache.put(CachedUser.from_claims(payload))
+
+    return None
+
+def loaded_user(user: models.User | None):
+    if user is None:
+        raise credentials_exception()
+
+    if settings.jwt_stateless:
+        return user_cache.put(CachedUser.from_user(user))
+
+    return user
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
     payload = auth.decode_access_token(token)
     if payload is None:
-        raise credentials_exception
+        raise credentials_exception()
+
+    cached = cached_user_for_token(payload)
+    if cached is not None:
+        return cached
 
     user = db.query(models.User).filter(models.User.id == payload.get("user_id")).first()
-    if user is None:
-        raise credentials_exception
+    return loaded_user(user)
 
-    return user
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db = Depends(get_async_db)) -> models.User:
+    payload = auth.decode_access_token(token)
+    if payload is None:
+        raise credentials_exception()
+
+    cached = cached_user_for_token(payload)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(models.User).where(models.User.id == payload.get("user_id")))
+    return loaded_user(result.scalar_one_or_none())
@@ -1,48 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import func, text
-from sqlalchemy.orm import Session, aliased, selectinload
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import func, select, text, tuple_, exists, union, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.orm import Session, aliased
+from typing import List, Optional
 from fastapi.responses import StreamingResponse
-import csv
-import io
-
-from app.database import SessionLocal
-from app.schemas import ApplicationOut, ApplicationWithManufacturerOut, CreateApplication, ApplicationStats, ApplicationUserUpdate, RiskBase, ApplicationAreaBase
-from app.models import Application, Manufacturer, User, LanguageModel, ModelChoice, ApplicationUser, Risk, ApplicationArea
+from datetime import datetime, timedelta
+import base64
+import binascii
+import json
+
+from app.config import settings
+from app.database import SessionLocal, get_db
+from app.schemas import ApplicationOut, ApplicationWithManufacturerOut, ApplicationPage, ApplicationChanges, CreateApplication, ApplicationStats, ApplicationStatsDetails, ApplicationImportResult, ApplicationUserUpdate, RiskBase, ApplicationAreaBase, Suggestion
+from app.models import Application, ApplicationCatalog, ApplicationCounts, Manufacturer, User, LanguageModel, ModelChoice, ApplicationUser, Risk, ApplicationArea, application_area_entry_table
 from app.api.deps import get_current_user
+from app.utils.application_import import IMPORT_PARSERS, format_from_content_type, import_applications
+from app.utils.catalog import CATALOG_COLUMNS, areas_column, refresh_catalog
+from app.utils.conditional import APPLICATION_SCOPES, check_not_modified, check_reference_not_modified
+from app.utils.reference_cache import reference_cache
+from app.utils.search import DEFAULT_SIMILARITY_THRESHOLD, set_similarity_threshold
+from app.utils.stats import load_user_risks, stats_cache
+from app.utils.suggest import suggest_index
+from app.utils.export import EXPORT_FORMATS, ExportFormat, ExportRow, format_from_accept
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def application_reference_errors(db: Session, data: CreateApplication, check_duplicate: bool = True) -> List[str]:
+    """
+    Prüft Name und alle referenzierten Ids auf einmal: Name und Hersteller in
+    einer Abfrage, Sprachmodell, Modellwahl und Areas aus dem reference_cache.
+    """
+    checks = [exists().where(Manufacturer.id == data.manufacturer_id).label("manufacturer")]
+    if check_duplicate:
+        checks.append(exists().where(Application.name == data.name).label("duplicate"))
+    found = db.execute(select(*checks)).one()
+
+    errors = []
+    if check_duplicate and found.duplicate:
+        errors.append("Application already exists")
+    if not found.manufacturer:
+        errors.append("Manufacturer not found")
+    if not reference_cache.get(db, "language_models", data.languagemodel_id):
+        errors.append("Language model not found")
+    if not reference_cache.get(db, "model_choices", data.modelchoice_id):
+        errors.append("Model choice not found")
+    if data.area_ids and reference_cache.missing(db, "application_area", data.area_ids):
+        errors.append("One or more area_ids are invalid.")
+    return errors
+
+def validate_application(db: Session, data: CreateApplication, check_duplicate: bool = True):
+    errors = application_reference_errors(db, data, check_duplicate)
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="; ".join(errors))
 
 @router.post("/", response_model=ApplicationOut)
 def create_application(application: CreateApplication, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    db_application = db.query(Application).filter(Application.name == application.name).first()
-    if db_application:
-        raise HTTPException(status_code=400, detail="Application already exists")
-    manufacturer = db.query(Manufacturer).filter_by(id=application.manufacturer_id).first()
-    if not manufacturer:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Manufacturer not found"
-        )
-    lm = db.query(LanguageModel).filter_by(id=application.languagemodel_id).first()
-    if not lm:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Language model not found"
-        )
-    mc = db.query(ModelChoice).filter_by(id=application.modelchoice_id).first()
-    if not mc:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Model choice not found"
-        )
+    validate_application(db, application)
 
     db_application = Application(
         name=application.name,
@@ -54,51 +67,102 @@ def create_application(application: CreateApplication, db: Session = Depends(get
     )
 
     if application.area_ids:
-        areas = db.query(ApplicationArea).filter(ApplicationArea.id.in_(application.area_ids)).all()
-
-        if len(areas) != len(application.area_ids):
-            raise HTTPException(
-                status_code=400,
-                detail="One or more area_ids are invalid."
-            )
-
-        areas = db.query(ApplicationArea).filter(ApplicationArea.id.in_(application.area_ids)).all()
-        db_application.areas = areas 
+        db_application.areas = db.query(ApplicationArea).filter(ApplicationArea.id.in_(application.area_ids)).all()
 
     db.add(db_application)
+    db.flush()
+    refresh_catalog(db, Application.id == db_application.id)
     db.commit()
     db.refresh(db_application)
+    suggest_index.upsert("application", db_application.id, db_application.name, db_application.is_active)
     return db_application
 
+async def read_body(request: Request) -> bytes:
+    return await request.body()
+
+@router.post("/import", response_model=ApplicationImportResult)
+def bulk_import_applications(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson; defaults to the Content-Type"),
+    dry_run: bool = Query(False, description="validate only, nothing is saved"),
+    body: bytes = Depends(read_body),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Not authorized to change this data")
+
+    parser = IMPORT_PARSERS.get((format or format_from_content_type(request.headers.get("content-type")) or "").lower())
+    if parser is None:
+        raise HTTPException(status_code=400, detail="Unsupported import format")
+
+    try:
+        content = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import must be UTF-8 encoded")
+
+    result = import_applications(db, parser(content))
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+        suggest_index.invalidate("applications")
+    return ApplicationImportResult(**result, dry_run=dry_run)
+
 @router.get("/risk", response_model=List[RiskBase])
-def get_risks(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return db.query(Risk).order_by(Risk.sort.asc()).all()
-
-def search_applications_by_similarity(db: Session, query: str, threshold: float = 0.3, limit: int = 10) -> List[Application]:
-    sql = text("""
-        SELECT * FROM applications
-        WHERE similarity(name, :query) > :threshold
-        ORDER BY similarity(name, :query) DESC
-        LIMIT :limit
-    """)
-    return db.execute(sql, {"query": query, "threshold": threshold, "limit": limit}).fetchall()
+def get_risks(request: Request, response: Response, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    not_modified, version = check_reference_not_modified(request, response, db, "risk")
+    if not_modified:
+        return not_modified
+    return reference_cache.rows(db, "risk", version)
+
+# % filtert über den Trigramm-Index (Schwelle per set_config), <-> liefert
+# die Top-k per KNN; der zusätzliche Vergleich hält die Schwelle exklusiv
+APPLICATION_SIMILARITY_SQL = text("""
+    SELECT id, name, description, manufacturer_id, languagemodel_id, modelchoice_id, is_active, created_at, updated_at
+    FROM applications
+    WHERE name % :query AND similarity(name, :query) > :threshold
+    ORDER BY name <-> :query
+    LIMIT :limit
+""")
+
+def search_applications_by_similarity(db: Session, query: str, threshold: float = DEFAULT_SIMILARITY_THRESHOLD, limit: int = 10) -> List[Application]:
+    set_similarity_threshold(db, threshold)
+    return db.execute(APPLICATION_SIMILARITY_SQL, {"query": query, "threshold": threshold, "limit": limit}).fetchall()
 
 @router.get("/search", response_model=list[ApplicationOut])
 def search_applications(
     q: str = Query(..., min_length=2, description="Suchbegriff"),
+    threshold: float = Query(DEFAULT_SIMILARITY_THRESHOLD, gt=0, le=1, description="Mindestähnlichkeit"),
+    limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
-    results = search_applications_by_similarity(db, query=q)
+    results = search_applications_by_similarity(db, query=q, threshold=threshold, limit=limit)
     return results
 
+@router.get("/suggest", response_model=List[Suggestion])
+def suggest_applications(
+    q: str = Query(..., min_length=1, max_length=100, description="Anfang eines Wortes im Namen"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Autovervollständigung für aktive Anwendungen und Hersteller aus dem Speicher."""
+    prefix = q.strip()
+    if not prefix:
+        raise HTTPException(status_code=422, detail="Query must not be blank")
+    return [entry._asdict() for entry in suggest_index.suggest(db, prefix, limit)]
+
 @router.get("/", response_model=List[ApplicationOut])
-def get_applications(db: Session = Depends(get_db)):
+def get_applications(request: Request, response: Response, db: Session = Depends(get_db)):
+    if not_modified := check_not_modified(request, response, db, "applications", "application_area"):
+        return not_modified
     return db.query(Application).order_by(Application.name.asc()).all()
 
-@router.get("/with-manufacturer", response_model=List[ApplicationWithManufacturerOut])
-def get_active_applications_with_manufacturer(db: Session = Depends(get_db)):
-    rows = (
-        db.query(
+def select_applications_for_user(current_user: User):
+    AU = aliased(ApplicationUser)
+
+    stmt = (
+        select(
             Application.id,
             Application.name,
             Application.description,
@@ -109,115 +173,359 @@ def get_active_applications_with_manufacturer(db: Session = Depends(get_db)):
             LanguageModel.name.label("languagemodel_name"),
             Application.modelchoice_id,
             ModelChoice.name.label("modelchoice_name"),
+            AU.id.label("applicationuser_id"),
+            AU.selected.label("applicationuser_selected"),
+            Risk.id.label("risk_id"),
+            Risk.name.label("risk_name"),
+            areas_column(),
         )
         .join(Manufacturer, Application.manufacturer_id == Manufacturer.id)
         .join(LanguageModel, Application.languagemodel_id == LanguageModel.id)
         .join(ModelChoice, Application.modelchoice_id == ModelChoice.id)
-        .filter(Application.is_active == True)
-        .order_by(Application.name.asc())
-        .all()
+        .outerjoin(AU, (AU.application_id == Application.id) & (AU.user_id == current_user.id))
+        .outerjoin(Risk, Risk.id == AU.risk_id)
+    )
+
+    if not current_user.is_admin:
+        stmt = stmt.where(Application.is_active == True)
+
+    return stmt, AU
+
+def select_active_applications():
+    return (
+        select(*ApplicationCatalog.__table__.c)
+        .where(ApplicationCatalog.is_active == True)
+        .order_by(ApplicationCatalog.name.asc(), ApplicationCatalog.id.asc())
+    )
+
+def select_application_stats():
+    """
+    Liest die von Triggern gepflegten Zähler statt COUNT(*) über applications.
+    Ohne Zählerzeile (Schema per init_db/create_all, ohne Migration und
+    Trigger) wird wie früher gezählt.
+    """
+    counts = select(ApplicationCounts.total, ApplicationCounts.active).where(ApplicationCounts.id == 1)
+    fallback = select(
+        func.count(Application.id).label("total"),
+        func.count(Application.id).filter(Application.is_active == True).label("active"),
+    ).having(~exists(counts))
+    return union_all(counts, fallback)
+
+def area_list_column():
+    """Areanamen einer Anwendung als Array, korreliert zur äußeren Abfrage."""
+    return (
+        select(
+            func.coalesce(
+                func.array_agg(aggregate_order_by(ApplicationArea.area, ApplicationArea.id)),
+                text("'{}'::varchar[]"),
+            )
+        )
+        .select_from(application_area_entry_table)
+        .join(ApplicationArea, ApplicationArea.id == application_area_entry_table.c.area_id)
+        .where(application_area_entry_table.c.application_id == Application.id)
+        .correlate(Application)
+        .scalar_subquery()
+        .label("area_list")
     )
 
-    app_ids = [r.id for r in rows]
-    area_map = {
-        app.id: [ApplicationAreaBase.model_validate(area) for area in app.areas]
-        for app in db.query(Application).options(selectinload(Application.areas)).filter(Application.id.in_(app_ids)).all()
+def active_application_row(r) -> dict:
+    return {
+        "id": r.id,
+        "name": r.name,
+        "description": r.description,
+        "is_active": r.is_active,
+        "manufacturer_id": r.manufacturer_id,
+        "manufacturer_name": r.manufacturer_name,
+        "languagemodel_id": r.languagemodel_id,
+        "languagemodel_name": r.languagemodel_name,
+        "modelchoice_id": r.modelchoice_id,
+        "modelchoice_name": r.modelchoice_name,
+        "applicationuser_id": 0,
+        "applicationuser_selected": False,
+        "areas": r.areas,
     }
 
-    result = [
-        {
-            "id": r.id,
-            "name": r.name,
-            "description": r.description,
-            "is_active": r.is_active,
-            "manufacturer_id": r.manufacturer_id,
-            "manufacturer_name": r.manufacturer_name,
-            "languagemodel_id": r.languagemodel_id,
-            "languagemodel_name": r.languagemodel_name,
-            "modelchoice_id": r.modelchoice_id,
-            "modelchoice_name": r.modelchoice_name,
-            "applicationuser_id": 0,
-            "applicationuser_selected": False,
-            "areas": area_map.get(r.id, []),
-        }
-        for r in rows
-    ]
-    return result
+def application_user_row(r) -> dict:
+    return {
+        "id": r.id,
+        "name": r.name,
+        "description": r.description,
+        "is_active": r.is_active,
+        "manufacturer_id": r.manufacturer_id,
+        "manufacturer_name": r.manufacturer_name,
+        "languagemodel_id": r.languagemodel_id,
+        "languagemodel_name": r.languagemodel_name,
+        "modelchoice_id": r.modelchoice_id,
+        "modelchoice_name": r.modelchoice_name,
+        "applicationuser_id": r.applicationuser_id if r.applicationuser_id else 0,
+        "applicationuser_selected": r.applicationuser_selected if r.applicationuser_selected else False,
+        "risk_id": r.risk_id if r.risk_id else 1,
+        "risk_name": r.risk_name if r.risk_name else "unknown",
+        "areas": r.areas,
+    }
+
+def encode_cursor(name: str, application_id: int) -> str:
+    raw = json.dumps([name, application_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        name, application_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(name, str) or not isinstance(application_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return name, application_id
+
+@router.get("/with-manufacturer", response_model=List[ApplicationWithManufacturerOut])
+def get_active_applications_with_manufacturer(request: Request, response: Response, db: Session = Depends(get_db)):
+    if not_modified := check_not_modified(request, response, db, *APPLICATION_SCOPES):
+        return not_modified
+    rows = db.execute(select_active_applications()).all()
+    return [active_application_row(r) for r in rows]
 
 @router.get("/with-manufacturer-user", response_model=List[ApplicationWithManufacturerOut])
 def get_applications_with_manufacturer(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=403, detail="Not authorized to access this data")
 
+    stmt, _ = select_applications_for_user(current_user)
+    rows = db.execute(stmt.order_by(Application.name.asc())).all()
+
+    return [application_user_row(r) for r in rows]
+
+@router.get("/with-manufacturer-user/page", response_model=ApplicationPage)
+def get_applications_with_manufacturer_page(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    manufacturer_id: Optional[int] = None,
+    languagemodel_id: Optional[int] = None,
+    modelchoice_id: Optional[int] = None,
+    area_id: Optional[int] = None,
+    risk_id: Optional[int] = None,
+    selected: Optional[bool] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if not current_user.is_active:
+        raise HTTPException(status_code=403, detail="Not authorized to access this data")
+
+    stmt, AU = select_applications_for_user(current_user)
+
+    if manufacturer_id is not None:
+        stmt = stmt.where(Application.manufacturer_id == manufacturer_id)
+    if languagemodel_id is not None:
+        stmt = stmt.where(Application.languagemodel_id == languagemodel_id)
+    if modelchoice_id is not None:
+        stmt = stmt.where(Application.modelchoice_id == modelchoice_id)
+    if area_id is not None:
+        stmt = stmt.where(
+            exists().where(
+                (application_area_entry_table.c.application_id == Application.id)
+                & (application_area_entry_table.c.area_id == area_id)
+            )
+        )
+    # Anwendungen ohne Eintrag gelten als "unknown" (risk_id 1) und nicht ausgewählt
+    if risk_id is not None:
+        stmt = stmt.where(func.coalesce(AU.risk_id, 1) == risk_id)
+    if selected is not None:
+        stmt = stmt.where(func.coalesce(AU.selected, False) == selected)
+
+    if cursor:
+        after_name, after_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Application.name, Application.id) > tuple_(after_name, after_id))
+
+    rows = db.execute(stmt.order_by(Application.name.asc(), Application.id.asc()).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].name, rows[-1].id)
+
+    return ApplicationPage(
+        items=[application_user_row(r) for r in rows],
+        next_cursor=next_cursor,
+    )
+
+def select_user_catalog(current_user: User):
+    """Wie select_applications_for_user, aber aus application_catalog."""
     AU = aliased(ApplicationUser)
+    stmt = (
+        select(
+            *(ApplicationCatalog.__table__.c[column] for column in CATALOG_COLUMNS),
+            AU.id.label("applicationuser_id"),
+            AU.selected.label("applicationuser_selected"),
+            Risk.id.label("risk_id"),
+            Risk.name.label("risk_name"),
+        )
+        .outerjoin(AU, (AU.application_id == ApplicationCatalog.id) & (AU.user_id == current_user.id))
+        .outerjoin(Risk, Risk.id == AU.risk_id)
+    )
+    return stmt, AU
 
-    query = (
-        db.query(
-            Application.id,
+def encode_sync_cursor(value: datetime) -> str:
+    raw = json.dumps([value.isoformat()]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_sync_cursor(cursor: str) -> datetime:
+    try:
+        (value,) = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        value = datetime.fromisoformat(value)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if value.tzinfo is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+@router.get("/with-manufacturer-user/changes", response_model=ApplicationChanges)
+def get_application_changes(
+    since: Optional[str] = Query(None, description="cursor of the previous response; omitted: full list"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delta-Synchronisation: Anwendungen, deren Katalogzeile oder eigene Auswahl
+    sich seit dem Cursor geändert hat. Deaktivierte Anwendungen erscheinen für
+    Nicht-Admins nur noch als Id in removed.
+    """
+    if not current_user.is_active:
+        raise HTTPException(status_code=403, detail="Not authorized to access this data")
+
+    since_value = decode_sync_cursor(since) if since else None
+
+    # updated_at ist der Beginn der schreibenden Transaktion, nicht ihr Commit;
+    # der Cursor bleibt deshalb sync_overlap_seconds hinter der Datenbankzeit
+    # und kurz zurückliegende Änderungen werden beim nächsten Abruf erneut geliefert
+    watermark = db.execute(select(func.statement_timestamp() - timedelta(seconds=settings.sync_overlap_seconds))).scalar()
+    if since_value is not None:
+        watermark = max(watermark, since_value)
+
+    stmt, _ = select_user_catalog(current_user)
+    if since_value is not None:
+        changed = union(
+            select(ApplicationCatalog.id).where(ApplicationCatalog.updated_at > since_value),
+            select(ApplicationUser.application_id).where(ApplicationUser.user_id == current_user.id, ApplicationUser.updated_at > since_value),
+        )
+        stmt = stmt.where(ApplicationCatalog.id.in_(changed))
+    elif not current_user.is_admin:
+        stmt = stmt.where(ApplicationCatalog.is_active == True)
+
+    rows = db.execute(stmt.order_by(ApplicationCatalog.name.asc(), ApplicationCatalog.id.asc())).all()
+
+    items = []
+    removed = []
+    for r in rows:
+        if r.is_active or current_user.is_admin:
+            items.append(application_user_row(r))
+        else:
+            removed.append(r.id)
+
+    return ApplicationChanges(items=items, removed=removed, cursor=encode_sync_cursor(watermark))
+
+@router.get("/stats", response_model=ApplicationStats)
+def get_application_stats(db: Session = Depends(get_db)):
+    stats = db.execute(select_application_stats()).one()
+    return ApplicationStats(total=stats.total, active=stats.active)
+
+@router.get("/stats/details", response_model=ApplicationStatsDetails)
+def get_application_stats_details(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    if not current_user.is_active:
+        raise HTTPException(status_code=403, detail="Not authorized to access this data")
+    return {**stats_cache.get(db), "risks": load_user_risks(db, current_user.id)}
+
+@router.get("/areas/", response_model=List[ApplicationAreaBase])
+def get_areas(request: Request, response: Response, db: Session = Depends(get_db)):
+    not_modified, version = check_reference_not_modified(request, response, db, "application_area")
+    if not_modified:
+        return not_modified
+    return reference_cache.rows(db, "application_area", version)
+
+EXPORT_CHUNK_SIZE = 1000
+
+def select_export_rows(user_id: int):
+    AU = aliased(ApplicationUser)
+
+    return (
+        select(
             Application.name,
             Application.description,
-            Application.is_active,
-            Application.manufacturer_id,
             Manufacturer.name.label("manufacturer_name"),
-            Application.languagemodel_id,
             LanguageModel.name.label("languagemodel_name"),
-            Application.modelchoice_id,
             ModelChoice.name.label("modelchoice_name"),
-            AU.id.label("applicationuser_id"),
             AU.selected.label("applicationuser_selected"),
-            Risk.id.label("risk_id"),
-            Risk.name.label("risk_name"),
+            func.coalesce(Risk.name, "unknown").label("risk_name"),
+            area_list_column(),
         )
         .join(Manufacturer, Application.manufacturer_id == Manufacturer.id)
         .join(LanguageModel, Application.languagemodel_id == LanguageModel.id)
         .join(ModelChoice, Application.modelchoice_id == ModelChoice.id)
-        .outerjoin(AU, (AU.application_id == Application.id) & (AU.user_id == current_user.id))
+        .outerjoin(AU, (AU.application_id == Application.id) & (AU.user_id == user_id))
         .outerjoin(Risk, Risk.id == AU.risk_id)
+        .where(Application.is_active == True)
+        .order_by(Application.name.asc(), Application.id.asc())
     )
 
-    if not current_user.is_admin:
-        query = query.filter(Application.is_active == True)
+def export_row_chunks(user_id: int):
+    """
+    Liefert die Export-Zeilen in Blöcken über einen serverseitigen Cursor.
+    Nutzt eine eigene Session, da der Generator erst nach dem Endpunkt läuft.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select_export_rows(user_id),
+            execution_options={"stream_results": True, "yield_per": EXPORT_CHUNK_SIZE},
+        )
+        for partition in result.partitions():
+            yield [
+                ExportRow(
+                    application=row.name,
+                    description=row.description,
+                    manufacturer=row.manufacturer_name,
+                    languagemodel=row.languagemodel_name,
+                    modelchoice=row.modelchoice_name,
+                    selected=bool(row.applicationuser_selected),
+                    risk=row.risk_name,
+                    areas=list(row.area_list),
+                )
+                for row in partition
+            ]
+    finally:
+        db.close()
 
-    rows = query.order_by(Application.name.asc()).all()
+def export_response(export_format: ExportFormat, db: Session, current_user: User) -> StreamingResponse:
+    if not current_user.is_active:
+        raise HTTPException(status_code=403, detail="Not authorized to retrieve this data")
 
-    app_ids = [r.id for r in rows]
-    area_map = {
-        app.id: [ApplicationAreaBase.model_validate(area) for area in app.areas]
-        for app in db.query(Application).options(selectinload(Application.areas)).filter(Application.id.in_(app_ids)).all()
-    }
+    if not export_format.available():
+        raise HTTPException(status_code=501, detail=f"Export format {export_format.name} is not available")
 
-    result = [
-        {
-            "id": r.id,
-            "name": r.name,
-            "description": r.description,
-            "is_active": r.is_active,
-            "manufacturer_id": r.manufacturer_id,
-            "manufacturer_name": r.manufacturer_name,
-            "languagemodel_id": r.languagemodel_id,
-            "languagemodel_name": r.languagemodel_name,
-            "modelchoice_id": r.modelchoice_id,
-            "modelchoice_name": r.modelchoice_name,
-            "applicationuser_id": r.applicationuser_id if r.applicationuser_id else 0,
-            "applicationuser_selected": r.applicationuser_selected if r.applicationuser_selected else False,
-            "risk_id": r.risk_id if r.risk_id else 1,
-            "risk_name": r.risk_name if r.risk_name else "unknown",
-            "areas": area_map.get(r.id, []),
-        }
-        for r in rows
-    ]
+    # Verbindung der Authentifizierung nicht über die gesamte Übertragung halten
+    db.close()
 
-    return result
+    return StreamingResponse(
+        export_format.writer(export_row_chunks(current_user.id)),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f"attachment; filename=applications.{export_format.extension}"}
+    )
 
-@router.get("/stats", response_model=ApplicationStats)
-def get_application_stats(db: Session = Depends(get_db)):
-    total_count = db.query(Application).count()
-    active_count = db.query(Application).filter(Application.is_active == True).count()
-    return ApplicationStats(total=total_count, active=active_count)
+@router.get("/export")
+def export_applications(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv, ndjson, xlsx or parquet; defaults to the Accept header, then csv"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    name = format or format_from_accept(request.headers.get("accept")) or "csv"
+    export_format = EXPORT_FORMATS.get(name.lower())
+    if export_format is None:
+        raise HTTPException(status_code=400, detail="Unsupported export format")
 
-@router.get("/areas/", response_model=List[ApplicationAreaBase])
-def get_areas(db: Session = Depends(get_db)):
-    return db.query(ApplicationArea).order_by(ApplicationArea.area).all()
+    return export_response(export_format, db, current_user)
+
+@router.get("/export/csv")
+def export_applications_csv(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return export_response(EXPORT_FORMATS["csv"], db, current_user)
 
 @router.get("/{application_id}", response_model=ApplicationOut)
 def get_application(application_id: int, db: Session = Depends(get_db)):
@@ -237,38 +545,20 @@ def update_application(
     app = db.query(Application).filter_by(id=application_id).first()
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
-    manufacturer = db.query(Manufacturer).filter_by(id=updated_data.manufacturer_id).first()
-    if not manufacturer:
-        raise HTTPException(status_code=400, detail="Manufacturer not found")
-    lm = db.query(LanguageModel).filter_by(id=updated_data.languagemodel_id).first()
-    if not lm:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Language model not found"
-        )
-    mc = db.query(ModelChoice).filter_by(id=updated_data.modelchoice_id).first()
-    if not mc:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Model choice not found"
-        )
+    validate_application(db, updated_data, check_duplicate=False)
 
     if updated_data.area_ids:
-        areas = db.query(ApplicationArea).filter(ApplicationArea.id.in_(updated_data.area_ids)).all()
-        if len(areas) != len(updated_data.area_ids):
-            raise HTTPException(
-                status_code=400,
-                detail="One or more area_ids are invalid."
-            )
-        app.areas = areas
+        app.areas = db.query(ApplicationArea).filter(ApplicationArea.id.in_(updated_data.area_ids)).all()
     else:
         app.areas = []
 
     for field, value in updated_data.model_dump().items():
         setattr(app, field, value)
 
+    refresh_catalog(db, Application.id == app.id)
     db.commit()
     db.refresh(app)
+    suggest_index.upsert("application", app.id, app.name, app.is_active)
     return app
 
 
@@ -284,6 +574,27 @@ def get_applications_by_manufacturer(manufacturer_id: int, db: Session = Depends
     return applications
 
 
+SELECTION_BATCH_LIMIT = 1000
+
+def upsert_selections(db: Session, user_id: int, selections: List[ApplicationUserUpdate]):
+    """Speichert alle Auswahlen mit einem INSERT ... ON CONFLICT DO UPDATE."""
+    stmt = pg_insert(ApplicationUser).values([
+        {
+            "user_id": user_id,
+            "application_id": selection.application_id,
+            "selected": selection.selected,
+            "risk_id": selection.risk_id,
+        }
+        for selection in selections
+    ])
+    # unveränderte Auswahlen behalten ihr updated_at (Delta-Synchronisation)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_application_users_user_application",
+        set_={"selected": stmt.excluded.selected, "risk_id": stmt.excluded.risk_id, "updated_at": func.now()},
+        where=tuple_(ApplicationUser.selected, ApplicationUser.risk_id).is_distinct_from(tuple_(stmt.excluded.selected, stmt.excluded.risk_id)),
+    )
+    db.execute(stmt)
+
 @router.post("/application_selection", response_model=ApplicationUserUpdate)
 def save_user_applications(
     app: ApplicationUserUpdate,
@@ -294,98 +605,56 @@ def save_user_applications(
     if not current_user.is_active:
         raise HTTPException(status_code=403, detail="Not authorized to change this data")
 
-    application = db.query(Application).filter_by(id=app.application_id).first()
+    application = db.query(Application.id).filter_by(id=app.application_id).first()
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Application with id {app.application_id} not found"
         )
 
-    risk = db.query(Risk).filter_by(id=app.risk_id).first()
+    risk = reference_cache.get(db, "risk", app.risk_id)
     if not risk:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Risk not found"
-        )
-
-    entry = (
-        db.query(ApplicationUser)
-        .filter_by(user_id=current_user.id, application_id=app.application_id)
-        .first()
-    )
-    if entry:
-        entry.selected = app.selected
-        entry.risk_id = app.risk_id
-    else:
-        new_entry = ApplicationUser(
-            user_id=current_user.id,
-            application_id=app.application_id,
-            selected=app.selected,
-            risk_id=app.risk_id
+            detail="Risk not found"
         )
-        db.add(new_entry)
 
+    upsert_selections(db, current_user.id, [app])
     db.commit()
     return app
 
-@router.get("/export/csv")
-def export_applications_csv(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-
+@router.post("/application_selection/batch", response_model=List[ApplicationUserUpdate])
+def save_user_applications_batch(
+    selections: List[ApplicationUserUpdate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
     if not current_user.is_active:
-        raise HTTPException(status_code=403, detail="Not authorized to retrieve this data")
+        raise HTTPException(status_code=403, detail="Not authorized to change this data")
 
-    output = io.StringIO()
-    writer = csv.writer(output, quoting=csv.QUOTE_ALL)
-    writer.writerow([
-        "Application", "Description", "Manufacturer", "LanguageModel", "ModelChoice", "Selected", "Risk", "Areas"
-    ])
+    if len(selections) > SELECTION_BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {SELECTION_BATCH_LIMIT} entries per request")
 
-    AU = aliased(ApplicationUser)
+    # mehrfach genannte Anwendungen: der letzte Eintrag gilt
+    selections = list({selection.application_id: selection for selection in selections}.values())
+    if not selections:
+        return []
 
-    data = (
-        db.query(
-            Application.id,
-            Application.name,
-            Application.description,
-            Manufacturer.name.label("manufacturer_name"),
-            LanguageModel.name.label("languagemodel_name"),
-            ModelChoice.name.label("modelchoice_name"),
-            AU.selected.label("applicationuser_selected"),
-            func.coalesce(Risk.name, "unknown").label("risk_name"),
+    application_ids = [selection.application_id for selection in selections]
+    found = set(db.execute(select(Application.id).where(Application.id.in_(application_ids))).scalars())
+    missing = [application_id for application_id in application_ids if application_id not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Applications with ids " + ", ".join(str(application_id) for application_id in missing) + " not found"
         )
-        .join(Manufacturer, Application.manufacturer_id == Manufacturer.id)
-        .join(LanguageModel, Application.languagemodel_id == LanguageModel.id)
-        .join(ModelChoice, Application.modelchoice_id == ModelChoice.id)
-        .outerjoin(AU, (AU.application_id == Application.id) & (AU.user_id == current_user.id))
-        .outerjoin(Risk, Risk.id == AU.risk_id)
-        .filter(Application.is_active == True)
-        .all()
-    )
-
-    app_ids = [r.id for r in data]
-    area_map = {
-        app.id: [area.area for area in app.areas]
-        for app in db.query(Application).options(selectinload(Application.areas)).filter(Application.id.in_(app_ids)).all()
-    }
-
-    for row in data:
-        areas = ", ".join(area_map.get(row.id, []))
-        writer.writerow([
-            row.name,
-            row.description,
-            row.manufacturer_name,
-            row.languagemodel_name,
-            row.modelchoice_name,
-            "Yes" if row.applicationuser_selected else "No",
-            row.risk_name,
-            areas
-        ])
-
-    output.seek(0)
 
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=applications.csv"}
-    )
+    if reference_cache.missing(db, "risk", {selection.risk_id for selection in selections}):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Risk not found"
+        )
 
+    upsert_selections(db, current_user.id, selections)
+    db.commit()
+    return selections
@@ -0,0 +1,81 @@
+"""
+Async-Varianten der meistgenutzten Lese-Endpunkte.
+
+Werden nur bei async_enabled = true eingebunden und vor den synchronen
+Routern registriert, sodass sie dieselben Pfade übernehmen. Die Abfragen
+selbst kommen aus den synchronen Modulen.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.api.deps import get_current_user_async
+from app.api.endpoints.applications import (
+    APPLICATION_SIMILARITY_SQL,
+    active_application_row,
+    application_user_row,
+    select_active_applications,
+    select_application_stats,
+    select_applications_for_user,
+)
+from app.api.endpoints.manufacturers import MANUFACTURER_SIMILARITY_SQL, select_manufacturers
+from app.database import get_async_db
+from app.utils.conditional import APPLICATION_SCOPES, catalog_validators, conditional_response, select_catalog_versions
+from app.utils.search import DEFAULT_SIMILARITY_THRESHOLD, SIMILARITY_THRESHOLD_SQL, similarity_threshold_params
+from app.models import Application, User
+from app.schemas import ApplicationOut, ApplicationStats, ApplicationWithManufacturerOut, ManufacturerOut
+
+applications_router = APIRouter()
+manufacturers_router = APIRouter()
+
+@applications_router.get("/search", response_model=list[ApplicationOut])
+async def search_applications(
+    q: str = Query(..., min_length=2, description="Suchbegriff"),
+    threshold: float = Query(DEFAULT_SIMILARITY_THRESHOLD, gt=0, le=1, description="Mindestähnlichkeit"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    await db.execute(SIMILARITY_THRESHOLD_SQL, similarity_threshold_params(threshold))
+    result = await db.execute(APPLICATION_SIMILARITY_SQL, {"query": q, "threshold": threshold, "limit": limit})
+    return result.fetchall()
+
+@applications_router.get("/with-manufacturer", response_model=List[ApplicationWithManufacturerOut])
+async def get_active_applications_with_manufacturer(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    versions = (await db.execute(select_catalog_versions(APPLICATION_SCOPES))).all()
+    if not_modified := conditional_response(request, response, catalog_validators(versions, APPLICATION_SCOPES)):
+        return not_modified
+    result = await db.execute(select_active_applications())
+    return [active_application_row(r) for r in result.all()]
+
+@applications_router.get("/with-manufacturer-user", response_model=List[ApplicationWithManufacturerOut])
+async def get_applications_with_manufacturer(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    if not current_user.is_active:
+        raise HTTPException(status_code=403, detail="Not authorized to access this data")
+
+    stmt, _ = select_applications_for_user(current_user)
+    result = await db.execute(stmt.order_by(Application.name.asc()))
+    return [application_user_row(r) for r in result.all()]
+
+@applications_router.get("/stats", response_model=ApplicationStats)
+async def get_application_stats(db: AsyncSession = Depends(get_async_db)):
+    stats = (await db.execute(select_application_stats())).one()
+    return ApplicationStats(total=stats.total, active=stats.active)
+
+@manufacturers_router.get("/", response_model=list[ManufacturerOut])
+async def read_manufacturers(request: Request, response: Response, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    versions = (await db.execute(select_catalog_versions(["manufacturers"]))).all()
+    if not_modified := conditional_response(request, response, catalog_validators(versions, ["manufacturers"])):
+        return not_modified
+    result = await db.execute(select_manufacturers(skip, limit))
+    return result.scalars().all()
+
+@manufacturers_router.get("/search", response_model=list[ManufacturerOut])
+async def search_manufacturers(
+    q: str = Query(..., min_length=2, description="Suchbegriff"),
+    threshold: float = Query(DEFAULT_SIMILARITY_THRESHOLD, gt=0, le=1, description="Mindestähnlichkeit"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    await db.execute(SIMILARITY_THRESHOLD_SQL, similarity_threshold_params(threshold))
+    result = await db.execute(MANUFACTURER_SIMILARITY_SQL, {"query": q, "threshold": threshold, "limit": limit})
+    return result.fetchall()
@@ -1,40 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 import secrets
 from datetime import datetime, timedelta, UTC, timezone
 from fastapi.security import OAuth2PasswordRequestForm
 from app import schemas, models, auth
-from app.database import SessionLocal
+from app.database import get_db
 from app.api import deps
 import uuid
 from app.models import AuthInvite, User, PasswordResetToken
 from app.api.deps import get_current_user
-from app.utils.email import send_email
+from app.utils.email import enqueue_email
+from app.utils.rate_limit import client_ip, rate_limiter
+from app.utils.user_cache import user_cache
 from app.config import settings
 
 router = APIRouter()
 
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-@router.post("/login", response_model=schemas.UserOut)
-def login_user(credentials: schemas.UserLogin, db: Session = Depends(get_db)):
+def authenticate_user(db: Session, credentials: schemas.UserLogin) -> User:
     user = db.query(User).filter(User.email == credentials.email).first()
     if not user or not auth.verify_password(credentials.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
-    if not auth.verify_totp(credentials.otp, user.totp_secret):
+    if not user.totp_secret or not auth.verify_totp(credentials.otp, user.totp_secret):
         raise HTTPException(status_code=401, detail="Invalid OTP code")
     if user.expire is not None and user.expire <= datetime.now(timezone.utc):
         raise HTTPException(status_code=403, detail="User account expired")
-    return user  # OTP wird im nächsten Schritt geprüft
+    return user
+
+
+@router.post("/login", response_model=schemas.UserOut)
+def login_user(credentials: schemas.UserLogin, request: Request, db: Session = Depends(get_db)):
+    rate_limiter.check("login", client_ip(request), credentials.email)
+    user = authenticate_user(db, credentials)
+    rate_limiter.refund("login", client_ip(request), credentials.email)
+    return user  # Token kommt aus /verify
+
+
+# Login in einem Schritt: Passwort und OTP prüfen, Token und Profil zurückgeben.
+# /login + /verify bleiben für ältere Clients erhalten.
+@router.post("/token", response_model=schemas.LoginResponse)
+def login_for_token(credentials: schemas.UserLogin, request: Request, db: Session = Depends(get_db)):
+    # gleicher Bucket wie /login, sonst verdoppelt der Wechsel die Versuche
+    rate_limiter.check("login", client_ip(request), credentials.email)
+    user = authenticate_user(db, credentials)
+    rate_limiter.refund("login", client_ip(request), credentials.email)
+    access_token = auth.create_access_token(auth.user_token_claims(user))
+    return {"access_token": access_token, "token_type": "bearer", "user": user}
 
 
 def login_userO(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
@@ -45,16 +55,17 @@ def login_userO(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
 
 
 @router.post("/verify", response_model=schemas.Token)
-def verify_otp(otp_data: schemas.OTPVerify, db: Session = Depends(get_db)):
+def verify_otp(otp_data: schemas.OTPVerify, request: Request, db: Session = Depends(get_db)):
+    rate_limiter.check("verify", client_ip(request), otp_data.email)
     user = db.query(User).filter(User.email == otp_data.email).first()
     if not user or not user.totp_secret:
         raise HTTPException(status_code=400, detail="OTP not set up")
     
     if not auth.verify_totp(otp_data.otp_code, user.totp_secret):
         raise HTTPException(status_code=401, detail="Invalid OTP code")
+    rate_limiter.refund("verify", client_ip(request), otp_data.email)
 
-    token_data = {"user_id": user.id, "email": user.email}
-    access_token = auth.create_access_token(token_data)
+    access_token = auth.create_access_token(auth.user_token_claims(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -131,8 +142,6 @@ def forgot_password(email: schemas.ForgotPasswordRequest, db: Session = Depends(
 
     db_token = PasswordResetToken(user_id=user.id, token=token, expires_at=expires)
     db.add(db_token)
-    db.commit()
-
 
     if settings.nginx_enabled:
         reset_url = f"https://{settings.public_url}/reset-password?token={token}"
@@ -147,7 +156,8 @@ def forgot_password(email: schemas.ForgotPasswordRequest, db: Session = Depends(
         "Your Support Team"
     )
 
-    send_email(to=email.email, subject="Password Reset for inoAIDB", body=body)
+    enqueue_email(db, to=email.email, subject="Password Reset for inoAIDB", body=body)
+    db.commit()
 
     return {"message": "If the email exists, a reset link has been sent."}
 
@@ -171,10 +181,11 @@ def reset_password(request: schemas.PasswordResetRequest, db: Session = Depends(
 
     user = db.query(User).filter(User.id == token_entry.user_id).first()
 
-    user.hashed_password = pwd_context.hash(request.new_password)
+    user.hashed_password = auth.hash_password(request.new_password)
     token_entry.used = True
 
     db.commit()
+    user_cache.invalidate(user.id)
 
     user1 = db.query(User).filter(User.id == token_entry.user_id).first()
 
@@ -1,28 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.database import SessionLocal
+from app.database import get_db
 from app.schemas import LanguageModelOut, LanguageModelCreate, LanguageModelUpdate
-from app.models import LanguageModel, User
+from app.models import Application, LanguageModel, User
 from app.api.deps import get_current_user
+from app.utils.catalog import refresh_catalog
+from app.utils.conditional import check_reference_not_modified
+from app.utils.reference_cache import reference_cache
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/", response_model=List[LanguageModelOut])
-def read_language_models(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(LanguageModel).order_by(LanguageModel.name.asc()).offset(skip).limit(limit).all()
+def read_language_models(request: Request, response: Response, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    not_modified, version = check_reference_not_modified(request, response, db, "language_models")
+    if not_modified:
+        return not_modified
+    return reference_cache.rows(db, "language_models", version)[skip:skip + limit]
 
 @router.get("/{language_model_id}", response_model=LanguageModelOut)
 def read_language_model(language_model_id: int, db: Session = Depends(get_db)):
-    lm = db.query(LanguageModel).filter(LanguageModel.id == language_model_id).first()
+    lm = reference_cache.get(db, "language_models", language_model_id)
     if not lm:
         raise HTTPException(status_code=404, detail="Language model not found")
     return lm
@@ -35,6 +34,7 @@ def create_language_model(languagemodel: LanguageModelCreate, db: Session = Depe
     lm = LanguageModel(**languagemodel.model_dump())
     db.add(lm)
     db.commit()
+    reference_cache.invalidate("language_models")
     db.refresh(lm)
     return lm
 
@@ -48,6 +48,8 @@ def update_language_model(language_model_id: int, data: LanguageModelUpdate, db:
         raise HTTPException(status_code=404, detail="Language model not found")
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(lm, field, value)
+    refresh_catalog(db, Application.languagemodel_id == lm.id)
     db.commit()
+    reference_cache.invalidate("language_models")
     db.refresh(lm)
     return lm
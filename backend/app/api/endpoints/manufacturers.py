@@ -1,22 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select, text
 from typing import List
 
-from app.database import SessionLocal
+from app.database import get_db
 from app.schemas import ManufacturerOut, ManufacturerCreate, ManufacturerUpdate
-from app.models import Manufacturer, User
+from app.models import Application, Manufacturer, User
 from app.api.deps import get_current_user
+from app.utils.catalog import refresh_catalog
+from app.utils.conditional import check_not_modified
+from app.utils.search import DEFAULT_SIMILARITY_THRESHOLD, set_similarity_threshold
+from app.utils.suggest import suggest_index
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=ManufacturerOut)
 def create_manufacturer(manufacturer: ManufacturerCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     db_manufacturer = db.query(Manufacturer).filter(Manufacturer.name == manufacturer.name).first()
@@ -26,27 +23,38 @@ def create_manufacturer(manufacturer: ManufacturerCreate, db: Session = Depends(
     db.add(new_manufacturer)
     db.commit()
     db.refresh(new_manufacturer)
+    suggest_index.upsert("manufacturer", new_manufacturer.id, new_manufacturer.name, new_manufacturer.is_active)
     return new_manufacturer
 
+def select_manufacturers(skip: int, limit: int):
+    return select(Manufacturer).order_by(Manufacturer.name.asc()).offset(skip).limit(limit)
+
 @router.get("/", response_model=list[ManufacturerOut])
-def read_manufacturers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(Manufacturer).order_by(Manufacturer.name.asc()).offset(skip).limit(limit).all()
-
-def search_manufacturers_by_similarity(db: Session, query: str, threshold: float = 0.3, limit: int = 20) -> List[Manufacturer]:
-    sql = text("""
-        SELECT * FROM manufacturers
-        WHERE similarity(name, :query) > :threshold
-        ORDER BY similarity(name, :query) DESC
-        LIMIT :limit
-    """)
-    return db.execute(sql, {"query": query, "threshold": threshold, "limit": limit}).fetchall()
+def read_manufacturers(request: Request, response: Response, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    if not_modified := check_not_modified(request, response, db, "manufacturers"):
+        return not_modified
+    return db.execute(select_manufacturers(skip, limit)).scalars().all()
+
+MANUFACTURER_SIMILARITY_SQL = text("""
+    SELECT id, name, description, is_active, created_at, updated_at
+    FROM manufacturers
+    WHERE name % :query AND similarity(name, :query) > :threshold
+    ORDER BY name <-> :query
+    LIMIT :limit
+""")
+
+def search_manufacturers_by_similarity(db: Session, query: str, threshold: float = DEFAULT_SIMILARITY_THRESHOLD, limit: int = 20) -> List[Manufacturer]:
+    set_similarity_threshold(db, threshold)
+    return db.execute(MANUFACTURER_SIMILARITY_SQL, {"query": query, "threshold": threshold, "limit": limit}).fetchall()
 
 @router.get("/search", response_model=list[ManufacturerOut])
 def search_manufacturers(
     q: str = Query(..., min_length=2, description="Suchbegriff"),
+    threshold: float = Query(DEFAULT_SIMILARITY_THRESHOLD, gt=0, le=1, description="Mindestähnlichkeit"),
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
-    results = search_manufacturers_by_similarity(db, query=q)
+    results = search_manufacturers_by_similarity(db, query=q, threshold=threshold, limit=limit)
     return results
 
 
@@ -67,8 +75,10 @@ def update_manufacturer(manufacturer_id: int, updates: ManufacturerUpdate, db: S
     for key, value in updates.model_dump().items():
         setattr(manufacturer, key, value)
 
+    refresh_catalog(db, Application.manufacturer_id == manufacturer.id)
     db.commit()
     db.refresh(manufacturer)
+    suggest_index.upsert("manufacturer", manufacturer.id, manufacturer.name, manufacturer.is_active)
     return manufacturer
 
 
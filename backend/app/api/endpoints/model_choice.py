@@ -1,20 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.database import get_db
 from app.schemas import ModelChoiceCreate, ModelChoiceOut, ModelChoiceUpdate
-from app.models import ModelChoice, User
+from app.models import Application, ModelChoice, User
 from app.api.deps import get_current_user
+from app.utils.catalog import refresh_catalog
+from app.utils.conditional import check_reference_not_modified
+from app.utils.reference_cache import reference_cache
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=ModelChoiceOut)
 def create_model_choices(mc: ModelChoiceCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     db_mc = db.query(ModelChoice).filter(ModelChoice.name == mc.name).first()
@@ -23,17 +19,21 @@ def create_model_choices(mc: ModelChoiceCreate, db: Session = Depends(get_db), c
     new_mc = ModelChoice(**mc.model_dump())
     db.add(new_mc)
     db.commit()
+    reference_cache.invalidate("model_choices")
     db.refresh(new_mc)
     return new_mc
 
 @router.get("/", response_model=list[ModelChoiceOut])
-def read_model_choices(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(ModelChoice).order_by(ModelChoice.name.asc()).offset(skip).limit(limit).all()
+def read_model_choices(request: Request, response: Response, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    not_modified, version = check_reference_not_modified(request, response, db, "model_choices")
+    if not_modified:
+        return not_modified
+    return reference_cache.rows(db, "model_choices", version)[skip:skip + limit]
 
 
 @router.get("/{modelchoice_id}", response_model=ModelChoiceOut)
 def read_model_choice(modelchoice_id: int, db: Session = Depends(get_db)):
-    mc = db.query(ModelChoice).filter(ModelChoice.id == modelchoice_id).first()
+    mc = reference_cache.get(db, "model_choices", modelchoice_id)
     if not mc:
         raise HTTPException(status_code=404, detail="Model choice not found")
     return mc
@@ -51,6 +51,8 @@ def update_model_choices(modelchoice_id: int, updates: ModelChoiceUpdate, db: Se
     for key, value in updates.model_dump().items():
         setattr(mc, key, value)
 
+    refresh_catalog(db, Application.modelchoice_id == mc.id)
     db.commit()
+    reference_cache.invalidate("model_choices")
     db.refresh(mc)
     return mc
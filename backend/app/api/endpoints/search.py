@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.database import get_db
+from app.schemas import FullTextHit, SearchHit
+from app.utils.search import DEFAULT_SIMILARITY_THRESHOLD, set_similarity_threshold
+
+router = APIRouter()
+
+# Eine Abfrage für alle Suchtypen; Anwendungen treffen auch über Wörter in
+# der Beschreibung (<%), die Rangfolge ergibt sich aus der besten Ähnlichkeit,
+# bei Gleichstand stehen Namens- vor Beschreibungstreffern
+SEARCH_SQL = text("""
+    SELECT type, id, name, description, score FROM (
+        SELECT 'application' AS type, id, name, description,
+            greatest(similarity(name, :query), word_similarity(:query, coalesce(description, ''))) AS score
+        FROM applications
+        WHERE name % :query OR :query <% description
+        UNION ALL
+        SELECT 'manufacturer', id, name, description, similarity(name, :query)
+        FROM manufacturers
+        WHERE name % :query
+        UNION ALL
+        SELECT 'language_model', id, name, description, similarity(name, :query)
+        FROM language_models
+        WHERE name % :query
+    ) hits
+    WHERE score > :threshold
+    ORDER BY score DESC, similarity(name, :query) DESC, type, name, id
+    LIMIT :limit
+""")
+
+def search_all(db: Session, query: str, threshold: float = DEFAULT_SIMILARITY_THRESHOLD, limit: int = 20):
+    set_similarity_threshold(db, threshold)
+    return db.execute(SEARCH_SQL, {"query": query, "threshold": threshold, "limit": limit}).all()
+
+@router.get("/", response_model=List[SearchHit])
+def search(
+    q: str = Query(..., min_length=2, description="Suchbegriff"),
+    threshold: float = Query(DEFAULT_SIMILARITY_THRESHOLD, gt=0, le=1, description="Mindestähnlichkeit"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    return search_all(db, query=q, threshold=threshold, limit=limit)
+
+# Anfrage in beiden Sprachen normalisieren und verodern; ts_headline erst
+# nach dem LIMIT, da es den Text erneut parst
+FULLTEXT_SQL = text("""
+    WITH query AS (
+        SELECT websearch_to_tsquery('german', :query) || websearch_to_tsquery('english', :query) AS tsq
+    ), hits AS (
+        SELECT 'application' AS type, a.id, a.name, a.description, ts_rank_cd(a.search_vector, q.tsq) AS rank
+        FROM applications a, query q
+        WHERE a.search_vector @@ q.tsq
+        UNION ALL
+        SELECT 'manufacturer', m.id, m.name, m.description, ts_rank_cd(m.search_vector, q.tsq)
+        FROM manufacturers m, query q
+        WHERE m.search_vector @@ q.tsq
+        ORDER BY rank DESC, type, name, id
+        LIMIT :limit
+    )
+    SELECT h.type, h.id, h.name, ts_headline('german', h.source, q.tsq, :headline_options) AS headline, h.rank
+    FROM (
+        -- Nutzereingaben HTML-maskieren, damit nur StartSel/StopSel als Markup ankommen
+        SELECT hits.*, replace(replace(replace(replace(replace(
+            coalesce(description, name), '&', '&amp;'), '<', '&lt;'), '>', '&gt;'), '"', '&quot;'), '''', '&#39;') AS source
+        FROM hits
+    ) h, query q
+    ORDER BY h.rank DESC, h.type, h.name, h.id
+""")
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=25, MinWords=8, MaxFragments=2"
+
+def search_fulltext(db: Session, query: str, limit: int = 20):
+    return db.execute(FULLTEXT_SQL, {"query": query, "limit": limit, "headline_options": HEADLINE_OPTIONS}).all()
+
+@router.get("/fulltext", response_model=List[FullTextHit])
+def fulltext_search(
+    q: str = Query(..., min_length=2, description="Suchbegriff (websearch-Syntax)"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    return search_fulltext(db, query=q, limit=limit)
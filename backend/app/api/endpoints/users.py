@@ -1,31 +1,23 @@
 import pyotp
 from datetime import datetime, UTC, timezone
 from dateutil.relativedelta import relativedelta
-from fastapi import APIRouter, Depends, HTTPException, status
-from passlib.context import CryptContext
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from app import auth
-from app.database import SessionLocal
+from app.database import get_db
 from app.models import PaymentToken, User
 from app.schemas import PaymentTokenCreate, PaymentTokenCreateOut, PaymentTokenOut, PaymentUsage, UserOut, UserCreate, UserUpdate, ChangePasswordRequest, RegisterRequest, RegisterResponse, UserResponse
 from app.api.deps import get_current_user
 from app.auth import generate_totp_secret, validate_invite, get_totp_uri
+from app.utils.rate_limit import client_ip, rate_limiter
 from app.utils.token import generate_unique_token
+from app.utils.user_cache import user_cache
 
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/payments", response_model=list[PaymentTokenOut])
 def list_payments(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     if not current_user.is_admin:
@@ -47,7 +39,8 @@ def create_payment(payment: PaymentTokenCreate, db: Session = Depends(get_db), c
     return db_token
 
 @router.put("/payments")
-def update_payment(payment: PaymentUsage, db: Session = Depends(get_db)):
+def update_payment(payment: PaymentUsage, request: Request, db: Session = Depends(get_db)):
+    rate_limiter.check("payments", client_ip(request), payment.email)
 
     db_token = db.query(PaymentToken).filter(PaymentToken.token == payment.token).first()
     if not db_token:
@@ -72,6 +65,8 @@ def update_payment(payment: PaymentUsage, db: Session = Depends(get_db)):
     user.expire = user.expire + relativedelta(months=db_token.duration)
     db.commit()
     db.refresh(user)
+    user_cache.invalidate(user.id)
+    rate_limiter.refund("payments", client_ip(request), payment.email)
 
     return {"success": True, "new_expiry": user.expire}
 
@@ -81,7 +76,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db), current_user: U
     db_user = db.query(User).filter((User.email == user.email) | (User.username == user.username)).first()
     if db_user:
         raise HTTPException(status_code=400, detail="User already exists")
-    hashed_pw = pwd_context.hash(user.password)
+    hashed_pw = auth.hash_password(user.password)
     totp_seed = pyotp.random_base32()
     new_user = User(
         username=user.username,
@@ -128,6 +123,7 @@ def update_user(user_id: int, updates: UserUpdate, db: Session = Depends(get_db)
 
     db.commit()
     db.refresh(user)
+    user_cache.invalidate(user.id)
     return user
 
 
@@ -153,8 +149,9 @@ def change_password(request: ChangePasswordRequest, current_user: User = Depends
     if not verify_credentials(user, request.old_password, request.totp):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    user.hashed_password= pwd_context.hash(request.new_password)
+    user.hashed_password= auth.hash_password(request.new_password)
     db.commit()
+    user_cache.invalidate(user.id)
 
     return {"detail": "Password changed successfully"}
 
@@ -178,7 +175,7 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     if db.query(User).filter(User.email == request.email).first():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already taken")
 
-    hashed_password = pwd_context.hash(request.password)
+    hashed_password = auth.hash_password(request.password)
 
     # Generate TOTP seed
     totp_seed = generate_totp_secret()
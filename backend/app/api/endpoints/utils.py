@@ -1,6 +1,16 @@
 from pathlib import Path
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.database import engine, get_db, pool_metrics
+from app.models import User
+from app.utils.email import outbox_stats
+from app.utils.hashing import hashing_pool
+from app.utils.rate_limit import rate_limiter
+from app.utils.reference_cache import reference_cache
+from app.utils.suggest import suggest_index
 
 router = APIRouter()
 
@@ -18,3 +28,18 @@ async def page_exists(file: str = Query(...)):
         raise HTTPException(status_code=404, detail="File not found")
 
     return JSONResponse(content={"exists": True})
+
+
+@router.get("/metrics")
+def get_metrics(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Not authorized to access this data")
+
+    return {
+        "hashing": hashing_pool.stats(),
+        "email_outbox": outbox_stats(db),
+        "db_pool": pool_metrics.snapshot(engine.pool),
+        "reference_cache": reference_cache.stats(),
+        "suggest_index": suggest_index.stats(),
+        "rate_limit": rate_limiter.stats(),
+    }
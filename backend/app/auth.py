@@ -7,6 +7,7 @@ from app.models import AuthInvite
 
 
 from app.config import settings
+from app.utils.hashing import hashing_pool
 
 # Passwort-Hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -16,20 +17,31 @@ SECRET_KEY = settings.jwt_secret
 ALGORITHM = settings.jwt_algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.jwt_expire_minutes
 
-# Passwort-Hash erstellen/prüfen
+# Passwort-Hash erstellen/prüfen (im begrenzten Hashing-Pool)
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return hashing_pool.run(pwd_context.hash, password)
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return hashing_pool.run(pwd_context.verify, plain, hashed)
 
 # JWT-Token erstellen
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
-    expire = datetime.now(UTC) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    now = datetime.now(UTC)
+    expire = now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    to_encode.update({"exp": expire, "iat": now})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# Claims, die get_current_user im zustandslosen Modus ohne DB-Abfrage nutzt
+def user_token_claims(user) -> dict:
+    return {
+        "user_id": user.id,
+        "email": user.email,
+        "is_active": bool(user.is_active),
+        "is_admin": bool(user.is_admin),
+        "expire": user.expire.isoformat() if user.expire else None,
+    }
+
 # JWT-Token prüfen und Nutzdaten extrahieren
 def decode_access_token(token: str):
     try:
@@ -26,6 +26,17 @@ class Settings:
         self.db_name = section["db_name"]
         self.db_user = section["db_user"]
         self.db_password = section["db_password"]
+        self.db_pool_size = section.getint("pool_size", fallback=5)
+        self.db_max_overflow = section.getint("max_overflow", fallback=10)
+        self.db_pool_timeout = section.getfloat("pool_timeout", fallback=30)
+        self.db_pool_pre_ping = section.getboolean("pool_pre_ping", fallback=True)
+        self.db_pool_recycle = section.getint("pool_recycle", fallback=-1)
+        self.db_statement_timeout = section.getint("statement_timeout", fallback=0)
+        self.db_async = section.getboolean("async_enabled", fallback=False)
+        self.reference_cache_ttl = section.getfloat("reference_cache_ttl", fallback=300)
+        self.reference_cache_listen = section.getboolean("reference_cache_listen", fallback=False)
+        self.sync_overlap_seconds = section.getfloat("sync_overlap_seconds", fallback=60)
+        self.stats_cache_ttl = section.getfloat("stats_cache_ttl", fallback=60)
 
         self.database_url = self.get_db_url()
 
@@ -33,6 +44,8 @@ class Settings:
         self.jwt_secret = jwt_section["jwt_secret"]
         self.jwt_algorithm = jwt_section["jwt_algorithm"]
         self.jwt_expire_minutes = int(jwt_section["jwt_expire_minutes"])
+        self.jwt_stateless = jwt_section.getboolean("jwt_stateless", fallback=False)
+        self.jwt_user_cache_ttl = jwt_section.getint("jwt_user_cache_ttl", fallback=60)
 
         server_section = parser["server"]
         self.host = server_section["host"]
@@ -42,6 +55,14 @@ class Settings:
         self.public_ip = server_section["public_ip"]
         self.public_url = server_section["public_url"]
         self.nginx_enabled = server_section.getboolean("nginx")
+        self.hashing_workers = server_section.getint("hashing_workers", fallback=4)
+        self.hashing_max_pending = server_section.getint("hashing_max_pending", fallback=4)
+        self.hashing_reserved_threads = server_section.getint("hashing_reserved_threads", fallback=30)
+        self.rate_limit_enabled = server_section.getboolean("rate_limit_enabled", fallback=True)
+        self.rate_limit_burst = server_section.getint("rate_limit_burst", fallback=10)
+        self.rate_limit_per_minute = server_section.getfloat("rate_limit_per_minute", fallback=5)
+        self.rate_limit_store = server_section.get("rate_limit_store", fallback="memory")
+        self.trusted_proxies = server_section.get("trusted_proxies", fallback="")
 
         application_section = parser["application"]
         self.poweredby = application_section["poweredby"]
@@ -59,10 +80,17 @@ class Settings:
         self.smtp_password  = smtp_section["smtp_password"]
         self.smtp_server  = smtp_section["smtp_server"]
         self.smtp_port  = int(smtp_section["smtp_port"])
+        self.outbox_batch_size = smtp_section.getint("outbox_batch_size", fallback=50)
+        self.outbox_max_attempts = smtp_section.getint("outbox_max_attempts", fallback=5)
+        self.outbox_poll_seconds = smtp_section.getfloat("outbox_poll_seconds", fallback=30)
+        self.outbox_backoff_seconds = smtp_section.getfloat("outbox_backoff_seconds", fallback=60)
 
     def get_db_url(self) -> str:
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}/{self.db_name}"
 
+    def get_async_db_url(self) -> str:
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}/{self.db_name}"
+
 
 def get_settings(env: str = None) -> Settings:
     if env is None:
@@ -1,27 +1,45 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import anyio.to_thread
 
 from app.config import get_settings
-from app.api.endpoints import auth, manufacturers, users, applications, language_model, model_choice, utils
-from app.database import init_db, SessionLocal
+from app.api.endpoints import auth, manufacturers, users, applications, language_model, model_choice, utils, async_read, search
+from app.database import init_db, dispose_async_engine, SessionLocal
 from app.init_data import ensure_default_invite_exists
+from app.utils.email import email_dispatcher
+from app.utils.hashing import HashingPoolSaturated, hashing_pool
+from app.utils.rate_limit import RateLimitExceeded, retry_after_header
+from app.utils.reference_cache import reference_cache, reference_cache_listener
+from app.utils.suggest import suggest_index
 
 settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    hashing_pool.check_request_threads(anyio.to_thread.current_default_thread_limiter().total_tokens, settings.hashing_reserved_threads)
     init_db()
 
     if settings.env != "test":
         db = SessionLocal()
         try:
             ensure_default_invite_exists(db)
+            reference_cache.load_all(db)
+            suggest_index.load(db)
         finally:
             db.close()
 
+        email_dispatcher.start()
+        if settings.reference_cache_listen:
+            reference_cache_listener.start()
+
     yield
 
+    reference_cache_listener.stop()
+    email_dispatcher.stop()
+    await dispose_async_engine()
+
 fastapi_kwargs = {
     "title": "inoAIDB API",
     "version": "1.0.0",
@@ -46,6 +64,22 @@ origins = [
     f"http://{settings.public_ip}:{settings.port_frontend}",
 ]
 
+@app.exception_handler(HashingPoolSaturated)
+async def hashing_pool_saturated_handler(request: Request, exc: HashingPoolSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry later"},
+        headers={"Retry-After": "1"},
+    )
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many attempts, please retry later"},
+        headers={"Retry-After": retry_after_header(exc)},
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -57,10 +91,16 @@ app.add_middleware(
 print(f"🔧 Loaded environment: {settings.env}")
 print(f"📦 DB: {settings.database_url}")
 
+# Async-Router zuerst einbinden, damit sie die gleichnamigen synchronen Routen überdecken
+if settings.db_async:
+    app.include_router(async_read.applications_router, prefix="/api/applications", tags=["application"])
+    app.include_router(async_read.manufacturers_router, prefix="/api/manufacturers", tags=["manufacturer"])
+
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(manufacturers.router, prefix="/api/manufacturers", tags=["manufacturer"])
 app.include_router(applications.router, prefix="/api/applications", tags=["application"])
 app.include_router(language_model.router, prefix="/api/languagemodels", tags=["languagemodel"])
 app.include_router(model_choice.router, prefix="/api/modelchoices", tags=["modelchoice"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
 app.include_router(utils.router, prefix="/api/utils", tags=["utils"])
@@ -1,5 +1,5 @@
 from datetime import datetime, UTC
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, Index, Table
+from sqlalchemy import BigInteger, Column, Integer, String, Boolean, ForeignKey, DateTime, Text, Index, Table, JSON, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -55,8 +55,10 @@ class Manufacturer(Base):
     is_active = Column(Boolean, default=True)
     applications = relationship("Application", back_populates="manufacturer", cascade="all, delete")
 
+    # search_vector: siehe Application
+
     __table_args__ = (
-        Index('ix_manufacturer_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_manufacturer_name_trgm_gist', 'name', postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'}),
     )
 
 
@@ -65,9 +67,9 @@ class Application(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    manufacturer_id = Column(Integer, ForeignKey("manufacturers.id"))
-    languagemodel_id = Column(Integer, ForeignKey("language_models.id"))
-    modelchoice_id = Column(Integer, ForeignKey("model_choices.id"))
+    manufacturer_id = Column(Integer, ForeignKey("manufacturers.id"), index=True)
+    languagemodel_id = Column(Integer, ForeignKey("language_models.id"), index=True)
+    modelchoice_id = Column(Integer, ForeignKey("model_choices.id"), index=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
 
@@ -79,8 +81,13 @@ class Application(Base):
 
     areas = relationship("ApplicationArea", secondary="application_area_entry", back_populates="applications")
 
+    # search_vector (generierte tsvector-Spalte für die Volltextsuche) wird
+    # nur per Migration angelegt und über app.api.endpoints.search abgefragt
+
     __table_args__ = (
-        Index('ix_application_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_application_name_trgm_gist', 'name', postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'}),
+        Index('ix_applications_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+        Index('ix_applications_name_id', 'name', 'id'),
     )
 
 class LanguageModel(Base):
@@ -117,13 +124,20 @@ class ApplicationUser(Base):
     __tablename__ = "application_users"
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False, index=True)
     selected = Column(Boolean, default=False)
     risk_id = Column(Integer, ForeignKey("risk.id"), nullable=True)
+    # Datenbankzeit wie application_catalog.updated_at, Grundlage der Delta-Synchronisation
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
     applications = relationship("Application")
     user = relationship("User")
 
+    __table_args__ = (
+        UniqueConstraint('user_id', 'application_id', name='uq_application_users_user_application'),
+        Index('ix_application_users_user_id_updated_at', 'user_id', 'updated_at'),
+    )
+
 class Risk(Base):
     __tablename__ = "risk"
     id = Column(Integer, primary_key=True, index=True)
@@ -156,3 +170,56 @@ application_area_entry_table = Table(
     Column('application_id', ForeignKey('applications.id'), primary_key=True),
     Column('area_id', ForeignKey('application_area.id'), primary_key=True)
 )
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    id = Column(Integer, primary_key=True)
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_email_outbox_pending', 'next_attempt_at', postgresql_where=text("status = 'pending'")),
+    )
+
+class ApplicationCatalog(Base):
+    """Denormalisierte Kopie des Katalogs, gepflegt über app.utils.catalog."""
+    __tablename__ = "application_catalog"
+    id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    is_active = Column(Boolean, nullable=True)
+    manufacturer_id = Column(Integer, nullable=True)
+    manufacturer_name = Column(String, nullable=True)
+    languagemodel_id = Column(Integer, nullable=True)
+    languagemodel_name = Column(String, nullable=True)
+    modelchoice_id = Column(Integer, nullable=True)
+    modelchoice_name = Column(String, nullable=True)
+    areas = Column(JSON, nullable=False, server_default=text("'[]'"))
+    # wird nur bei tatsächlich geänderten Zeilen gesetzt, siehe refresh_catalog
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_application_catalog_active_name_id', 'name', 'id', postgresql_where=text("is_active")),
+        Index('ix_application_catalog_updated_at', 'updated_at'),
+    )
+
+class CatalogVersion(Base):
+    """Änderungszähler je Tabelle, wird von Datenbank-Triggern hochgezählt."""
+    __tablename__ = "catalog_versions"
+    scope = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
+
+class ApplicationCounts(Base):
+    """Anzahl aller und aktiver Anwendungen (eine Zeile, id = 1), gepflegt von Datenbank-Triggern."""
+    __tablename__ = "application_counts"
+    id = Column(Integer, primary_key=True)
+    total = Column(BigInteger, nullable=False, default=0)
+    active = Column(BigInteger, nullable=False, default=0)
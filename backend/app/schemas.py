@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from typing import Literal, Optional, List
 from uuid import UUID
 
 # Auth
@@ -91,6 +91,9 @@ class UserLogin(BaseModel):
     password: str
     otp: str
 
+class LoginResponse(Token):
+    user: UserOut
+
 
 class RegisterRequest(BaseModel):
     username: str
@@ -195,10 +198,44 @@ class ApplicationWithManufacturerOut(BaseModel):
         "from_attributes": True
     }
 
+class ApplicationPage(BaseModel):
+    items: List[ApplicationWithManufacturerOut]
+    next_cursor: Optional[str] = None
+
+class ApplicationChanges(BaseModel):
+    items: List[ApplicationWithManufacturerOut]
+    removed: List[int]
+    cursor: str
+
 class ApplicationStats(BaseModel):
     total: int
     active: int
 
+class StatsBucket(BaseModel):
+    id: int
+    name: str
+    total: int
+    active: int
+
+class ApplicationStatsDetails(ApplicationStats):
+    manufacturers: List[StatsBucket]
+    language_models: List[StatsBucket]
+    model_choices: List[StatsBucket]
+    areas: List[StatsBucket]
+    # Risikoeinstufungen des angemeldeten Nutzers; active zählt nur aktive Anwendungen
+    risks: List[StatsBucket]
+
+class ApplicationImportError(BaseModel):
+    line: int
+    name: Optional[str] = None
+    errors: List[str]
+
+class ApplicationImportResult(BaseModel):
+    inserted: int
+    updated: int
+    errors: List[ApplicationImportError]
+    dry_run: bool = False
+
 class ApplicationUserBase(BaseModel):
     application_id: int
     selected: bool
@@ -252,6 +289,28 @@ class ModelChoiceOut(ModelChoiceBase):
     }
 
 
+# Search
+class SearchHit(BaseModel):
+    type: Literal["application", "manufacturer", "language_model"]
+    id: int
+    name: str
+    description: Optional[str] = None
+    score: float
+
+class Suggestion(BaseModel):
+    type: Literal["application", "manufacturer"]
+    id: int
+    name: str
+
+class FullTextHit(BaseModel):
+    type: Literal["application", "manufacturer"]
+    id: int
+    name: str
+    # HTML: maskierter Text, Treffer in <mark>
+    headline: str
+    rank: float
+
+
 # Payment Token
 class PaymentTokenBase(BaseModel):
     id: int
@@ -0,0 +1,333 @@
+"""
+Massenimport von Anwendungen aus CSV oder NDJSON.
+
+Die Eingabe verwendet dieselben Spalten wie der Export (Application,
+Description, Manufacturer, LanguageModel, ModelChoice, Areas) und optional
+is_active. Gültig geparste Zeilen werden per COPY in eine temporäre Tabelle
+geladen; Namen werden dort mengenbasiert zu Ids aufgelöst, fehlerhafte
+Zeilen gemeldet und die übrigen in applications und application_area_entry
+übernommen.
+"""
+import csv
+import io
+import json
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import literal_column, select, text
+from sqlalchemy.orm import Session
+
+from app.models import Application
+from app.utils.catalog import refresh_catalog
+
+
+class ImportRow(NamedTuple):
+    line: int
+    name: str
+    description: Optional[str]
+    manufacturer: Optional[str]
+    languagemodel: Optional[str]
+    modelchoice: Optional[str]
+    is_active: bool
+    areas: Optional[List[str]]
+
+
+# Spaltennamen (klein geschrieben) -> Feld
+IMPORT_COLUMNS = {
+    "application": "name",
+    "name": "name",
+    "description": "description",
+    "manufacturer": "manufacturer",
+    "languagemodel": "languagemodel",
+    "modelchoice": "modelchoice",
+    "is_active": "is_active",
+    "areas": "areas",
+}
+
+TRUE_VALUES = {"true", "1", "yes", "y"}
+FALSE_VALUES = {"false", "0", "no", "n"}
+
+
+def parse_bool(value) -> bool:
+    if value is None or value == "":
+        return True
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise ValueError("Invalid is_active value")
+
+
+def parse_areas(value) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [str(area).strip() for area in value if str(area).strip()]
+    return [area.strip() for area in str(value).split(",") if area.strip()]
+
+
+def text_or_none(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def record_fields(record: dict) -> dict:
+    return {IMPORT_COLUMNS[key.strip().lower()]: value for key, value in record.items() if key and key.strip().lower() in IMPORT_COLUMNS}
+
+
+def build_row(line: int, record: dict) -> ImportRow:
+    fields = record_fields(record)
+
+    name = text_or_none(fields.get("name"))
+    if name is None:
+        raise ValueError("Name is required")
+
+    return ImportRow(
+        line=line,
+        name=name,
+        description=text_or_none(fields.get("description")),
+        manufacturer=text_or_none(fields.get("manufacturer")),
+        languagemodel=text_or_none(fields.get("languagemodel")),
+        modelchoice=text_or_none(fields.get("modelchoice")),
+        is_active=parse_bool(fields.get("is_active")),
+        areas=parse_areas(fields["areas"]) if "areas" in fields else None,
+    )
+
+
+ParseResult = Iterator[Tuple[int, Optional[ImportRow], Optional[str], Optional[str]]]
+
+
+def parse_csv(content: str) -> ParseResult:
+    """Liefert (Zeile, ImportRow, Name, Fehler); Zeilennummern zählen den Kopf mit."""
+    reader = csv.DictReader(io.StringIO(content))
+    for record in reader:
+        try:
+            yield reader.line_num, build_row(reader.line_num, record), None, None
+        except ValueError as e:
+            yield reader.line_num, None, text_or_none(record_fields(record).get("name")), str(e)
+
+
+def parse_ndjson(content: str) -> ParseResult:
+    for line, raw in enumerate(content.splitlines(), start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            yield line, None, None, "Invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield line, None, None, "Invalid JSON"
+            continue
+        try:
+            yield line, build_row(line, record), None, None
+        except ValueError as e:
+            yield line, None, text_or_none(record_fields(record).get("name")), str(e)
+
+
+IMPORT_PARSERS = {
+    "csv": parse_csv,
+    "ndjson": parse_ndjson,
+}
+
+IMPORT_MEDIA_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def format_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    if not content_type:
+        return None
+    return IMPORT_MEDIA_TYPES.get(content_type.split(";")[0].strip().lower())
+
+
+def staging_csv(rows: Iterable[ImportRow]) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            row.line,
+            row.name,
+            row.description,
+            row.manufacturer,
+            row.languagemodel,
+            row.modelchoice,
+            "t" if row.is_active else "f",
+            json.dumps(row.areas) if row.areas is not None else None,
+        ])
+    buffer.seek(0)
+    return buffer
+
+
+STAGING_TABLE_SQL = text("""
+    CREATE TEMP TABLE import_raw (
+        line integer NOT NULL,
+        name text NOT NULL,
+        description text,
+        manufacturer text,
+        languagemodel text,
+        modelchoice text,
+        is_active boolean NOT NULL,
+        areas json
+    ) ON COMMIT DROP
+""")
+
+# Namen in einem Durchlauf per Hash-Join auflösen, statt die Staging-Zeilen
+# mehrfach zu aktualisieren
+RESOLVE_SQL = [
+    """
+    CREATE TEMP TABLE import_rows ON COMMIT DROP AS
+    SELECT r.*,
+        m.id AS manufacturer_id,
+        lm.id AS languagemodel_id,
+        mc.id AS modelchoice_id,
+        a.id AS application_id
+    FROM import_raw r
+    LEFT JOIN (SELECT name, min(id) AS id FROM manufacturers GROUP BY name) m ON m.name = r.manufacturer
+    LEFT JOIN (SELECT name, min(id) AS id FROM language_models GROUP BY name) lm ON lm.name = r.languagemodel
+    LEFT JOIN (SELECT name, min(id) AS id FROM model_choices GROUP BY name) mc ON mc.name = r.modelchoice
+    LEFT JOIN (SELECT name, min(id) AS id FROM applications GROUP BY name) a ON a.name = r.name
+    """,
+    "CREATE INDEX ON import_rows (name, line)",
+    """
+    CREATE TEMP TABLE import_areas ON COMMIT DROP AS
+    SELECT r.line, a.area, ar.id AS area_id
+    FROM import_raw r
+    CROSS JOIN LATERAL json_array_elements_text(r.areas) AS a(area)
+    LEFT JOIN (SELECT area, min(id) AS id FROM application_area GROUP BY area) ar ON ar.area = a.area
+    WHERE r.areas IS NOT NULL
+    """,
+    "CREATE INDEX ON import_areas (line)",
+    "ANALYZE import_rows",
+    "ANALYZE import_areas",
+    "CREATE TEMP TABLE import_ids (application_id integer NOT NULL, line integer NOT NULL, replace_areas boolean NOT NULL) ON COMMIT DROP",
+]
+
+IMPORT_ERRORS_SQL = text("""
+    SELECT r.line, r.name,
+        r.manufacturer_id IS NULL AS missing_manufacturer,
+        r.languagemodel_id IS NULL AS missing_languagemodel,
+        r.modelchoice_id IS NULL AS missing_modelchoice,
+        (SELECT array_agg(ia.area ORDER BY ia.area) FROM import_areas ia WHERE ia.line = r.line AND ia.area_id IS NULL) AS missing_areas,
+        EXISTS (SELECT 1 FROM import_rows d WHERE d.name = r.name AND d.line < r.line) AS duplicate
+    FROM import_rows r
+    WHERE r.manufacturer_id IS NULL
+        OR r.languagemodel_id IS NULL
+        OR r.modelchoice_id IS NULL
+        OR EXISTS (SELECT 1 FROM import_areas ia WHERE ia.line = r.line AND ia.area_id IS NULL)
+        OR EXISTS (SELECT 1 FROM import_rows d WHERE d.name = r.name AND d.line < r.line)
+    ORDER BY r.line
+""")
+
+UPSERT_SQL = {
+    "update": text("""
+        UPDATE applications a SET
+            description = r.description,
+            manufacturer_id = r.manufacturer_id,
+            languagemodel_id = r.languagemodel_id,
+            modelchoice_id = r.modelchoice_id,
+            is_active = r.is_active,
+            updated_at = now()
+        FROM import_rows r
+        WHERE r.application_id = a.id
+    """),
+    "insert": text("""
+        WITH inserted AS (
+            INSERT INTO applications (name, description, manufacturer_id, languagemodel_id, modelchoice_id, is_active, created_at, updated_at)
+            SELECT name, description, manufacturer_id, languagemodel_id, modelchoice_id, is_active, now(), now()
+            FROM import_rows
+            WHERE application_id IS NULL
+            ORDER BY line
+            RETURNING id, name
+        )
+        INSERT INTO import_ids (application_id, line, replace_areas)
+        SELECT i.id, r.line, false
+        FROM inserted i
+        JOIN import_rows r ON r.name = i.name
+    """),
+    "existing_ids": text("""
+        INSERT INTO import_ids (application_id, line, replace_areas)
+        SELECT application_id, line, areas IS NOT NULL
+        FROM import_rows
+        WHERE application_id IS NOT NULL
+    """),
+    "clear_areas": text("""
+        DELETE FROM application_area_entry e
+        USING import_ids i
+        WHERE e.application_id = i.application_id AND i.replace_areas
+    """),
+    "insert_areas": text("""
+        INSERT INTO application_area_entry (application_id, area_id)
+        SELECT DISTINCT i.application_id, ia.area_id
+        FROM import_ids i
+        JOIN import_areas ia ON ia.line = i.line
+    """),
+}
+
+
+def row_errors(row) -> List[str]:
+    errors = []
+    if row.duplicate:
+        errors.append("Duplicate name in import")
+    if row.missing_manufacturer:
+        errors.append("Manufacturer not found")
+    if row.missing_languagemodel:
+        errors.append("Language model not found")
+    if row.missing_modelchoice:
+        errors.append("Model choice not found")
+    if row.missing_areas:
+        errors.append("Unknown areas: " + ", ".join(row.missing_areas))
+    return errors
+
+
+def import_applications(db: Session, parsed: ParseResult) -> dict:
+    """
+    Übernimmt alle fehlerfreien Zeilen; fehlerhafte Zeilen werden nur
+    gemeldet. Committet nicht, damit der Aufrufer einen Probelauf
+    zurückrollen kann.
+    """
+    errors = []
+    rows = []
+    for line, row, name, error in parsed:
+        if error is not None:
+            errors.append({"line": line, "name": name, "errors": [error]})
+        else:
+            rows.append(row)
+
+    if not rows:
+        return {"inserted": 0, "updated": 0, "errors": errors}
+
+    # parallele Importe nacheinander ausführen, sonst entstehen doppelte Namen
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext('application_import'))"))
+    db.execute(STAGING_TABLE_SQL)
+
+    with db.connection().connection.cursor() as cursor:
+        cursor.copy_expert(
+            "COPY import_raw (line, name, description, manufacturer, languagemodel, modelchoice, is_active, areas) FROM STDIN WITH (FORMAT csv)",
+            staging_csv(rows),
+        )
+
+    for statement in RESOLVE_SQL:
+        db.execute(text(statement))
+
+    invalid = db.execute(IMPORT_ERRORS_SQL).all()
+    if invalid:
+        errors.extend({"line": row.line, "name": row.name, "errors": row_errors(row)} for row in invalid)
+        db.execute(text("DELETE FROM import_rows WHERE line = ANY(:lines)"), {"lines": [row.line for row in invalid]})
+    errors.sort(key=lambda error: error["line"])
+
+    updated = db.execute(UPSERT_SQL["update"]).rowcount
+    db.execute(UPSERT_SQL["existing_ids"])
+    inserted = db.execute(UPSERT_SQL["insert"]).rowcount
+    db.execute(UPSERT_SQL["clear_areas"])
+    db.execute(UPSERT_SQL["insert_areas"])
+
+    refresh_catalog(db, Application.id.in_(select(literal_column("application_id")).select_from(text("import_ids"))))
+    return {"inserted": inserted, "updated": updated, "errors": errors}
@@ -0,0 +1,104 @@
+"""
+Pflege der denormalisierten Katalogtabelle application_catalog.
+
+Die Tabelle enthält je Anwendung die Namen von Hersteller, Sprachmodell und
+Modellwahl sowie die Areas als JSON. Schreibende Endpunkte aktualisieren nur
+die betroffenen Zeilen in derselben Transaktion, sodass Lesezugriffe ohne
+Joins auskommen.
+"""
+from sqlalchemy import cast, exists, func, select, text, tuple_, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.orm import Session
+
+from app.models import Application, ApplicationArea, ApplicationCatalog, LanguageModel, Manufacturer, ModelChoice, application_area_entry_table
+
+
+def areas_column():
+    """Areas einer Anwendung als JSON-Liste, korreliert zur äußeren Abfrage."""
+    return (
+        select(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object("id", ApplicationArea.id, "area", ApplicationArea.area),
+                        ApplicationArea.id,
+                    )
+                ),
+                text("'[]'::json"),
+            )
+        )
+        .select_from(application_area_entry_table)
+        .join(ApplicationArea, ApplicationArea.id == application_area_entry_table.c.area_id)
+        .where(application_area_entry_table.c.application_id == Application.id)
+        .correlate(Application)
+        .scalar_subquery()
+        .label("areas")
+    )
+
+
+def select_catalog_source():
+    return (
+        select(
+            Application.id,
+            Application.name,
+            Application.description,
+            Application.is_active,
+            Application.manufacturer_id,
+            Manufacturer.name.label("manufacturer_name"),
+            Application.languagemodel_id,
+            LanguageModel.name.label("languagemodel_name"),
+            Application.modelchoice_id,
+            ModelChoice.name.label("modelchoice_name"),
+            areas_column(),
+        )
+        .join(Manufacturer, Application.manufacturer_id == Manufacturer.id)
+        .join(LanguageModel, Application.languagemodel_id == LanguageModel.id)
+        .join(ModelChoice, Application.modelchoice_id == ModelChoice.id)
+    )
+
+
+CATALOG_COLUMNS = [
+    "id",
+    "name",
+    "description",
+    "is_active",
+    "manufacturer_id",
+    "manufacturer_name",
+    "languagemodel_id",
+    "languagemodel_name",
+    "modelchoice_id",
+    "modelchoice_name",
+    "areas",
+]
+
+
+def catalog_values(table_columns, columns):
+    # json hat keinen Gleichheitsoperator, daher als Text vergleichen
+    return [cast(table_columns[column], Text) if column == "areas" else table_columns[column] for column in columns]
+
+
+def refresh_catalog(db: Session, *conditions) -> None:
+    """
+    Schreibt die Katalogzeilen aller Anwendungen neu, die die Bedingungen
+    erfüllen (ohne Bedingung: alle). Nur tatsächlich geänderte Zeilen werden
+    überschrieben und erhalten ein neues updated_at. Committet nicht, damit
+    die Aktualisierung Teil der Transaktion des Aufrufers bleibt.
+    """
+    db.flush()
+    source = select_catalog_source()
+    if conditions:
+        source = source.where(*conditions)
+
+    stmt = insert(ApplicationCatalog).from_select(CATALOG_COLUMNS, source)
+    columns = [column for column in CATALOG_COLUMNS if column != "id"]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ApplicationCatalog.id],
+        set_={**{column: stmt.excluded[column] for column in columns}, "updated_at": func.now()},
+        where=tuple_(*catalog_values(ApplicationCatalog.__table__.c, columns)).is_distinct_from(tuple_(*catalog_values(stmt.excluded, columns))),
+    )
+    db.execute(stmt)
+
+
+def backfill_catalog(db: Session) -> None:
+    """Legt fehlende Katalogzeilen an, z. B. nach create_all über vorhandene Anwendungen."""
+    refresh_catalog(db, ~exists().where(ApplicationCatalog.id == Application.id))
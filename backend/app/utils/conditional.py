@@ -0,0 +1,95 @@
+"""
+Bedingte GET-Anfragen (ETag / Last-Modified) für Katalog- und Stammdaten.
+
+Trigger der Datenbank erhöhen bei jeder Änderung an einer Tabelle deren
+Zähler in catalog_versions. Aus den Zählern der betroffenen Tabellen
+entstehen ETag und Last-Modified, sodass eine unveränderte Antwort mit 304
+beantwortet wird, ohne die eigentliche Abfrage auszuführen.
+"""
+import hashlib
+from datetime import datetime, UTC
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import NamedTuple, Optional, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import CatalogVersion
+
+
+# Tabellen, deren Änderungen die Katalogansichten betreffen
+APPLICATION_SCOPES = ("applications", "manufacturers", "language_models", "model_choices", "application_area")
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: datetime
+
+
+def select_catalog_versions(scopes: Sequence[str]):
+    return select(CatalogVersion.scope, CatalogVersion.version, CatalogVersion.updated_at).where(CatalogVersion.scope.in_(scopes))
+
+
+def catalog_validators(rows, scopes: Sequence[str]) -> Optional[Validators]:
+    """Ohne Zähler für alle Tabellen (z. B. ohne Migration) wird nichts zwischengespeichert."""
+    versions = {row.scope: row for row in rows}
+    if any(scope not in versions for scope in scopes):
+        return None
+
+    key = ";".join(f"{scope}:{versions[scope].version}:{versions[scope].updated_at.isoformat()}" for scope in sorted(scopes))
+    etag = 'W/"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+    last_modified = max(versions[scope].updated_at for scope in scopes)
+    return Validators(etag, last_modified.astimezone(UTC).replace(microsecond=0))
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # schwacher Vergleich, If-Modified-Since wird dann ignoriert
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or validators.etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return validators.last_modified <= since
+
+    return False
+
+
+def conditional_response(request: Request, response: Response, validators: Optional[Validators]) -> Optional[Response]:
+    """
+    Setzt die Validierungs-Header auf der Antwort und liefert eine 304-Antwort,
+    falls der Client bereits den aktuellen Stand hat.
+    """
+    if validators is None:
+        return None
+
+    headers = {
+        "ETag": validators.etag,
+        "Last-Modified": format_datetime(validators.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if is_not_modified(request, validators):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
+def check_not_modified(request: Request, response: Response, db: Session, *scopes: str) -> Optional[Response]:
+    rows = db.execute(select_catalog_versions(scopes)).all()
+    return conditional_response(request, response, catalog_validators(rows, scopes))
+
+
+def check_reference_not_modified(request: Request, response: Response, db: Session, scope: str) -> tuple[Optional[Response], Optional[int]]:
+    """Wie check_not_modified für eine Tabelle; liefert zusätzlich deren Zähler für reference_cache.rows."""
+    rows = db.execute(select_catalog_versions([scope])).all()
+    version = rows[0].version if rows else None
+    return conditional_response(request, response, catalog_validators(rows, [scope])), version
@@ -1,17 +1,32 @@
+import logging
 import smtplib
+import threading
+from datetime import datetime, timedelta, UTC
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from pathlib import Path
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
 from app.config import settings
+from app.database import SessionLocal
+from app.models import EmailOutbox
 
+logger = logging.getLogger(__name__)
 
-def send_email(to: str, subject: str, body: str):
+
+def build_message(to: str, subject: str, body: str) -> MIMEMultipart:
     message = MIMEMultipart()
     message["Subject"] = subject
     message["From"] = settings.sender_email
     message["To"] = to
 
     message.attach(MIMEText(body, "plain"))
+    return message
+
+
+def send_email(to: str, subject: str, body: str):
+    message = build_message(to, subject, body)
 
     try:
         with smtplib.SMTP_SSL(settings.smtp_server, settings.smtp_port) as server:
@@ -20,3 +35,135 @@ def send_email(to: str, subject: str, body: str):
             print(f"Email sent to {to}")
     except Exception as e:
         print(f"Failed to send email: {e}")
+
+
+def enqueue_email(db: Session, to: str, subject: str, body: str) -> EmailOutbox:
+    """
+    Legt eine E-Mail im Outbox-Table ab. Der Aufrufer committet, damit die
+    Mail zusammen mit den übrigen Änderungen der Transaktion gespeichert wird.
+    """
+    entry = EmailOutbox(recipient=to, subject=subject, body=body)
+    db.add(entry)
+    event.listen(db, "after_commit", lambda session: email_dispatcher.wake(), once=True)
+    return entry
+
+
+def outbox_stats(db: Session) -> dict:
+    counts = dict(
+        db.query(EmailOutbox.status, func.count(EmailOutbox.id))
+        .group_by(EmailOutbox.status)
+        .all()
+    )
+    return {
+        "pending": counts.get("pending", 0),
+        "failed": counts.get("failed", 0),
+    }
+
+
+class EmailDispatcher:
+    """
+    Hintergrund-Thread, der fällige Outbox-Einträge stapelweise über eine
+    einzige SMTP-Verbindung versendet und Fehlschläge mit exponentiellem
+    Backoff erneut versucht.
+    """
+
+    def __init__(self, batch_size: int, max_attempts: int, poll_seconds: float, backoff_seconds: float):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self.backoff_seconds = backoff_seconds
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            db = SessionLocal()
+            try:
+                sent = self.dispatch_pending(db)
+            except Exception:
+                logger.exception("Email dispatcher error")
+                sent = 0
+            finally:
+                db.close()
+
+            # volle Charge: sofort weitermachen, sonst auf neue Mails warten
+            if sent < self.batch_size:
+                self._wakeup.wait(self.poll_seconds)
+
+    def backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=self.backoff_seconds * (2 ** (attempts - 1)))
+
+    def dispatch_pending(self, db: Session) -> int:
+        now = datetime.now(UTC)
+        entries = (
+            db.query(EmailOutbox)
+            .filter(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at.asc())
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not entries:
+            db.rollback()
+            return 0
+
+        handled = set()
+        try:
+            with smtplib.SMTP_SSL(settings.smtp_server, settings.smtp_port) as server:
+                server.login(settings.sender_email, settings.smtp_password)
+                for entry in entries:
+                    try:
+                        message = build_message(entry.recipient, entry.subject, entry.body)
+                        server.sendmail(settings.sender_email, entry.recipient, message.as_string())
+                    except smtplib.SMTPServerDisconnected:
+                        raise
+                    except Exception as e:
+                        self._mark_failed(entry, e)
+                    else:
+                        entry.status = "sent"
+                        entry.sent_at = datetime.now(UTC)
+                        entry.attempts += 1
+                    handled.add(entry.id)
+        except Exception as e:
+            # Verbindung/Login fehlgeschlagen: alle noch offenen Mails der Charge verschieben
+            for entry in entries:
+                if entry.id not in handled:
+                    self._mark_failed(entry, e)
+
+        db.commit()
+        return len(entries)
+
+    def _mark_failed(self, entry: EmailOutbox, error: Exception):
+        entry.attempts += 1
+        entry.last_error = str(error)
+        if entry.attempts >= self.max_attempts:
+            entry.status = "failed"
+        else:
+            entry.next_attempt_at = datetime.now(UTC) + self.backoff(entry.attempts)
+
+
+email_dispatcher = EmailDispatcher(
+    batch_size=settings.outbox_batch_size,
+    max_attempts=settings.outbox_max_attempts,
+    poll_seconds=settings.outbox_poll_seconds,
+    backoff_seconds=settings.outbox_backoff_seconds,
+)
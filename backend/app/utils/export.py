@@ -0,0 +1,199 @@
+"""
+Writer für den Anwendungs-Export.
+
+Alle Writer konsumieren dieselbe Zeilenquelle: einen Iterator über Blöcke
+von Zeilen (Listen von ExportRow) und liefern die Datei stückweise als str
+bzw. bytes, sodass StreamingResponse sie direkt weiterreichen kann.
+xlsxwriter und pyarrow sind optional und werden erst bei Bedarf importiert.
+"""
+import csv
+import importlib.util
+import io
+import json
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+
+class ExportRow(NamedTuple):
+    application: str
+    description: Optional[str]
+    manufacturer: str
+    languagemodel: str
+    modelchoice: str
+    selected: bool
+    risk: str
+    areas: List[str]
+
+
+EXPORT_HEADER = ["Application", "Description", "Manufacturer", "LanguageModel", "ModelChoice", "Selected", "Risk", "Areas"]
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def display_values(row: ExportRow) -> list:
+    return [
+        row.application,
+        row.description,
+        row.manufacturer,
+        row.languagemodel,
+        row.modelchoice,
+        "Yes" if row.selected else "No",
+        row.risk,
+        ", ".join(row.areas),
+    ]
+
+
+class _LineWriter:
+    def write(self, value):
+        return value
+
+
+def csv_stream(chunks: Iterable[List[ExportRow]]) -> Iterator[str]:
+    writer = csv.writer(_LineWriter(), quoting=csv.QUOTE_ALL)
+    yield writer.writerow(EXPORT_HEADER)
+    for chunk in chunks:
+        yield "".join(writer.writerow(display_values(row)) for row in chunk)
+
+
+def ndjson_stream(chunks: Iterable[List[ExportRow]]) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(json.dumps(row._asdict(), ensure_ascii=False) + "\n" for row in chunk)
+
+
+def xlsx_stream(chunks: Iterable[List[ExportRow]]) -> Iterator[bytes]:
+    import xlsxwriter
+
+    # constant_memory schreibt jede Zeile sofort in die temporäre Datei
+    with tempfile.TemporaryFile() as output:
+        workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+        worksheet = workbook.add_worksheet("Applications")
+        worksheet.write_row(0, 0, EXPORT_HEADER)
+        row_index = 1
+        for chunk in chunks:
+            for row in chunk:
+                worksheet.write_row(row_index, 0, display_values(row))
+                row_index += 1
+        workbook.close()
+
+        output.seek(0)
+        while data := output.read(FILE_CHUNK_SIZE):
+            yield data
+
+
+class _ChunkSink(io.RawIOBase):
+    """Schreibziel für pyarrow, das geschriebene Bytes zum Abholen puffert."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer.extend(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def parquet_stream(chunks: Iterable[List[ExportRow]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("application", pa.string()),
+        ("description", pa.string()),
+        ("manufacturer", pa.string()),
+        ("languagemodel", pa.string()),
+        ("modelchoice", pa.string()),
+        ("selected", pa.bool_()),
+        ("risk", pa.string()),
+        ("areas", pa.list_(pa.string())),
+    ])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    for chunk in chunks:
+        if not chunk:
+            continue
+        columns = list(zip(*chunk))
+        writer.write_table(pa.Table.from_arrays([pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema))
+        if data := sink.drain():
+            yield data
+    writer.close()
+    if data := sink.drain():
+        yield data
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    name: str
+    media_type: str
+    extension: str
+    writer: Callable[[Iterable[List[ExportRow]]], Iterator]
+    requires: Optional[str] = None
+
+    def available(self) -> bool:
+        return self.requires is None or importlib.util.find_spec(self.requires) is not None
+
+
+EXPORT_FORMATS = {
+    "csv": ExportFormat("csv", "text/csv", "csv", csv_stream),
+    "ndjson": ExportFormat("ndjson", "application/x-ndjson", "ndjson", ndjson_stream),
+    "xlsx": ExportFormat("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx", xlsx_stream, requires="xlsxwriter"),
+    "parquet": ExportFormat("parquet", "application/vnd.apache.parquet", "parquet", parquet_stream, requires="pyarrow"),
+}
+
+MEDIA_TYPE_ALIASES = {
+    "application/x-parquet": "parquet",
+}
+
+# Senden viele Clients ohnehin mit (axios: "application/json, text/plain, */*");
+# entscheidet nur, wenn der Typ allein oder mit dem höchsten q-Wert angefragt wird
+WEAK_MEDIA_TYPE_ALIASES = {
+    "application/json": "ndjson",
+}
+
+
+def parse_accept(accept: str) -> List[tuple]:
+    """(Medientyp, q) nach q absteigend, bei Gleichstand in Reihenfolge des Headers; q=0 entfällt."""
+    entries = []
+    for part in accept.split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            entries.append((media_type.lower(), q))
+    return sorted(entries, key=lambda entry: -entry[1])
+
+
+def format_from_accept(accept: Optional[str]) -> Optional[str]:
+    if not accept:
+        return None
+    entries = parse_accept(accept)
+    media_types = {export_format.media_type: export_format.name for export_format in EXPORT_FORMATS.values()}
+    for index, (media_type, q) in enumerate(entries):
+        if media_type in media_types:
+            return media_types[media_type]
+        if media_type in MEDIA_TYPE_ALIASES:
+            return MEDIA_TYPE_ALIASES[media_type]
+        if media_type in WEAK_MEDIA_TYPE_ALIASES and index == 0 and all(other_q < q for _, other_q in entries[1:]):
+            return WEAK_MEDIA_TYPE_ALIASES[media_type]
+    return None
@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+
+
+
+class HashingPoolSaturated(Exception):
+    """Alle Worker sind belegt und die Warteschlange ist voll."""
+
+
+class HashingPool:
+    """
+    Begrenzter Thread-Pool für bcrypt-Operationen.
+
+    Es werden höchstens max_workers Hashes gleichzeitig berechnet und
+    max_pending weitere Aufträge angenommen; darüber hinaus wird sofort
+    HashingPoolSaturated ausgelöst, statt den Request-Threadpool zu blockieren.
+
+    Der aufrufende Request-Thread wartet auf das Ergebnis, es können also bis
+    zu max_workers + max_pending Threads des Request-Threadpools belegt sein;
+    check_request_threads prüft beim Start, dass daneben genug frei bleiben.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hashing")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingPoolSaturated()
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(self._call, fn, *args).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+            self._slots.release()
+
+    def _call(self, fn, *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    @property
+    def max_blocked_threads(self) -> int:
+        return self.max_workers + self.max_pending
+
+    def check_request_threads(self, request_threads: int, reserved_threads: int):
+        """Löst ValueError aus, wenn bei voller Auslastung weniger als reserved_threads Request-Threads frei blieben."""
+        if self.max_blocked_threads + reserved_threads > request_threads:
+            raise ValueError(
+                f"hashing_workers + hashing_max_pending = {self.max_blocked_threads} leaves fewer than "
+                f"hashing_reserved_threads = {reserved_threads} of {request_threads} request threads free"
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queued": self._in_flight - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+hashing_pool = HashingPool(
+    max_workers=settings.hashing_workers,
+    max_pending=settings.hashing_max_pending,
+)
@@ -0,0 +1,211 @@
+"""
+Token-Bucket-Begrenzung für Login, OTP-Prüfung und Zahlungseinlösung.
+
+Je Endpunkt gibt es einen Bucket pro Client-IP und einen pro E-Mail-Adresse;
+jeder Versuch kostet ein Token aus beiden, erfolgreiche Versuche bekommen es
+zurück. Die Prüfung läuft vor Datenbankabfrage und bcrypt/TOTP, abgewiesene
+Anfragen erzeugen also keine Last. Die Buckets liegen pro Worker im Speicher
+oder, mit rate_limit_store = database, gemeinsam in der Tabelle
+rate_limit_buckets. Hinter einem Reverse Proxy (trusted_proxies) kommt die
+Client-IP aus X-Forwarded-For.
+"""
+import ipaddress
+import math
+import threading
+import time
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__("Too many attempts")
+        self.retry_after = retry_after
+
+
+class MemoryBucketStore:
+    """Buckets dieses Workers; volle Buckets werden beim Aufräumen verworfen."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def _available(self, key: str, capacity: float, rate: float, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        return min(capacity, tokens + (now - updated) * rate)
+
+    def take(self, keys: list[str], capacity: float, rate: float) -> float:
+        """Zieht ein Token aus allen Buckets oder aus keinem; liefert die Wartezeit in Sekunden (0 = erlaubt)."""
+        now = time.monotonic()
+        with self._lock:
+            available = {key: self._available(key, capacity, rate, now) for key in keys}
+            allowed = all(tokens >= 1 for tokens in available.values())
+            for key, tokens in available.items():
+                self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(capacity, rate, now)
+        if allowed:
+            return 0
+        return max((1 - tokens) / rate for tokens in available.values() if tokens < 1)
+
+    def refund(self, keys: list[str], capacity: float):
+        with self._lock:
+            for key in keys:
+                if key in self._buckets:
+                    tokens, updated = self._buckets[key]
+                    self._buckets[key] = (min(capacity, tokens + 1), updated)
+
+    def _prune(self, capacity: float, rate: float, now: float):
+        for key in [key for key in self._buckets if self._available(key, capacity, rate, now) >= capacity]:
+            del self._buckets[key]
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._buckets)
+
+
+# Funktion rate_limit_take aus der Migration (alle Buckets oder keiner); eigene
+# Verbindung im Autocommit, damit die Zeilensperren nicht bis zum Ende des
+# Requests halten
+TAKE_SQL = text("SELECT rate_limit_take(:keys, :capacity, :rate)")
+REFUND_SQL = text("UPDATE rate_limit_buckets SET tokens = LEAST(:capacity, tokens + 1) WHERE key = ANY(:keys)")
+PRUNE_SQL = text("DELETE FROM rate_limit_buckets WHERE updated_at < clock_timestamp() - make_interval(secs => :max_age)")
+
+
+class DatabaseBucketStore:
+    """Gemeinsame Buckets aller Worker in PostgreSQL."""
+
+    def __init__(self, prune_every: int = 1000):
+        self.prune_every = prune_every
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def take(self, keys: list[str], capacity: float, rate: float) -> float:
+        with self._lock:
+            self._calls += 1
+            prune = self._calls % self.prune_every == 0
+
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            wait = connection.execute(TAKE_SQL, {"keys": keys, "capacity": capacity, "rate": rate}).scalar()
+            if prune:
+                # leere Buckets sind nach capacity / rate Sekunden wieder voll
+                connection.execute(PRUNE_SQL, {"max_age": capacity / rate})
+        return wait
+
+    def refund(self, keys: list[str], capacity: float):
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(REFUND_SQL, {"keys": keys, "capacity": capacity})
+
+    def reset(self):
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("DELETE FROM rate_limit_buckets"))
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class RateLimiter:
+    def __init__(self, store, burst: int, per_minute: float, enabled: bool = True):
+        self.store = store
+        self.capacity = burst
+        self.rate = per_minute / 60
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._allowed: dict[str, int] = {}
+        self._rejected: dict[str, int] = {}
+        self._refunded: dict[str, int] = {}
+
+    @staticmethod
+    def _keys(scope: str, client_ip: Optional[str], email: Optional[str]) -> list[str]:
+        keys = [f"{scope}:ip:{client_ip or 'unknown'}"]
+        if email:
+            keys.append(f"{scope}:email:{email.strip().lower()}")
+        return keys
+
+    def check(self, scope: str, client_ip: Optional[str], email: Optional[str] = None):
+        """Löst RateLimitExceeded aus, wenn IP oder E-Mail ihr Kontingent für scope aufgebraucht haben."""
+        if not self.enabled:
+            return
+
+        retry_after = self.store.take(self._keys(scope, client_ip, email), self.capacity, self.rate)
+        counters = self._rejected if retry_after > 0 else self._allowed
+        with self._lock:
+            counters[scope] = counters.get(scope, 0) + 1
+        if retry_after > 0:
+            raise RateLimitExceeded(retry_after)
+
+    def refund(self, scope: str, client_ip: Optional[str], email: Optional[str] = None):
+        """Nach einem erfolgreichen Versuch: nur Fehlversuche sollen das Kontingent verbrauchen."""
+        if not self.enabled:
+            return
+
+        self.store.refund(self._keys(scope, client_ip, email), self.capacity)
+        with self._lock:
+            self._refunded[scope] = self._refunded.get(scope, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "store": type(self.store).__name__,
+                "buckets": self.store.size(),
+                "allowed": dict(self._allowed),
+                "rejected": dict(self._rejected),
+                "refunded": dict(self._refunded),
+            }
+
+
+def retry_after_header(exc: RateLimitExceeded) -> str:
+    return str(max(1, math.ceil(exc.retry_after)))
+
+
+def parse_trusted_proxies(value: str) -> list:
+    return [ipaddress.ip_network(item.strip(), strict=False) for item in value.split(",") if item.strip()]
+
+
+def is_trusted(address: Optional[str], trusted_proxies: list) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except (TypeError, ValueError):
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+TRUSTED_PROXIES = parse_trusted_proxies(settings.trusted_proxies)
+
+
+def client_ip(request: Request, trusted_proxies: Optional[list] = None) -> Optional[str]:
+    """
+    Adresse des Clients. Kommt die Verbindung von einem vertrauenswürdigen
+    Proxy, gilt die letzte nicht vertrauenswürdige Adresse aus X-Forwarded-For
+    (weiter links stehende Einträge kann der Client selbst setzen).
+    """
+    trusted_proxies = TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies
+    address = request.client.host if request.client else None
+    if not is_trusted(address, trusted_proxies):
+        return address
+
+    forwarded = [item.strip() for item in request.headers.get("x-forwarded-for", "").split(",") if item.strip()]
+    for hop in reversed(forwarded):
+        address = hop
+        if not is_trusted(hop, trusted_proxies):
+            break
+    return address
+
+
+rate_limiter = RateLimiter(
+    DatabaseBucketStore() if settings.rate_limit_store == "database" else MemoryBucketStore(),
+    burst=settings.rate_limit_burst,
+    per_minute=settings.rate_limit_per_minute,
+    enabled=settings.rate_limit_enabled,
+)
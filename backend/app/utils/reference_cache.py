@@ -0,0 +1,182 @@
+"""
+Prozesslokaler Cache für die kleinen Stammdatentabellen.
+
+Risk, ModelChoice, ApplicationArea und LanguageModel werden vollständig
+geladen und als unveränderliche Zeilen vorgehalten. Schreibende Endpunkte
+invalidieren die betroffene Tabelle nach dem Commit; Änderungen aus anderen
+Workern kommen über LISTEN/NOTIFY (reference_cache_listen) oder spätestens
+nach reference_cache_ttl Sekunden an. Jeder Eintrag merkt sich den Zähler
+aus catalog_versions beim Laden; Listen-Endpunkte, die ihr ETag aus dem
+aktuellen Zähler bilden, übergeben ihn und erzwingen bei Abweichung ein
+Neuladen, damit ETag und Inhalt zusammenpassen.
+"""
+import logging
+import select as select_module
+import threading
+import time
+from typing import Optional
+
+import psycopg2
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import ApplicationArea, CatalogVersion, LanguageModel, ModelChoice, Risk
+
+logger = logging.getLogger(__name__)
+
+
+# Cache-Bereich -> (Model, Sortierung der Listen-Endpunkte); die Namen
+# entsprechen den Zählern in catalog_versions und den NOTIFY-Payloads
+REFERENCE_TABLES = {
+    "risk": (Risk, Risk.sort),
+    "model_choices": (ModelChoice, ModelChoice.name),
+    "application_area": (ApplicationArea, ApplicationArea.area),
+    "language_models": (LanguageModel, LanguageModel.name),
+}
+
+NOTIFY_CHANNEL = "catalog_versions"
+
+
+class ReferenceCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Bereich -> (Ladezeit, Zeilen, Zeilen nach id, Zähler aus catalog_versions)
+        self._entries: dict[str, tuple[float, tuple, dict, Optional[int]]] = {}
+        self._generations = {scope: 0 for scope in REFERENCE_TABLES}
+        self.hits = 0
+        self.loads = 0
+
+    def load(self, db: Session, scope: str) -> tuple[tuple, dict]:
+        model, order = REFERENCE_TABLES[scope]
+        with self._lock:
+            generation = self._generations[scope]
+
+        # Zähler vor den Zeilen lesen: die Zeilen sind mindestens so neu wie er
+        version = db.execute(select(CatalogVersion.version).where(CatalogVersion.scope == scope)).scalar()
+        rows = tuple(db.execute(select(*model.__table__.c).order_by(order.asc(), model.id.asc())).all())
+        by_id = {row.id: row for row in rows}
+
+        with self._lock:
+            self.loads += 1
+            # zwischenzeitlich invalidiert: Ergebnis nutzen, aber nicht speichern
+            if self._generations[scope] == generation:
+                self._entries[scope] = (time.monotonic(), rows, by_id, version)
+        return rows, by_id
+
+    def load_all(self, db: Session):
+        for scope in REFERENCE_TABLES:
+            self.load(db, scope)
+
+    def _cached(self, db: Session, scope: str, version: Optional[int] = None) -> tuple[tuple, dict]:
+        with self._lock:
+            entry = self._entries.get(scope)
+            if (
+                entry is not None
+                and time.monotonic() - entry[0] < self.ttl
+                and (version is None or entry[3] is None or entry[3] >= version)
+            ):
+                self.hits += 1
+                return entry[1], entry[2]
+        return self.load(db, scope)
+
+    def rows(self, db: Session, scope: str, version: Optional[int] = None) -> tuple:
+        """version: aktueller Zähler aus catalog_versions; ältere Einträge werden neu geladen."""
+        return self._cached(db, scope, version)[0]
+
+    def get(self, db: Session, scope: str, id: int):
+        """Bei einem Fehltreffer wird einmal neu geladen, falls ein anderer Worker die Zeile angelegt hat."""
+        row = self._cached(db, scope)[1].get(id)
+        if row is None:
+            row = self.load(db, scope)[1].get(id)
+        return row
+
+    def missing(self, db: Session, scope: str, ids) -> list:
+        by_id = self._cached(db, scope)[1]
+        missing = [id for id in ids if id not in by_id]
+        if missing:
+            by_id = self.load(db, scope)[1]
+            missing = [id for id in ids if id not in by_id]
+        return missing
+
+    def invalidate(self, *scopes: str):
+        with self._lock:
+            for scope in scopes or tuple(REFERENCE_TABLES):
+                if scope in self._generations:
+                    self._generations[scope] += 1
+                    self._entries.pop(scope, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"cached": sorted(self._entries), "hits": self.hits, "loads": self.loads}
+
+
+class ReferenceCacheListener:
+    """
+    Hintergrund-Thread, der NOTIFYs der catalog_versions-Trigger empfängt und
+    an alle angemeldeten Caches (Methode invalidate(*scopes)) weitergibt.
+    """
+
+    def __init__(self, *caches, poll_seconds: float = 5):
+        self.caches = list(caches)
+        self.poll_seconds = poll_seconds
+        self.connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, cache):
+        self.caches.append(cache)
+
+    def _invalidate(self, *scopes: str):
+        for cache in self.caches:
+            cache.invalidate(*scopes)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reference-cache-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def _connect(self):
+        connection = psycopg2.connect(settings.get_db_url())
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return connection
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                connection = self._connect()
+            except Exception:
+                logger.exception("Reference cache listener error")
+                self._stop.wait(self.poll_seconds)
+                continue
+
+            # während der Verbindungslücke können Änderungen verpasst worden sein
+            self._invalidate()
+            self.connected.set()
+            try:
+                while not self._stop.is_set():
+                    if select_module.select([connection], [], [], self.poll_seconds) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._invalidate(connection.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Reference cache listener error")
+            finally:
+                self.connected.clear()
+                connection.close()
+
+
+reference_cache = ReferenceCache(ttl=settings.reference_cache_ttl)
+reference_cache_listener = ReferenceCacheListener(reference_cache)
@@ -0,0 +1,27 @@
+"""
+Gemeinsame Bausteine der Trigramm-Suche.
+
+Der Operator % vergleicht gegen pg_trgm.similarity_threshold und kann im
+Gegensatz zu similarity() > x einen Trigramm-Index nutzen. Die Schwelle wird
+daher pro Anfrage transaktionslokal gesetzt.
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.3
+
+# is_local = true: gilt nur bis zum Ende der aktuellen Transaktion; die
+# Wortschwelle gilt für <% (Treffer innerhalb längerer Texte)
+SIMILARITY_THRESHOLD_SQL = text("""
+    SELECT set_config('pg_trgm.similarity_threshold', :threshold, true),
+        set_config('pg_trgm.word_similarity_threshold', :threshold, true)
+""")
+
+
+def similarity_threshold_params(threshold: float) -> dict:
+    return {"threshold": str(threshold)}
+
+
+def set_similarity_threshold(db: Session, threshold: float):
+    db.execute(SIMILARITY_THRESHOLD_SQL, similarity_threshold_params(threshold))
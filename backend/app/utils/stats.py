@@ -0,0 +1,112 @@
+"""
+Aggregierte Katalogstatistik für Dashboards.
+
+Die Katalogaufschlüsselungen entstehen in einer Abfrage: Hersteller,
+Sprachmodell, Modellwahl und Gesamtzahl über GROUPING SETS auf applications,
+Areas als weitere Teilabfrage. Das Ergebnis wird pro Worker stats_cache_ttl
+Sekunden vorgehalten. Die Risikoeinstufungen gehören dem jeweiligen Nutzer
+und werden je Anfrage nur für ihn gezählt.
+"""
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+
+# dimension = NULL ist die Gesamtzeile aus dem leeren Grouping Set; LEFT JOIN,
+# damit Anwendungen ohne (gültige) Referenz in der Gesamtzahl bleiben
+STATS_SQL = text("""
+    SELECT
+        CASE
+            WHEN GROUPING(a.manufacturer_id) = 0 THEN 'manufacturers'
+            WHEN GROUPING(a.languagemodel_id) = 0 THEN 'language_models'
+            WHEN GROUPING(a.modelchoice_id) = 0 THEN 'model_choices'
+        END AS dimension,
+        COALESCE(a.manufacturer_id, a.languagemodel_id, a.modelchoice_id) AS id,
+        COALESCE(m.name, lm.name, mc.name) AS name,
+        count(*) AS total,
+        count(*) FILTER (WHERE a.is_active) AS active
+    FROM applications a
+    LEFT JOIN manufacturers m ON m.id = a.manufacturer_id
+    LEFT JOIN language_models lm ON lm.id = a.languagemodel_id
+    LEFT JOIN model_choices mc ON mc.id = a.modelchoice_id
+    GROUP BY GROUPING SETS (
+        (a.manufacturer_id, m.name),
+        (a.languagemodel_id, lm.name),
+        (a.modelchoice_id, mc.name),
+        ()
+    )
+    UNION ALL
+    SELECT 'areas', ar.id, ar.area, count(*), count(*) FILTER (WHERE a.is_active)
+    FROM application_area_entry e
+    JOIN applications a ON a.id = e.application_id
+    JOIN application_area ar ON ar.id = e.area_id
+    GROUP BY ar.id, ar.area
+""")
+
+STATS_DIMENSIONS = ("manufacturers", "language_models", "model_choices", "areas")
+
+USER_RISKS_SQL = text("""
+    SELECT r.id, r.name, count(*) AS total, count(*) FILTER (WHERE a.is_active) AS active
+    FROM application_users au
+    JOIN applications a ON a.id = au.application_id
+    JOIN risk r ON r.id = au.risk_id
+    WHERE au.user_id = :user_id
+    GROUP BY r.id, r.name
+""")
+
+
+def bucket_sort_key(bucket: dict):
+    return (-bucket["total"], bucket["name"], bucket["id"])
+
+
+def load_application_stats(db: Session) -> dict:
+    stats = {"total": 0, "active": 0, **{dimension: [] for dimension in STATS_DIMENSIONS}}
+    for row in db.execute(STATS_SQL).all():
+        if row.dimension is None:
+            stats["total"] = row.total
+            stats["active"] = row.active
+        elif row.name is not None:
+            # fehlende oder verwaiste Referenzen zählen nur in der Gesamtzahl
+            stats[row.dimension].append({"id": row.id, "name": row.name, "total": row.total, "active": row.active})
+
+    for dimension in STATS_DIMENSIONS:
+        stats[dimension].sort(key=bucket_sort_key)
+    return stats
+
+
+def load_user_risks(db: Session, user_id: int) -> list:
+    rows = db.execute(USER_RISKS_SQL, {"user_id": user_id}).all()
+    return sorted(({"id": row.id, "name": row.name, "total": row.total, "active": row.active} for row in rows), key=bucket_sort_key)
+
+
+class StatsCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entry: Optional[tuple[float, dict]] = None
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, db: Session) -> dict:
+        with self._lock:
+            if self._entry is not None and time.monotonic() - self._entry[0] < self.ttl:
+                self.hits += 1
+                return self._entry[1]
+
+        stats = load_application_stats(db)
+        with self._lock:
+            self.loads += 1
+            self._entry = (time.monotonic(), stats)
+        return stats
+
+    def invalidate(self):
+        with self._lock:
+            self._entry = None
+
+
+stats_cache = StatsCache(ttl=settings.stats_cache_ttl)
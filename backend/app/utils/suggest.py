@@ -0,0 +1,159 @@
+"""
+Prozesslokaler Präfixindex für die Autovervollständigung.
+
+Namen aktiver Anwendungen und Hersteller liegen als sortierte Liste im
+Speicher, je Wortanfang ein Eintrag ("Visual Studio Code" ist auch über
+"stu" und "code" zu finden). Präfixanfragen laufen per bisect ohne
+Datenbankzugriff. Eigene Schreibzugriffe aktualisieren den Index direkt;
+Änderungen aus anderen Workern kommen über den ReferenceCacheListener oder
+spätestens nach reference_cache_ttl Sekunden an. Nach Ablauf der TTL lädt ein
+Hintergrund-Thread neu, bis dahin wird der bisherige Stand ausgeliefert.
+"""
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Application, Manufacturer
+from app.utils.reference_cache import reference_cache_listener
+
+logger = logging.getLogger(__name__)
+
+
+class SuggestEntry(NamedTuple):
+    key: str
+    type: str
+    id: int
+    name: str
+
+
+# Zähler in catalog_versions bzw. NOTIFY-Payloads, die den Index betreffen
+SUGGEST_SCOPES = ("applications", "manufacturers")
+
+WORD_START = re.compile(r"(?:^|(?<=[\s\-_./(]))\w", re.UNICODE)
+
+
+def normalize(value: str) -> str:
+    return value.casefold()
+
+
+def entry_keys(name: str) -> List[str]:
+    return [normalize(name[match.start():]) for match in WORD_START.finditer(name)] or [normalize(name)]
+
+
+def build_entries(type: str, id: int, name: str) -> List[SuggestEntry]:
+    return [SuggestEntry(key, type, id, name) for key in entry_keys(name)]
+
+
+def select_suggest_names():
+    return union_all(
+        select(literal("application").label("type"), Application.id, Application.name).where(Application.is_active == True),
+        select(literal("manufacturer").label("type"), Manufacturer.id, Manufacturer.name).where(Manufacturer.is_active == True),
+    )
+
+
+class SuggestIndex:
+    def __init__(self, ttl: float, session_factory=SessionLocal):
+        self.ttl = ttl
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refresh_thread: Optional[threading.Thread] = None
+        # Listen werden nie verändert, sondern ersetzt; Leser brauchen keine Sperre
+        self._entries: List[SuggestEntry] = []
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self.hits = 0
+        self.loads = 0
+
+    def load(self, db: Session) -> List[SuggestEntry]:
+        with self._lock:
+            generation = self._generation
+
+        entries = sorted(entry for row in db.execute(select_suggest_names()).all() for entry in build_entries(row.type, row.id, row.name))
+
+        with self._lock:
+            self.loads += 1
+            # zwischenzeitlich geändert: Ergebnis nutzen, aber nicht speichern
+            if self._generation == generation:
+                self._entries = entries
+                self._loaded_at = time.monotonic()
+        return entries
+
+    def _refresh(self):
+        db = self.session_factory()
+        try:
+            self.load(db)
+        except Exception:
+            logger.exception("Suggest index refresh error")
+        finally:
+            db.close()
+            with self._lock:
+                self._refreshing = False
+
+    def _current(self, db: Session) -> List[SuggestEntry]:
+        """Synchron geladen wird nur ohne Stand; abgelaufene Stände erneuert ein Hintergrund-Thread."""
+        with self._lock:
+            if self._loaded_at is not None:
+                if time.monotonic() - self._loaded_at >= self.ttl and not self._refreshing:
+                    self._refreshing = True
+                    self._refresh_thread = threading.Thread(target=self._refresh, name="suggest-index-refresh", daemon=True)
+                    self._refresh_thread.start()
+                self.hits += 1
+                return self._entries
+        return self.load(db)
+
+    def suggest(self, db: Session, prefix: str, limit: int = 10) -> List[SuggestEntry]:
+        """Treffer alphabetisch nach dem getroffenen Wort, jede Anwendung/jeder Hersteller einmal."""
+        key = normalize(prefix.strip())
+        if not key:
+            return []
+        entries = self._current(db)
+        seen = set()
+        results = []
+        for index in range(bisect_left(entries, (key,)), len(entries)):
+            entry = entries[index]
+            if not entry.key.startswith(key):
+                break
+            if (entry.type, entry.id) in seen:
+                continue
+            seen.add((entry.type, entry.id))
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    def upsert(self, type: str, id: int, name: str, is_active: bool = True):
+        """Nach dem Commit eines eigenen Schreibzugriffs aufrufen."""
+        with self._lock:
+            self._generation += 1
+            if self._loaded_at is None:
+                return
+            entries = [entry for entry in self._entries if entry.type != type or entry.id != id]
+            if is_active:
+                for entry in build_entries(type, id, name):
+                    insort(entries, entry)
+            self._entries = entries
+
+    def invalidate(self, *scopes: str):
+        if scopes and not any(scope in SUGGEST_SCOPES for scope in scopes):
+            return
+        with self._lock:
+            self._generation += 1
+            self._entries = []
+            self._loaded_at = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "loaded": self._loaded_at is not None, "hits": self.hits, "loads": self.loads}
+
+
+suggest_index = SuggestIndex(ttl=settings.reference_cache_ttl)
+reference_cache_listener.add(suggest_index)
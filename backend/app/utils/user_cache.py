@@ -0,0 +1,128 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Schreibgeschützte Momentaufnahme eines Users für die Authentifizierung.
+    Enthält nur die Felder, die die Endpunkte von current_user lesen.
+    """
+    id: int
+    email: str
+    is_active: bool
+    is_admin: bool
+    expire: Optional[datetime] = None
+    username: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=bool(user.is_active),
+            is_admin=bool(user.is_admin),
+            expire=user.expire,
+            username=user.username,
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "CachedUser":
+        expire = payload.get("expire")
+        return cls(
+            id=payload["user_id"],
+            email=payload.get("email"),
+            is_active=bool(payload.get("is_active")),
+            is_admin=bool(payload.get("is_admin")),
+            expire=datetime.fromisoformat(expire) if expire else None,
+        )
+
+
+class UserCache:
+    """
+    Prozesslokaler, TTL-begrenzter Cache für CachedUser-Einträge.
+
+    invalidate() entfernt den Eintrag und merkt sich den Zeitpunkt, damit
+    Tokens, die vorher ausgestellt wurden, nicht mehr allein anhand ihrer
+    Claims akzeptiert werden. Nach invalidation_ttl (Lebensdauer der JWTs)
+    ist kein solches Token mehr gültig; ältere Zeitpunkte werden bei jedem
+    invalidate() verworfen.
+    """
+
+    def __init__(self, ttl: int, max_size: int = 10000, invalidation_ttl: int = 3600):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.invalidation_ttl = invalidation_ttl
+        self._entries: dict[int, tuple[float, CachedUser]] = {}
+        # in Einfügereihenfolge = zeitlich sortiert, älteste zuerst
+        self._invalidated: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            return user
+
+    def put(self, user: CachedUser) -> CachedUser:
+        with self._lock:
+            if len(self._entries) >= self.max_size and user.id not in self._entries:
+                self._evict()
+            self._entries[user.id] = (time.monotonic() + self.ttl, user)
+        return user
+
+    def invalidate(self, user_id: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._invalidated.pop(user_id, None)
+            self._invalidated[user_id] = now
+            self._sweep_invalidated(now)
+
+    def _sweep_invalidated(self, now: float) -> None:
+        cutoff = now - self.invalidation_ttl
+        while self._invalidated:
+            user_id, invalidated_at = next(iter(self._invalidated.items()))
+            if invalidated_at >= cutoff:
+                break
+            del self._invalidated[user_id]
+
+    def invalidated_since(self, user_id: int, issued_at: Optional[float]) -> bool:
+        with self._lock:
+            invalidated_at = self._invalidated.get(user_id)
+        if invalidated_at is None:
+            return False
+        if issued_at is None:
+            return True
+        # iat hat nur Sekundengenauigkeit
+        return int(issued_at) <= int(invalidated_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._invalidated.clear()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [user_id for user_id, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for user_id in expired:
+            del self._entries[user_id]
+        if len(self._entries) >= self.max_size:
+            oldest = min(self._entries, key=lambda user_id: self._entries[user_id][0])
+            del self._entries[oldest]
+
+
+user_cache = UserCache(
+    ttl=settings.jwt_user_cache_ttl,
+    invalidation_ttl=settings.jwt_expire_minutes * 60,
+)
@@ -10,7 +10,12 @@ from app import auth, models
 from app.config import get_settings
 from app.database import Base, get_db
 from app.main import app
-from app.models import Application, AuthInvite, Manufacturer, PaymentToken, User, LanguageModel, ModelChoice, PasswordResetToken, ApplicationUser, Risk, application_area_entry_table, ApplicationArea
+from app.utils.catalog import refresh_catalog
+from app.utils.rate_limit import rate_limiter
+from app.utils.reference_cache import reference_cache
+from app.utils.stats import stats_cache
+from app.utils.suggest import suggest_index
+from app.models import Application, AuthInvite, Manufacturer, PaymentToken, User, LanguageModel, ModelChoice, PasswordResetToken, ApplicationUser, Risk, application_area_entry_table, ApplicationArea, EmailOutbox
 
 
 @pytest.fixture(scope="session")
@@ -48,6 +53,24 @@ def db(engine, run_migrations):
         session.close()
 
 
+@pytest.fixture(scope="function")
+def create_all_db(engine):
+    """Schema wie bei init_db (create_all, ohne Migrationen) in einem eigenen, am Ende zurückgerollten Schema."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    connection.execute(text("CREATE SCHEMA create_all_test"))
+    connection.execute(text("SET LOCAL search_path TO create_all_test, public"))
+    # checkfirst sähe die gleichnamigen Tabellen in public
+    Base.metadata.create_all(bind=connection, checkfirst=False)
+    session = sessionmaker(autoflush=False, bind=connection, join_transaction_mode="create_savepoint")()
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
 @pytest.fixture(scope="function")
 def client(db):
     def override_get_db():
@@ -63,6 +86,7 @@ def setup_test_data(db):
     db.query(PaymentToken).delete()
     db.query(AuthInvite).delete()
     db.query(PasswordResetToken).delete()
+    db.query(EmailOutbox).delete()
     db.query(ApplicationUser).delete()
     db.query(User).delete()
     db.query(application_area_entry_table).delete()
@@ -143,7 +167,12 @@ def setup_test_data(db):
         {"application_id": 1, "area_id": 1},
         {"application_id": 1, "area_id": 3},
     ]))
+    refresh_catalog(db)
     db.commit()
+    reference_cache.invalidate()
+    suggest_index.invalidate()
+    stats_cache.invalidate()
+    rate_limiter.store.reset()
 
     yield
     db.close()
@@ -1,6 +1,13 @@
 import io
 import csv
-from app.models import ApplicationUser, Application
+import json
+import pytest
+from sqlalchemy import text
+from app.api.endpoints import applications
+from app.database import get_db, init_db
+from app.utils import export
+from app.models import ApplicationUser, Application, Manufacturer
+from app.utils.catalog import refresh_catalog
 
 def new_application(authenticated_client, id="", with_areas=False):
     data = {
@@ -97,6 +104,33 @@ def test_create_application_wrong_data(authenticated_client_for_email):
     data = response.json()
     assert data["detail"] == "One or more area_ids are invalid."
 
+def test_create_application_reports_all_errors(authenticated_client_for_email):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.post("api/applications/", json={
+        "name": "Office",
+        "description": "This is a test.",
+        "manufacturer_id": 999999,
+        "languagemodel_id": 999999,
+        "modelchoice_id": 1,
+        "is_active": True,
+        "area_ids": [1, 5]
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Application already exists; Manufacturer not found; Language model not found; One or more area_ids are invalid."
+
+def test_application_reference_errors(db):
+    data = applications.CreateApplication(
+        name="Office",
+        description="",
+        manufacturer_id=2,
+        languagemodel_id=2,
+        modelchoice_id=999999,
+        is_active=True,
+        area_ids=[2, 3],
+    )
+    assert applications.application_reference_errors(db, data) == ["Application already exists", "Model choice not found"]
+    assert applications.application_reference_errors(db, data, check_duplicate=False) == ["Model choice not found"]
+
 def test_get_applications(client):
     response = client.get("/api/applications/")
     assert response.status_code == 200
@@ -288,6 +322,85 @@ def test_get_active_applications_with_manufacturer(client):
         assert "languagemodel_name" in app
         assert "modelchoice_name" in app
 
+def test_get_active_applications_with_manufacturer_areas(client):
+    response = client.get("/api/applications/with-manufacturer")
+    assert response.status_code == 200
+
+    data = {app["name"]: app for app in response.json()}
+    assert data["Office"]["areas"] == [{"id": 1, "area": "Text"}, {"id": 3, "area": "Image"}]
+    assert data["Visual Studio Code"]["areas"] == []
+
+def test_active_applications_catalog_follows_writes(authenticated_client_for_email, client):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = new_application(authenticated_client, "1", True)
+    application_id = response.json()["id"]
+
+    data = {app["name"]: app for app in client.get("/api/applications/with-manufacturer").json()}
+    assert data["Test Application1"]["manufacturer_name"] == "Microsoft"
+    assert data["Test Application1"]["areas"] == [{"id": 1, "area": "Text"}, {"id": 3, "area": "Image"}]
+
+    response = authenticated_client.put(f"api/applications/{application_id}", json={
+        "name": "Updated Application",
+        "description": "Updated description",
+        "manufacturer_id": 2,
+        "languagemodel_id": 2,
+        "modelchoice_id": 2,
+        "is_active": True,
+        "area_ids": [2]
+    })
+    assert response.status_code == 200
+
+    data = {app["name"]: app for app in client.get("/api/applications/with-manufacturer").json()}
+    assert "Test Application1" not in data
+    assert data["Updated Application"]["manufacturer_name"] == "Apple"
+    assert data["Updated Application"]["languagemodel_name"] == "ChatGPT"
+    assert data["Updated Application"]["modelchoice_name"] == "web"
+    assert data["Updated Application"]["areas"] == [{"id": 2, "area": "Video"}]
+
+def test_active_applications_not_modified(authenticated_client_for_email, client):
+    response = client.get("/api/applications/with-manufacturer")
+    etag = response.headers["etag"]
+
+    response = client.get("/api/applications/with-manufacturer", headers={"If-None-Match": f'"other", {etag}'})
+    assert response.status_code == 304
+
+    response = client.get("/api/applications/with-manufacturer", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"})
+    assert response.status_code == 200
+
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.put("api/languagemodels/1", json={"name": "Updated Model"})
+    assert response.status_code == 200
+
+    response = client.get("/api/applications/with-manufacturer", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert {app["languagemodel_name"] for app in response.json()} == {"Updated Model"}
+
+def test_get_areas_not_modified(client):
+    response = client.get("/api/applications/areas/")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+
+    response = client.get("/api/applications/areas/", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+def test_get_areas_written_by_other_worker(client, db):
+    response = client.get("/api/applications/areas/")
+    etag = response.headers["etag"]
+    areas = [area["area"] for area in response.json()]
+
+    # Schreibzugriff ohne Invalidierung dieses Workers
+    db.execute(text("INSERT INTO application_area (id, area) VALUES (9999, 'Video')"))
+    db.commit()
+    try:
+        response = client.get("/api/applications/areas/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert sorted(area["area"] for area in response.json()) == sorted(areas + ["Video"])
+    finally:
+        db.rollback()
+        db.execute(text("DELETE FROM application_area WHERE id = 9999"))
+        db.commit()
+
 def test_get_applications_with_manufacturer_admin(authenticated_client_for_email):
     authenticated_client = authenticated_client_for_email("admin@example.com")
     response = authenticated_client.get("/api/applications/with-manufacturer-user")
@@ -296,6 +409,8 @@ def test_get_applications_with_manufacturer_admin(authenticated_client_for_email
     data = response.json()
     assert isinstance(data, list)
     assert len(data) == 3
+    office = next(app for app in data if app["name"] == "Office")
+    assert [area["area"] for area in office["areas"]] == ["Text", "Image"]
 
 def test_get_applications_with_manufacturer_user(authenticated_client_for_email):
     authenticated_client = authenticated_client_for_email("user@example.com")
@@ -318,6 +433,143 @@ def test_get_applications_with_manufacturer_inactive_user(authenticated_client_f
     assert response.status_code == 403
     assert response.json()["detail"] == "Not authorized to access this data"
 
+def test_get_applications_with_manufacturer_page(authenticated_client_for_email):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.get("/api/applications/with-manufacturer-user/page?limit=2")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [a["name"] for a in data["items"]] == ["Alexa", "Office"]
+    assert data["next_cursor"] is not None
+
+    response = authenticated_client.get(f"/api/applications/with-manufacturer-user/page?limit=2&cursor={data['next_cursor']}")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [a["name"] for a in data["items"]] == ["Visual Studio Code"]
+    assert data["next_cursor"] is None
+
+def test_get_applications_with_manufacturer_page_filter(authenticated_client_for_email):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+
+    response = authenticated_client.get("/api/applications/with-manufacturer-user/page?manufacturer_id=2")
+    assert response.status_code == 200
+    assert [a["name"] for a in response.json()["items"]] == ["Alexa"]
+
+    response = authenticated_client.get("/api/applications/with-manufacturer-user/page?area_id=3")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [a["name"] for a in items] == ["Office"]
+    assert {area["area"] for area in items[0]["areas"]} == {"Text", "Image"}
+
+    response = authenticated_client.get("/api/applications/with-manufacturer-user/page?selected=true")
+    assert response.status_code == 200
+    assert [a["name"] for a in response.json()["items"]] == ["Office"]
+
+    response = authenticated_client.get("/api/applications/with-manufacturer-user/page?selected=false&risk_id=1")
+    assert response.status_code == 200
+    assert [a["name"] for a in response.json()["items"]] == ["Alexa", "Visual Studio Code"]
+
+    response = authenticated_client.get("/api/applications/with-manufacturer-user/page?risk_id=2")
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+
+def test_get_applications_with_manufacturer_page_user(authenticated_client_for_email):
+    authenticated_client = authenticated_client_for_email("user@example.com")
+    response = authenticated_client.get("/api/applications/with-manufacturer-user/page")
+    assert response.status_code == 200
+    assert [a["name"] for a in response.json()["items"]] == ["Office", "Visual Studio Code"]
+
+def test_get_applications_with_manufacturer_page_invalid_cursor(authenticated_client_for_email):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.get("/api/applications/with-manufacturer-user/page?cursor=notacursor")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_get_applications_with_manufacturer_page_inactive_user(authenticated_client_for_email, client):
+    authenticated_client = authenticated_client_for_email("inactive@example.com")
+    response = authenticated_client.get("/api/applications/with-manufacturer-user/page")
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Not authorized to access this data"
+
+    response = client.get("/api/applications/with-manufacturer-user/page")
+    assert response.status_code == 401
+
+def test_application_changes(authenticated_client_for_email, db, monkeypatch):
+    monkeypatch.setattr(applications.settings, "sync_overlap_seconds", 0)
+    authenticated_client = authenticated_client_for_email("user@example.com")
+
+    def changes(query=""):
+        response = authenticated_client.get("/api/applications/with-manufacturer-user/changes" + query)
+        # alle Anfragen teilen sich im Test eine Session; die Lesetransaktion
+        # beenden, damit folgende Schreibzugriffe einen neueren Zeitstempel erhalten
+        db.rollback()
+        return response
+
+    response = changes()
+    assert response.status_code == 200
+    data = response.json()
+    assert [a["name"] for a in data["items"]] == ["Office", "Visual Studio Code"]
+    assert data["removed"] == []
+    cursor = data["cursor"]
+
+    response = changes(f"?since={cursor}")
+    assert response.json()["items"] == []
+    cursor = response.json()["cursor"]
+
+    # eigene Auswahl
+    payload = {"application_id": 1, "selected": True, "risk_id": 2}
+    assert authenticated_client.post("/api/applications/application_selection", json=payload).status_code == 200
+    response = changes(f"?since={cursor}")
+    data = response.json()
+    assert [(a["id"], a["applicationuser_selected"], a["risk_name"]) for a in data["items"]] == [(1, True, "minimal")]
+    cursor = data["cursor"]
+
+    # unveränderte Auswahl erzeugt keine Änderung
+    assert authenticated_client.post("/api/applications/application_selection", json=payload).status_code == 200
+    response = changes(f"?since={cursor}")
+    assert response.json()["items"] == []
+
+    # Herstelleränderung betrifft alle Anwendungen des Herstellers
+    db.query(Manufacturer).filter(Manufacturer.id == 1).update({"name": "Microsoft Corp."})
+    refresh_catalog(db, Application.manufacturer_id == 1)
+    db.commit()
+    response = changes(f"?since={cursor}")
+    data = response.json()
+    assert [(a["name"], a["manufacturer_name"]) for a in data["items"]] == [("Office", "Microsoft Corp."), ("Visual Studio Code", "Microsoft Corp.")]
+    cursor = data["cursor"]
+
+    # deaktivierte Anwendung als Tombstone
+    db.query(Application).filter(Application.id == 2).update({"is_active": False})
+    refresh_catalog(db, Application.id == 2)
+    db.commit()
+    response = changes(f"?since={cursor}")
+    data = response.json()
+    assert data["items"] == []
+    assert data["removed"] == [2]
+
+def test_application_changes_overlap(authenticated_client_for_email, monkeypatch):
+    monkeypatch.setattr(applications.settings, "sync_overlap_seconds", 3600)
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+
+    cursor = authenticated_client.get("/api/applications/with-manufacturer-user/changes").json()["cursor"]
+    # Änderungen innerhalb des Überlappungsfensters werden erneut geliefert, Admins sehen inaktive Anwendungen
+    data = authenticated_client.get(f"/api/applications/with-manufacturer-user/changes?since={cursor}").json()
+    assert [a["name"] for a in data["items"]] == ["Alexa", "Office", "Visual Studio Code"]
+    assert data["removed"] == []
+    # der Cursor läuft nicht zurück
+    assert applications.decode_sync_cursor(data["cursor"]) >= applications.decode_sync_cursor(cursor)
+
+def test_application_changes_invalid_cursor(authenticated_client_for_email, client):
+    authenticated_client = authenticated_client_for_email("user@example.com")
+    for cursor in ("notacursor", applications.encode_cursor("Office", 1), "WyIyMDI2LTAxLTAxVDAwOjAwOjAwIl0="):
+        response = authenticated_client.get(f"/api/applications/with-manufacturer-user/changes?since={cursor}")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+    response = client.get("/api/applications/with-manufacturer-user/changes")
+    assert response.status_code == 401
+
 def test_get_application_stats(client):
     response = client.get("/api/applications/stats")
     assert response.status_code == 200
@@ -326,6 +578,85 @@ def test_get_application_stats(client):
     assert data["total"] == 3
     assert data["active"] == 2
 
+def test_application_stats_counters(client, db):
+    def stats():
+        data = client.get("/api/applications/stats").json()
+        return data["total"], data["active"]
+
+    db.add(Application(name="Teams", description="software", manufacturer_id=1, languagemodel_id=1, modelchoice_id=1, is_active=True))
+    db.commit()
+    assert stats() == (4, 3)
+
+    db.query(Application).filter(Application.id == 3).update({"is_active": True})
+    db.commit()
+    assert stats() == (4, 4)
+
+    # Mehrzeilige Anweisungen und Änderungen ohne is_active
+    db.query(Application).update({"description": "changed"})
+    db.execute(text("""
+        INSERT INTO applications (name, manufacturer_id, languagemodel_id, modelchoice_id, is_active, created_at, updated_at)
+        SELECT 'Bulk ' || g, 1, 1, 1, g % 2 = 0, now(), now() FROM generate_series(1, 10) g
+    """))
+    db.commit()
+    assert stats() == (14, 9)
+
+    db.query(Application).filter(Application.name.like("Bulk %")).delete(synchronize_session=False)
+    db.commit()
+    assert stats() == (4, 4)
+
+    # zurückgerollte Änderungen zählen nicht
+    db.query(Application).update({"is_active": False})
+    db.rollback()
+    assert stats() == (4, 4)
+    assert stats() == (db.query(Application).count(), db.query(Application).filter(Application.is_active == True).count())
+
+def test_get_application_stats_details(authenticated_client_for_email, db):
+    authenticated_client = authenticated_client_for_email("user@example.com")
+    response = authenticated_client.get("/api/applications/stats/details")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert (data["total"], data["active"]) == (3, 2)
+    assert data["manufacturers"] == [
+        {"id": 1, "name": "Microsoft", "total": 2, "active": 2},
+        {"id": 2, "name": "Apple", "total": 1, "active": 0},
+    ]
+    assert data["language_models"] == [{"id": 1, "name": "unknown", "total": 3, "active": 2}]
+    assert data["model_choices"] == [{"id": 1, "name": "unknown", "total": 3, "active": 2}]
+    assert data["areas"] == [
+        {"id": 3, "name": "Image", "total": 1, "active": 1},
+        {"id": 1, "name": "Text", "total": 1, "active": 1},
+    ]
+    # nur die eigenen Einstufungen (user: Anwendung 2), nicht die des Admins
+    assert data["risks"] == [{"id": 1, "name": "unknown", "total": 1, "active": 1}]
+
+    # zwischengespeichert bis zum Ablauf von stats_cache_ttl
+    db.query(Application).filter(Application.id == 3).update({"is_active": True})
+    db.commit()
+    assert authenticated_client.get("/api/applications/stats/details").json()["active"] == 2
+
+    applications.stats_cache.invalidate()
+    assert authenticated_client.get("/api/applications/stats/details").json()["active"] == 3
+
+def test_get_application_stats_details_missing_references(authenticated_client_for_email, db):
+    db.add(Application(name="Orphan", description="software", manufacturer_id=None, languagemodel_id=None, modelchoice_id=None, is_active=True))
+    db.commit()
+
+    authenticated_client = authenticated_client_for_email("user@example.com")
+    data = authenticated_client.get("/api/applications/stats/details").json()
+    stats = authenticated_client.get("/api/applications/stats").json()
+    assert (data["total"], data["active"]) == (stats["total"], stats["active"]) == (4, 3)
+    assert sum(bucket["total"] for bucket in data["manufacturers"]) == 3
+    assert data["language_models"] == [{"id": 1, "name": "unknown", "total": 3, "active": 2}]
+
+def test_get_application_stats_details_not_allowed(authenticated_client_for_email, client):
+    response = client.get("/api/applications/stats/details")
+    assert response.status_code == 401
+
+    authenticated_client = authenticated_client_for_email("inactive@example.com")
+    response = authenticated_client.get("/api/applications/stats/details")
+    assert response.status_code == 403
+
 def test_selection_save(authenticated_client_for_email, db):
     userid = 1
     authenticated_client = authenticated_client_for_email("admin@example.com")
@@ -445,6 +776,52 @@ def test_selection_save_no_risk(authenticated_client_for_email):
     assert response.status_code == 404
     assert response.json()["detail"] == "Risk not found"
 
+def test_selection_save_batch(authenticated_client_for_email, db):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    payload = [
+        {"application_id": 1, "selected": False, "risk_id": 2},
+        {"application_id": 2, "selected": True, "risk_id": 1},
+        {"application_id": 3, "selected": True, "risk_id": 1},
+        {"application_id": 3, "selected": False, "risk_id": 2},
+    ]
+    response = authenticated_client.post("/api/applications/application_selection/batch", json=payload)
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == 3
+
+    db.expire_all()
+    entries = {au.application_id: au for au in db.query(ApplicationUser).filter_by(user_id=1).all()}
+    assert len(entries) == 3
+    assert (entries[1].selected, entries[1].risk_id) == (False, 2)
+    assert (entries[2].selected, entries[2].risk_id) == (True, 1)
+    assert (entries[3].selected, entries[3].risk_id) == (False, 2)
+
+def test_selection_save_batch_wrong_data(authenticated_client_for_email, db):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.post("/api/applications/application_selection/batch", json=[
+        {"application_id": 2, "selected": True, "risk_id": 1},
+        {"application_id": 999, "selected": True, "risk_id": 1},
+        {"application_id": 998, "selected": True, "risk_id": 1},
+    ])
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Applications with ids 999, 998 not found"
+
+    response = authenticated_client.post("/api/applications/application_selection/batch", json=[
+        {"application_id": 2, "selected": True, "risk_id": 99},
+    ])
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Risk not found"
+
+    db.expire_all()
+    assert db.query(ApplicationUser).filter_by(user_id=1, application_id=2).first() is None
+
+    response = authenticated_client.post("/api/applications/application_selection/batch", json=[])
+    assert response.status_code == 200
+    assert response.json() == []
+
+    authenticated_client = authenticated_client_for_email("inactive@example.com")
+    response = authenticated_client.post("/api/applications/application_selection/batch", json=[])
+    assert response.status_code == 403
+
 def test_export_applications_csv(authenticated_client_for_email):
     authenticated_client = authenticated_client_for_email("admin@example.com")
 
@@ -480,6 +857,17 @@ def test_export_applications_csv(authenticated_client_for_email):
     assert app1_row[-2] == "unknown"
     assert app1_row[-1] == ""
 
+def test_export_applications_csv_chunks(monkeypatch):
+    monkeypatch.setattr(applications, "EXPORT_CHUNK_SIZE", 1)
+
+    chunks = list(export.csv_stream(applications.export_row_chunks(1)))
+    assert len(chunks) == 3
+
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == export.EXPORT_HEADER
+    assert [row[0] for row in rows[1:]] == ["Office", "Visual Studio Code"]
+    assert rows[1][-3:] == ["Yes", "unknown", "Text, Image"]
+
 def test_export_applications_csv_no_user(authenticated_client_for_email, client):
     authenticated_client = authenticated_client_for_email("inactive@example.com")
 
@@ -491,6 +879,173 @@ def test_export_applications_csv_no_user(authenticated_client_for_email, client)
     assert response.status_code == 401
     assert response.json()["detail"] == "Not authenticated"
 
+def test_export_applications_ndjson(authenticated_client_for_email):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+
+    response = authenticated_client.get("/api/applications/export?format=ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "filename=applications.ndjson" in response.headers["content-disposition"]
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["application"] for row in rows] == ["Office", "Visual Studio Code"]
+    assert rows[0]["selected"] is True
+    assert rows[0]["areas"] == ["Text", "Image"]
+    assert rows[1]["areas"] == []
+
+def test_export_applications_accept_header(authenticated_client_for_email):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+
+    response = authenticated_client.get("/api/applications/export", headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    response = authenticated_client.get("/api/applications/export", headers={"Accept": "*/*"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    # Standard-Header von axios: CSV bleibt Standard
+    response = authenticated_client.get("/api/applications/export", headers={"Accept": "application/json, text/plain, */*"})
+    assert response.headers["content-type"].startswith("text/csv")
+
+def test_format_from_accept():
+    assert export.format_from_accept("application/json") == "ndjson"
+    assert export.format_from_accept("application/json, text/plain;q=0.9, */*;q=0.8") == "ndjson"
+    assert export.format_from_accept("application/json, text/plain, */*") is None
+    assert export.format_from_accept("text/plain;q=0.5, application/json;q=0.4") is None
+    assert export.format_from_accept("application/json;q=0.5, text/csv") == "csv"
+    assert export.format_from_accept("application/x-ndjson;q=0, application/vnd.apache.parquet") == "parquet"
+    assert export.format_from_accept("application/x-parquet;q=0.1, */*") == "parquet"
+
+def test_export_applications_xlsx(authenticated_client_for_email):
+    pytest.importorskip("xlsxwriter")
+    openpyxl = pytest.importorskip("openpyxl")
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+
+    response = authenticated_client.get("/api/applications/export?format=xlsx")
+    assert response.status_code == 200
+    assert "filename=applications.xlsx" in response.headers["content-disposition"]
+
+    sheet = openpyxl.load_workbook(io.BytesIO(response.content)).active
+    rows = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert rows[0] == export.EXPORT_HEADER
+    assert rows[1][0] == "Office"
+    assert rows[1][-3:] == ["Yes", "unknown", "Text, Image"]
+
+def test_export_applications_parquet(authenticated_client_for_email, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(applications, "EXPORT_CHUNK_SIZE", 1)
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+
+    response = authenticated_client.get("/api/applications/export?format=parquet")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/vnd.apache.parquet")
+
+    parquet_file = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet_file.metadata.num_row_groups == 2
+    table = parquet_file.read().to_pylist()
+    assert [row["application"] for row in table] == ["Office", "Visual Studio Code"]
+    assert table[0]["areas"] == ["Text", "Image"]
+
+def test_export_applications_invalid_format(authenticated_client_for_email, monkeypatch):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+
+    response = authenticated_client.get("/api/applications/export?format=pdf")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unsupported export format"
+
+    monkeypatch.setitem(export.EXPORT_FORMATS, "xlsx", export.ExportFormat("xlsx", "application/octet-stream", "xlsx", export.xlsx_stream, requires="not_installed_module"))
+    response = authenticated_client.get("/api/applications/export?format=xlsx")
+    assert response.status_code == 501
+    assert response.json()["detail"] == "Export format xlsx is not available"
+
+IMPORT_CSV = """Application,Description,Manufacturer,LanguageModel,ModelChoice,Selected,Risk,Areas
+Office,updated,Apple,ChatGPT,web,Yes,unknown,Video
+Copilot,assistant,Microsoft,ChatGPT,web,No,unknown,"Text, Image"
+Copilot,again,Microsoft,ChatGPT,web,No,unknown,
+Broken,,Nobody,ChatGPT,nothing,No,unknown,"Text, Sound"
+,missing name,Microsoft,ChatGPT,web,No,unknown,
+"""
+
+def test_import_applications_csv(authenticated_client_for_email, db):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.post("/api/applications/import", content=IMPORT_CSV, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["inserted"] == 1
+    assert data["updated"] == 1
+    assert data["dry_run"] is False
+    assert data["errors"] == [
+        {"line": 4, "name": "Copilot", "errors": ["Duplicate name in import"]},
+        {"line": 5, "name": "Broken", "errors": ["Manufacturer not found", "Model choice not found", "Unknown areas: Sound"]},
+        {"line": 6, "name": None, "errors": ["Name is required"]},
+    ]
+
+    office = db.query(Application).filter_by(name="Office").one()
+    assert office.description == "updated"
+    assert office.manufacturer_id == 2
+    assert [area.area for area in office.areas] == ["Video"]
+
+    copilot = db.query(Application).filter_by(name="Copilot").one()
+    assert sorted(area.area for area in copilot.areas) == ["Image", "Text"]
+
+    response = authenticated_client.get("/api/applications/with-manufacturer")
+    data = {app["name"]: app for app in response.json()}
+    assert data["Office"]["manufacturer_name"] == "Apple"
+    assert data["Copilot"]["areas"] == [{"id": 1, "area": "Text"}, {"id": 3, "area": "Image"}]
+
+def test_import_applications_ndjson_dry_run(authenticated_client_for_email, db):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    content = "\n".join([
+        json.dumps({"application": "Copilot", "manufacturer": "Microsoft", "languagemodel": "ChatGPT", "modelchoice": "web", "is_active": False, "areas": ["Text"]}),
+        "not json",
+        json.dumps({"name": "Other", "manufacturer": "Microsoft", "languagemodel": "ChatGPT", "modelchoice": "web", "is_active": "maybe"}),
+    ])
+
+    response = authenticated_client.post("/api/applications/import?format=ndjson&dry_run=true", content=content)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["inserted"] == 1
+    assert data["dry_run"] is True
+    assert data["errors"] == [
+        {"line": 2, "name": None, "errors": ["Invalid JSON"]},
+        {"line": 3, "name": "Other", "errors": ["Invalid is_active value"]},
+    ]
+    assert db.query(Application).filter_by(name="Copilot").first() is None
+
+    response = authenticated_client.post("/api/applications/import", content=content, headers={"Content-Type": "application/x-ndjson"})
+    assert response.json()["inserted"] == 1
+    assert db.query(Application).filter_by(name="Copilot").one().is_active is False
+
+def test_import_applications_export_round_trip(authenticated_client_for_email, db):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    exported = authenticated_client.get("/api/applications/export/csv").text
+
+    response = authenticated_client.post("/api/applications/import", content=exported, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 0, "updated": 2, "errors": [], "dry_run": False}
+    assert db.query(Application).count() == 3
+
+def test_import_applications_many_rows(authenticated_client_for_email, db):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    lines = ["Application,Manufacturer,LanguageModel,ModelChoice,Areas"]
+    lines += [f"Bulk {i},Microsoft,unknown,unknown,Text" for i in range(5000)]
+
+    response = authenticated_client.post("/api/applications/import", content="\n".join(lines), headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 5000
+    assert db.query(Application).count() == 5003
+
+def test_import_applications_not_allowed(authenticated_client_for_email):
+    authenticated_client = authenticated_client_for_email("user@example.com")
+    response = authenticated_client.post("/api/applications/import", content=IMPORT_CSV, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 403
+
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.post("/api/applications/import", content=IMPORT_CSV, headers={"Content-Type": "text/plain"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unsupported import format"
+
 def test_get_risk(authenticated_client_for_email):
     authenticated_client = authenticated_client_for_email("admin@example.com")
 
@@ -530,6 +1085,58 @@ def test_search_applications(client, db):
     assert data == []
     assert len(data) == 0
 
+def test_search_applications_threshold_and_limit(client, db):
+    db.add_all([
+        Application(name="Libre Office", description="software", manufacturer_id=1, languagemodel_id = 1, modelchoice_id = 1, is_active=True),
+        Application(name="MS Office", description="software", manufacturer_id=1, languagemodel_id = 1, modelchoice_id = 1, is_active=True)
+    ])
+    db.commit()
+
+    # Sortierung nach Ähnlichkeit, exakter Treffer zuerst
+    response = client.get("/api/applications/search?q=office")
+    assert [item["name"] for item in response.json()][0] == "Office"
+
+    response = client.get("/api/applications/search?q=office&limit=1")
+    assert [item["name"] for item in response.json()] == ["Office"]
+
+    response = client.get("/api/applications/search?q=office&threshold=0.9")
+    assert [item["name"] for item in response.json()] == ["Office"]
+
+    response = client.get("/api/applications/search?q=office&threshold=0.05")
+    assert "Visual Studio Code" not in [item["name"] for item in response.json()]
+
+    for query in ("threshold=0", "threshold=1.5", "limit=0", "limit=101"):
+        response = client.get(f"/api/applications/search?q=office&{query}")
+        assert response.status_code == 422
+
+def test_suggest_applications(client, authenticated_client_for_email):
+    response = client.get("/api/applications/suggest?q=o")
+    assert response.status_code == 200
+    assert response.json() == [{"type": "application", "id": 1, "name": "Office"}]
+
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.post("/api/applications/", json={
+        "name": "Outlook", "description": "Mail", "manufacturer_id": 1,
+        "languagemodel_id": 1, "modelchoice_id": 1, "is_active": True, "area_ids": [],
+    })
+    assert response.status_code == 200
+    outlook_id = response.json()["id"]
+
+    response = client.get("/api/applications/suggest?q=o&limit=5")
+    assert [item["name"] for item in response.json()] == ["Office", "Outlook"]
+
+    response = authenticated_client.put(f"/api/applications/{outlook_id}", json={
+        "name": "Outlook", "description": "Mail", "manufacturer_id": 1,
+        "languagemodel_id": 1, "modelchoice_id": 1, "is_active": False, "area_ids": [],
+    })
+    assert response.status_code == 200
+    response = client.get("/api/applications/suggest?q=o")
+    assert [item["name"] for item in response.json()] == ["Office"]
+
+    assert client.get("/api/applications/suggest?q=").status_code == 422
+    assert client.get("/api/applications/suggest?q=%20%20").status_code == 422
+    assert client.get("/api/applications/suggest?q=o&limit=0").status_code == 422
+
 def test_get_areas(client):
     response = client.get("/api/applications/areas/")
     assert response.status_code == 200
@@ -539,3 +1146,35 @@ def test_get_areas(client):
     assert "Text" in areas
     assert "Video" in areas
     assert "Image" in areas
+
+def test_application_stats_without_counters(client, create_all_db):
+    """init_db legt application_counts per create_all an, aber ohne Zählerzeile und Trigger."""
+    create_all_db.add(Manufacturer(id=1, name="Microsoft", is_active=True))
+    create_all_db.execute(text("INSERT INTO language_models (id, name, is_active) VALUES (1, 'unknown', true)"))
+    create_all_db.execute(text("INSERT INTO model_choices (id, name) VALUES (1, 'unknown')"))
+    create_all_db.add_all([
+        Application(name="Office", manufacturer_id=1, languagemodel_id=1, modelchoice_id=1, is_active=True),
+        Application(name="Alexa", manufacturer_id=1, languagemodel_id=1, modelchoice_id=1, is_active=False),
+    ])
+    create_all_db.commit()
+
+    client.app.dependency_overrides[get_db] = lambda: create_all_db
+    response = client.get("/api/applications/stats")
+    assert response.status_code == 200
+    assert response.json() == {"total": 2, "active": 1}
+
+def test_init_db_backfills_catalog(client, create_all_db):
+    """Anwendungen, die vor dem ersten Start per create_all schon da waren, landen im Katalog."""
+    create_all_db.add(Manufacturer(id=1, name="Microsoft", is_active=True))
+    create_all_db.execute(text("INSERT INTO language_models (id, name, is_active) VALUES (1, 'unknown', true)"))
+    create_all_db.execute(text("INSERT INTO model_choices (id, name) VALUES (1, 'unknown')"))
+    create_all_db.add(Application(name="Office", manufacturer_id=1, languagemodel_id=1, modelchoice_id=1, is_active=True))
+    create_all_db.commit()
+
+    client.app.dependency_overrides[get_db] = lambda: create_all_db
+    assert client.get("/api/applications/with-manufacturer").json() == []
+
+    init_db(create_all_db.connection())
+    response = client.get("/api/applications/with-manufacturer")
+    assert [app["name"] for app in response.json()] == ["Office"]
+    assert response.json()[0]["manufacturer_name"] == "Microsoft"
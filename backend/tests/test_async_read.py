@@ -0,0 +1,74 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import auth
+from app.api.endpoints import async_read
+from app.database import dispose_async_engine
+from app.models import User
+
+pytest.importorskip("asyncpg")
+
+@pytest.fixture(scope="function")
+def async_client():
+    async_app = FastAPI()
+    async_app.include_router(async_read.applications_router, prefix="/api/applications")
+    async_app.include_router(async_read.manufacturers_router, prefix="/api/manufacturers")
+    with TestClient(async_app) as c:
+        yield c
+        # Verbindungen gehören zur Event-Loop des TestClient
+        c.portal.call(dispose_async_engine)
+
+
+def token_for(db, email):
+    user = db.query(User).filter(User.email == email).first()
+    return auth.create_access_token(auth.user_token_claims(user))
+
+
+def test_async_active_applications_with_manufacturer(async_client):
+    response = async_client.get("/api/applications/with-manufacturer")
+    assert response.status_code == 200
+    data = response.json()
+    assert [app["name"] for app in data] == ["Office", "Visual Studio Code"]
+    assert [area["area"] for area in data[0]["areas"]] == ["Text", "Image"]
+
+def test_async_applications_with_manufacturer_user(async_client, db):
+    headers = {"Authorization": f"Bearer {token_for(db, 'admin@example.com')}"}
+    response = async_client.get("/api/applications/with-manufacturer-user", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 3
+    office = next(app for app in data if app["name"] == "Office")
+    assert office["applicationuser_selected"] is True
+
+    headers = {"Authorization": f"Bearer {token_for(db, 'inactive@example.com')}"}
+    response = async_client.get("/api/applications/with-manufacturer-user", headers=headers)
+    assert response.status_code == 403
+
+    response = async_client.get("/api/applications/with-manufacturer-user")
+    assert response.status_code == 401
+
+def test_async_application_stats(async_client):
+    response = async_client.get("/api/applications/stats")
+    assert response.status_code == 200
+    assert response.json() == {"total": 3, "active": 2}
+
+def test_async_read_manufacturers(async_client):
+    response = async_client.get("/api/manufacturers/")
+    assert response.status_code == 200
+    assert [m["name"] for m in response.json()] == ["Apple", "Microsoft"]
+
+def test_async_search(async_client):
+    response = async_client.get("/api/applications/search?q=office")
+    assert response.status_code == 200
+    assert [app["name"] for app in response.json()] == ["Office"]
+
+    response = async_client.get("/api/manufacturers/search?q=microsoft")
+    assert response.status_code == 200
+    assert [m["name"] for m in response.json()] == ["Microsoft"]
+
+    response = async_client.get("/api/applications/search?q=office&threshold=1")
+    assert response.json() == []
+
+    response = async_client.get("/api/applications/search?q=office&limit=0")
+    assert response.status_code == 422
@@ -0,0 +1,54 @@
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.database import InstrumentedQueuePool, PoolMetrics, engine_options, pool_metrics
+
+
+def test_engine_options(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 7)
+    monkeypatch.setattr(settings, "db_max_overflow", 3)
+    monkeypatch.setattr(settings, "db_statement_timeout", 0)
+
+    options = engine_options()
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+    assert "connect_args" not in options
+
+    monkeypatch.setattr(settings, "db_statement_timeout", 1500)
+    assert engine_options()["connect_args"] == {"options": "-c statement_timeout=1500"}
+
+def test_statement_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "db_statement_timeout", 1500)
+    engine = create_engine(settings.database_url, **engine_options())
+    try:
+        with engine.connect() as connection:
+            assert connection.execute(text("SHOW statement_timeout")).scalar() == "1500ms"
+    finally:
+        engine.dispose()
+
+def test_pool_metrics_checkout():
+    engine = create_engine(settings.database_url, **engine_options())
+    before = pool_metrics.snapshot(engine.pool)["checkouts"]
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            snapshot = pool_metrics.snapshot(engine.pool)
+            assert snapshot["checked_out"] == 1
+        assert pool_metrics.snapshot(engine.pool)["checkouts"] == before + 1
+    finally:
+        engine.dispose()
+
+def test_pool_metrics_timeout():
+    metrics = PoolMetrics()
+    metrics.record_checkout(0.5)
+    metrics.record_checkout(0.1)
+    metrics.record_timeout()
+
+    snapshot = metrics.snapshot(None)
+    assert snapshot == {
+        "checkouts": 2,
+        "timeouts": 1,
+        "wait_seconds_total": 0.6,
+        "wait_seconds_max": 0.5,
+    }
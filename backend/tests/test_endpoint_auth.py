@@ -2,7 +2,9 @@ from unittest.mock import patch
 
 from app import models
 import app.config as config_module
-from app.models import PasswordResetToken, User
+from app.models import EmailOutbox, PasswordResetToken, User
+from app.utils.hashing import HashingPoolSaturated
+from app.utils.rate_limit import rate_limiter
 from datetime import datetime, timedelta, UTC, timezone
 import secrets
 
@@ -36,6 +38,110 @@ def test_login_unknown_email(client):
     assert response.status_code == 400
     assert response.json()["detail"] == "Invalid credentials"
 
+def test_login_hashing_pool_saturated(client, valid_otp_for_email):
+    with patch("app.auth.hashing_pool.run", side_effect=HashingPoolSaturated()):
+        response = client.post("api/auth/login", json={
+            "email": "admin@example.com",
+            "password": "passwordpassword",
+            "otp": valid_otp_for_email("admin@example.com")
+        })
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert response.json()["detail"] == "Server busy, please retry later"
+
+def test_token_success(client, valid_otp_for_email):
+    email = "admin@example.com"
+    response = client.post("api/auth/token", json={
+        "email": email,
+        "password": "passwordpassword",
+        "otp": valid_otp_for_email(email)
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["token_type"] == "bearer"
+    assert data["user"]["email"] == email
+    assert data["user"]["is_admin"] is True
+
+    response = client.get(f"api/users/{data['user']['id']}", headers={"Authorization": f"Bearer {data['access_token']}"})
+    assert response.status_code == 200
+    assert response.json()["email"] == email
+
+def test_token_invalid(client, valid_otp_for_email):
+    response = client.post("api/auth/token", json={
+        "email": "user@example.com",
+        "password": "wrongpasspassword",
+        "otp": valid_otp_for_email("user@example.com")
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid credentials"
+
+    response = client.post("api/auth/token", json={
+        "email": "user@example.com",
+        "password": "passwordpassword",
+        "otp": "000000"
+    })
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid OTP code"
+
+    response = client.post("api/auth/token", json={
+        "email": "missingotp@example.com",
+        "password": "passwordpassword",
+        "otp": "000000"
+    })
+    assert response.status_code == 401
+
+def test_token_expired(client, db, valid_otp_for_email):
+    user = db.query(User).filter(User.email == "user@example.com").first()
+    user.expire = datetime.now(timezone.utc) - timedelta(days=1)
+    db.commit()
+
+    response = client.post("api/auth/token", json={
+        "email": "user@example.com",
+        "password": "passwordpassword",
+        "otp": valid_otp_for_email("user@example.com")
+    })
+    assert response.status_code == 403
+    assert "access_token" not in response.json()
+
+def test_token_shares_login_rate_limit(client, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "capacity", 1)
+    credentials = {"email": "user@example.com", "password": "wrongpasspassword", "otp": "123456"}
+    assert client.post("api/auth/login", json=credentials).status_code == 400
+    assert client.post("api/auth/token", json=credentials).status_code == 429
+
+def test_login_rate_limited(client, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "capacity", 2)
+    credentials = {"email": "user@example.com", "password": "wrongpasspassword", "otp": "123456"}
+    with patch("app.auth.verify_password", return_value=False) as verify_password:
+        assert client.post("api/auth/login", json=credentials).status_code == 400
+        assert client.post("api/auth/login", json=credentials).status_code == 400
+        response = client.post("api/auth/login", json=credentials)
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Too many attempts, please retry later"
+    assert int(response.headers["Retry-After"]) >= 1
+    # abgewiesen, bevor bcrypt läuft
+    assert verify_password.call_count == 2
+
+    # andere E-Mail von derselben IP: IP-Bucket ist ebenfalls leer
+    response = client.post("api/auth/login", json={**credentials, "email": "admin@example.com"})
+    assert response.status_code == 429
+    assert rate_limiter.stats()["rejected"]["login"] >= 2
+
+def test_successful_logins_keep_rate_limit(client, monkeypatch, valid_otp_for_email):
+    monkeypatch.setattr(rate_limiter, "capacity", 1)
+    credentials = {"email": "admin@example.com", "password": "passwordpassword", "otp": valid_otp_for_email("admin@example.com")}
+    for _ in range(3):
+        assert client.post("api/auth/token", json=credentials).status_code == 200
+
+    assert client.post("api/auth/token", json={**credentials, "password": "wrongpasspassword"}).status_code == 400
+    assert client.post("api/auth/token", json=credentials).status_code == 429
+
+def test_verify_rate_limited(client, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "capacity", 1)
+    otp_data = {"email": "user@example.com", "otp_code": "000000"}
+    assert client.post("api/auth/verify", json=otp_data).status_code == 401
+    assert client.post("api/auth/verify", json=otp_data).status_code == 429
+
 def test_login_success_wrong_otp(client, db):
     email = "admin@example.com"
     response = client.post("api/auth/login", json={
@@ -211,8 +317,8 @@ def test_get_invite_uses_left_invalid_code(authenticated_client_for_email):
     data = response.json()
     assert data["use_left"] == 0
 
-@patch("app.api.endpoints.auth.send_email")
-def test_forgot_password(mock_send_email, client, db):
+@patch("app.api.endpoints.auth.enqueue_email")
+def test_forgot_password(mock_enqueue_email, client, db):
     token = db.query(PasswordResetToken).filter(PasswordResetToken.user_id == 2).first()
     assert token is None
 
@@ -221,16 +327,25 @@ def test_forgot_password(mock_send_email, client, db):
     assert response.status_code == 200
     assert response.json()["message"].startswith("If the email exists")
 
-    mock_send_email.assert_called_once()
-    args, kwargs = mock_send_email.call_args
+    mock_enqueue_email.assert_called_once()
+    args, kwargs = mock_enqueue_email.call_args
     assert kwargs["to"] == "user@example.com"
 
     token = db.query(PasswordResetToken).filter(PasswordResetToken.user_id == 2).first()
     assert token is not None
     assert token.user_id == 2
 
-@patch("app.api.endpoints.auth.send_email")
-def test_forgot_password_wrong_email(mock_send_email, client, db):
+def test_forgot_password_outbox(client, db):
+    response = client.post("/api/auth/forgot-password", json={"email": "user@example.com"})
+    assert response.status_code == 200
+
+    entry = db.query(EmailOutbox).one()
+    assert entry.recipient == "user@example.com"
+    assert entry.status == "pending"
+    assert "/reset-password?token=" in entry.body
+
+@patch("app.api.endpoints.auth.enqueue_email")
+def test_forgot_password_wrong_email(mock_enqueue_email, client, db):
     tokens = db.query(PasswordResetToken).all()
     assert len(tokens) == 0
 
@@ -239,7 +354,7 @@ def test_forgot_password_wrong_email(mock_send_email, client, db):
     assert response.status_code == 200
     assert response.json()["message"].startswith("If the email exists")
 
-    mock_send_email.assert_not_called()
+    mock_enqueue_email.assert_not_called()
 
     tokens = db.query(PasswordResetToken).all()
     assert len(tokens) == 0
@@ -328,8 +443,8 @@ def test_reset_password_token_expired(client, db):
     assert response.status_code == 400
     assert response.json()["detail"] == "Invalid or expired token"
 
-@patch("app.api.endpoints.auth.send_email")
-def test_reset_password_with_nginx(mock_send_email, monkeypatch, client):
+@patch("app.api.endpoints.auth.enqueue_email")
+def test_reset_password_with_nginx(mock_enqueue_email, monkeypatch, client):
     domain = "domain.tld"
     monkeypatch.setattr(config_module.settings, "nginx_enabled", True)
     monkeypatch.setattr(config_module.settings, "public_url", domain)
@@ -339,8 +454,8 @@ def test_reset_password_with_nginx(mock_send_email, monkeypatch, client):
     assert response.status_code == 200
     assert "message" in response.json()
 
-    mock_send_email.assert_called_once()
-    args, kwargs = mock_send_email.call_args
+    mock_enqueue_email.assert_called_once()
+    args, kwargs = mock_enqueue_email.call_args
     assert kwargs["to"] == "user@example.com"
     assert f"https://{domain}/reset-password?token=" in kwargs["body"]
 
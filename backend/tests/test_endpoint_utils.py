@@ -17,3 +17,24 @@ def test_page_exists_invalid_name_absolute(client):
     response = client.get("api/utils/page-exists", params={"file": "/etc/passwd"})
     assert response.status_code == 400
     assert response.json()["detail"] == "Invalid file name"
+
+def test_metrics_admin(authenticated_client_for_email):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.get("api/utils/metrics")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["hashing"]["completed"] >= 1
+    assert data["hashing"]["rejected"] == 0
+    assert data["email_outbox"] == {"pending": 0, "failed": 0}
+    assert "checked_out" in data["db_pool"]
+    assert "hits" in data["reference_cache"]
+    assert "entries" in data["suggest_index"]
+    assert data["rate_limit"]["enabled"] is True
+
+def test_metrics_user(authenticated_client_for_email, client):
+    authenticated_client = authenticated_client_for_email("user@example.com")
+    response = authenticated_client.get("api/utils/metrics")
+    assert response.status_code == 403
+
+    response = client.get("api/utils/metrics")
+    assert response.status_code == 401
@@ -77,6 +77,17 @@ def test_update_languagemodel(authenticated_client_for_email):
     assert data["is_active"] is False
 
 
+def test_update_languagemodel_refreshes_catalog(authenticated_client_for_email, client):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.put("api/languagemodels/1", json={
+        "name": "Updated Model",
+    })
+    assert response.status_code == 200
+
+    response = client.get("/api/applications/with-manufacturer")
+    assert {app["languagemodel_name"] for app in response.json()} == {"Updated Model"}
+
+
 def test_update_languagemodel_wrong_id(authenticated_client_for_email):
     authenticated_client = authenticated_client_for_email("admin@example.com")
     response = authenticated_client.put(f"api/languagemodels/100", json={
@@ -79,6 +79,47 @@ def test_update_manufacturer(authenticated_client_for_email):
     assert data["is_active"] is False
 
 
+def test_update_manufacturer_refreshes_catalog(authenticated_client_for_email, client):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.put("api/manufacturers/1", json={
+        "name": "Contoso",
+        "description": "Tech",
+        "is_active": True
+    })
+    assert response.status_code == 200
+
+    response = client.get("/api/applications/with-manufacturer")
+    assert {app["manufacturer_name"] for app in response.json()} == {"Contoso"}
+
+
+def test_get_manufacturers_not_modified(authenticated_client_for_email, client):
+    response = client.get("api/manufacturers/")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    response = client.get("api/manufacturers/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get("api/manufacturers/", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.put("api/manufacturers/1", json={
+        "name": "Contoso",
+        "description": "Tech",
+        "is_active": True
+    })
+    assert response.status_code == 200
+
+    response = client.get("api/manufacturers/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "Contoso" in [m["name"] for m in response.json()]
+
+
 def test_update_manufacturer_wrong_id(authenticated_client_for_email):
     authenticated_client = authenticated_client_for_email("admin@example.com")
     response = authenticated_client.put(f"api/manufacturers/100", json={
@@ -120,3 +161,16 @@ def test_search_manufacturers(client, db):
     data = response.json()
     assert data == []
     assert len(data) == 0
+
+def test_search_manufacturers_threshold_and_limit(client, db):
+    db.add(Manufacturer(name="Applex", description="Tech", is_active=True))
+    db.commit()
+
+    response = client.get("/api/manufacturers/search?q=apple")
+    assert [item["name"] for item in response.json()] == ["Apple", "Applex"]
+
+    response = client.get("/api/manufacturers/search?q=apple&limit=1")
+    assert [item["name"] for item in response.json()] == ["Apple"]
+
+    response = client.get("/api/manufacturers/search?q=apple&threshold=1")
+    assert response.json() == []
@@ -67,6 +67,16 @@ def test_update_languagemodel(authenticated_client_for_email):
     data = response.json()
     assert data["name"] == "Updated Model"
 
+def test_update_modelchoice_refreshes_catalog(authenticated_client_for_email, client):
+    authenticated_client = authenticated_client_for_email("admin@example.com")
+    response = authenticated_client.put("api/modelchoices/1", json={
+        "name": "Updated Model",
+    })
+    assert response.status_code == 200
+
+    response = client.get("/api/applications/with-manufacturer")
+    assert {app["modelchoice_name"] for app in response.json()} == {"Updated Model"}
+
 def test_update_languagemodel_wrong_id(authenticated_client_for_email):
     authenticated_client = authenticated_client_for_email("admin@example.com")
     response = authenticated_client.put(f"api/modelchoices/100", json={
@@ -0,0 +1,92 @@
+import os
+import time
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql
+
+from app.api.endpoints.applications import select_applications_for_user, select_export_rows
+from app.api.endpoints.search import SEARCH_SQL
+from app.models import User
+
+
+def explain(db, stmt, analyze=False) -> dict:
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+    return db.execute(text(f"EXPLAIN ({options}) {sql}")).scalar()[0]
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+def scans_of(plan, relation) -> set:
+    return {node["Node Type"] for node in plan_nodes(plan["Plan"]) if node.get("Relation Name") == relation}
+
+
+def test_foreign_key_indexes_exist(engine):
+    inspector = inspect(engine)
+    application_indexes = {index["name"] for index in inspector.get_indexes("applications")}
+    assert {"ix_applications_manufacturer_id", "ix_applications_languagemodel_id", "ix_applications_modelchoice_id"} <= application_indexes
+
+    user_indexes = {index["name"] for index in inspector.get_indexes("application_users")}
+    assert "ix_application_users_application_id" in user_indexes
+    constraints = {c["name"]: c["column_names"] for c in inspector.get_unique_constraints("application_users")}
+    assert constraints["uq_application_users_user_application"] == ["user_id", "application_id"]
+
+
+def test_search_uses_trigram_indexes(db):
+    """Beide Zweige des OR im Anwendungsteil von SEARCH_SQL laufen über einen Trigramm-Index."""
+    try:
+        # bei wenigen Testzeilen wäre der Seq Scan sonst immer billiger
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {SEARCH_SQL.text}"), {"query": "office", "threshold": 0.3, "limit": 20}).scalar()[0]
+        assert "Seq Scan" not in scans_of(plan, "applications")
+        indexes = {node.get("Index Name") for node in plan_nodes(plan["Plan"])}
+        assert {"ix_application_name_trgm_gist", "ix_applications_description_trgm"} <= indexes
+    finally:
+        db.rollback()
+
+
+@pytest.mark.skipif(not os.getenv("RUN_QUERY_PLAN_BENCHMARK"), reason="set RUN_QUERY_PLAN_BENCHMARK=1 to load 1M application_users rows")
+def test_application_user_join_plans_at_scale(db):
+    """1000 User x 1000 Anwendungen; alles in einer Transaktion, die am Ende zurückgerollt wird."""
+    try:
+        db.execute(text("""
+            INSERT INTO users (username, email, hashed_password, is_active, is_admin)
+            SELECT 'bench' || g, 'bench' || g || '@example.com', 'x', true, false
+            FROM generate_series(1, 1000) g
+        """))
+        db.execute(text("""
+            INSERT INTO applications (name, manufacturer_id, languagemodel_id, modelchoice_id, is_active, created_at, updated_at)
+            SELECT 'Bench ' || g, 1 + g % 2, 1, 1, true, now(), now()
+            FROM generate_series(1, 1000) g
+        """))
+        db.execute(text("""
+            INSERT INTO application_users (user_id, application_id, selected, risk_id)
+            SELECT u.id, a.id, (u.id + a.id) % 2 = 0, 1
+            FROM users u CROSS JOIN applications a
+            WHERE u.username LIKE 'bench%' AND a.name LIKE 'Bench %'
+        """))
+        db.execute(text("ANALYZE users"))
+        db.execute(text("ANALYZE applications"))
+        db.execute(text("ANALYZE application_users"))
+        assert db.execute(text("SELECT count(*) FROM application_users")).scalar() >= 1_000_000
+
+        user = db.query(User).filter_by(username="bench500").one()
+        stmt, _ = select_applications_for_user(user)
+        queries = {
+            "with-manufacturer-user": stmt,
+            "export": select_export_rows(user.id),
+        }
+        for name, query in queries.items():
+            start = time.perf_counter()
+            plan = explain(db, query, analyze=True)
+            elapsed = time.perf_counter() - start
+
+            scans = scans_of(plan, "application_users")
+            detail = f"{name}: {plan['Execution Time']:.1f} ms ({elapsed * 1000:.1f} ms incl. planning), application_users scans: {sorted(scans)}"
+            assert scans, detail
+            assert "Seq Scan" not in scans, detail
+    finally:
+        db.rollback()
@@ -0,0 +1,92 @@
+from app.models import Application, LanguageModel, Manufacturer
+
+
+def test_search_all_types(client, db):
+    db.add_all([
+        Manufacturer(name="Microsoft Research", description="Forschung", is_active=True),
+        LanguageModel(name="Microsoft Phi", description="", is_active=True),
+        Application(name="Copilot", description="Assistent von Microsoft", manufacturer_id=1, languagemodel_id=1, modelchoice_id=1, is_active=True),
+    ])
+    db.commit()
+
+    response = client.get("/api/search/?q=microsoft")
+    assert response.status_code == 200
+    hits = response.json()
+    found = {(hit["type"], hit["name"]) for hit in hits}
+    assert ("manufacturer", "Microsoft") in found
+    assert ("manufacturer", "Microsoft Research") in found
+    assert ("language_model", "Microsoft Phi") in found
+    # Treffer über die Beschreibung
+    assert ("application", "Copilot") in found
+
+    # exakter Treffer zuerst, danach absteigend nach Ähnlichkeit
+    assert (hits[0]["type"], hits[0]["name"]) == ("manufacturer", "Microsoft")
+    scores = [hit["score"] for hit in hits]
+    assert scores == sorted(scores, reverse=True)
+
+def test_search_threshold_and_limit(client):
+    response = client.get("/api/search/?q=office&limit=1")
+    assert [(hit["type"], hit["name"]) for hit in response.json()] == [("application", "Office")]
+
+    response = client.get("/api/search/?q=office&threshold=1")
+    assert response.json() == []
+
+    response = client.get("/api/search/?q=ibm")
+    assert response.json() == []
+
+    for query in ("q=o", "q=office&threshold=0", "q=office&limit=101"):
+        assert client.get(f"/api/search/?{query}").status_code == 422
+
+def test_fulltext_search(client, db):
+    db.add_all([
+        Application(name="DeepL", description="Übersetzt Dokumente und Texte zwischen vielen Sprachen", manufacturer_id=2, languagemodel_id=1, modelchoice_id=1, is_active=True),
+        Application(name="Grammarly", description="Checks spelling and grammar in English documents", manufacturer_id=2, languagemodel_id=1, modelchoice_id=1, is_active=True),
+        Manufacturer(name="Dokumentenwerk", description="Hersteller von Software für Dokumente", is_active=True),
+    ])
+    db.commit()
+
+    # deutsche Stammformen: "Dokument" findet "Dokumente"
+    response = client.get("/api/search/fulltext?q=Dokument")
+    assert response.status_code == 200
+    hits = response.json()
+    assert {(hit["type"], hit["name"]) for hit in hits} == {("application", "DeepL"), ("manufacturer", "Dokumentenwerk")}
+    deepl = next(hit for hit in hits if hit["name"] == "DeepL")
+    assert "<mark>Dokumente</mark>" in deepl["headline"]
+
+    # englische Stammformen und websearch-Syntax
+    response = client.get('/api/search/fulltext?q=checking -translation')
+    assert [hit["name"] for hit in response.json()] == ["Grammarly"]
+
+    response = client.get('/api/search/fulltext?q="spelling and grammar"')
+    assert [hit["name"] for hit in response.json()] == ["Grammarly"]
+
+    response = client.get("/api/search/fulltext?q=Dokument -Übersetzt")
+    assert [hit["name"] for hit in response.json()] == ["Dokumentenwerk"]
+
+    # Namenstreffer (Gewicht A) vor Beschreibungstreffern
+    response = client.get("/api/search/fulltext?q=office software")
+    names = [hit["name"] for hit in response.json()]
+    assert names[0] == "Office"
+
+def test_fulltext_search_escapes_headline(client, db):
+    db.add(Application(name="Scripted", description='Tool <script>alert("x")</script> für Dokumente & Tabellen', manufacturer_id=2, languagemodel_id=1, modelchoice_id=1, is_active=True))
+    db.commit()
+
+    response = client.get("/api/search/fulltext?q=Dokument")
+    headline = next(hit["headline"] for hit in response.json() if hit["name"] == "Scripted")
+    assert "<script>" not in headline
+    assert "&lt;/script&gt;" in headline
+    assert "&amp;" in headline
+    assert "<mark>Dokumente</mark>" in headline
+    assert headline.replace("<mark>", "").replace("</mark>", "").count("<") == 0
+
+def test_fulltext_search_follows_updates(client, db):
+    app = db.query(Application).filter_by(name="Alexa").one()
+    app.description = "Sprachassistent für Smart Homes"
+    db.commit()
+
+    response = client.get("/api/search/fulltext?q=Sprachassistent")
+    assert [hit["name"] for hit in response.json()] == ["Alexa"]
+
+    response = client.get("/api/search/fulltext?q=und")
+    assert response.json() == []
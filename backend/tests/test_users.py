@@ -1,8 +1,12 @@
 from datetime import datetime, timezone, UTC
 from dateutil.relativedelta import relativedelta
+import pytest
 from app import auth
+from app.config import settings
 from app.models import Application, AuthInvite, Manufacturer, PaymentToken, User
+from app.utils.rate_limit import rate_limiter
 from app.utils.token import generate_unique_token
+from app.utils.user_cache import user_cache
 
 def new_user(authenticated_client):
     response = authenticated_client.post("api/users/", json={
@@ -111,6 +115,36 @@ def test_get_user_user(authenticated_client_for_email):
     data = response.json()
 
 
+@pytest.fixture
+def stateless_jwt(monkeypatch):
+    monkeypatch.setattr(settings, "jwt_stateless", True)
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+def test_get_user_stateless_claims(stateless_jwt, authenticated_client_for_email, db):
+    authenticated_client = authenticated_client_for_email("user@example.com")
+
+    user = db.query(User).filter(User.email == "user@example.com").first()
+    user.is_admin = True
+    db.commit()
+
+    # ohne Invalidierung gelten die Claims des Tokens
+    response = authenticated_client.get("api/users/")
+    assert response.status_code == 403
+
+def test_get_user_stateless_invalidated(stateless_jwt, authenticated_client_for_email):
+    user_client = authenticated_client_for_email("user@example.com")
+    response = user_client.get("api/users/")
+    assert response.status_code == 403
+
+    admin_client = authenticated_client_for_email("admin@example.com")
+    response = admin_client.put("api/users/2", json={"is_admin": True})
+    assert response.status_code == 200
+
+    response = user_client.get("api/users/")
+    assert response.status_code == 200
+
 def test_update_user(client,authenticated_client_for_email):
     email="admin@example.com"
     authenticated_client = authenticated_client_for_email(email)
@@ -509,3 +543,17 @@ def test_update_payments_wrong_data(client, db):
     response = client.put("/api/users/payments", json=payload)
     assert response.status_code == 404
     assert response.json()["detail"] == "User not found or invalid OTP code"
+
+
+def test_update_payments_rate_limited(client, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "capacity", 2)
+    payload = {"email": "user@example.com", "token": "xyz", "otp": "123456"}
+
+    assert client.put("/api/users/payments", json=payload).status_code == 404
+    # anderer Scope: Fehlversuche beim Login zählen nicht gegen die Zahlungen
+    assert client.post("api/auth/verify", json={"email": "user@example.com", "otp_code": "000000"}).status_code == 401
+    assert client.put("/api/users/payments", json=payload).status_code == 404
+
+    response = client.put("/api/users/payments", json=payload)
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
@@ -1,7 +1,10 @@
 import pytest
+import smtplib
+from datetime import datetime, timedelta, UTC
 from unittest.mock import patch, MagicMock
-from app.utils.email import send_email
+from app.utils.email import send_email, enqueue_email, outbox_stats, EmailDispatcher
 from app.config import settings
+from app.models import EmailOutbox
 
 @patch("utils.email.smtplib.SMTP_SSL")
 def test_send_email_success(mock_smtp_ssl):
@@ -17,3 +20,66 @@ def test_send_email_success(mock_smtp_ssl):
     mock_smtp_ssl.assert_called_once()
     mock_server.login.assert_called_once_with(settings.sender_email, settings.smtp_password)
     mock_server.sendmail.assert_called_once()
+
+
+def queue_mails(db, count):
+    for i in range(count):
+        enqueue_email(db, to=f"user{i}@example.com", subject="Betreff", body="Inhalt")
+    db.commit()
+
+@patch("app.utils.email.smtplib.SMTP_SSL")
+def test_dispatch_pending_single_connection(mock_smtp_ssl, db):
+    mock_server = MagicMock()
+    mock_smtp_ssl.return_value.__enter__.return_value = mock_server
+    queue_mails(db, 3)
+    assert outbox_stats(db) == {"pending": 3, "failed": 0}
+
+    dispatcher = EmailDispatcher(batch_size=10, max_attempts=3, poll_seconds=1, backoff_seconds=60)
+    assert dispatcher.dispatch_pending(db) == 3
+
+    mock_smtp_ssl.assert_called_once()
+    mock_server.login.assert_called_once_with(settings.sender_email, settings.smtp_password)
+    assert mock_server.sendmail.call_count == 3
+    assert outbox_stats(db) == {"pending": 0, "failed": 0}
+    assert all(entry.status == "sent" for entry in db.query(EmailOutbox).all())
+
+    assert dispatcher.dispatch_pending(db) == 0
+
+@patch("app.utils.email.smtplib.SMTP_SSL")
+def test_dispatch_pending_retry_backoff(mock_smtp_ssl, db):
+    mock_smtp_ssl.side_effect = smtplib.SMTPConnectError(421, "unavailable")
+    queue_mails(db, 1)
+
+    dispatcher = EmailDispatcher(batch_size=10, max_attempts=2, poll_seconds=1, backoff_seconds=60)
+    assert dispatcher.dispatch_pending(db) == 1
+
+    entry = db.query(EmailOutbox).one()
+    assert entry.status == "pending"
+    assert entry.attempts == 1
+    assert entry.next_attempt_at > datetime.now(UTC) + timedelta(seconds=30)
+    assert "unavailable" in entry.last_error
+
+    # noch nicht fällig
+    assert dispatcher.dispatch_pending(db) == 0
+
+    entry.next_attempt_at = datetime.now(UTC) - timedelta(seconds=1)
+    db.commit()
+    assert dispatcher.dispatch_pending(db) == 1
+
+    db.refresh(entry)
+    assert entry.status == "failed"
+    assert entry.attempts == 2
+    assert outbox_stats(db) == {"pending": 0, "failed": 1}
+
+@patch("app.utils.email.smtplib.SMTP_SSL")
+def test_dispatch_pending_recipient_refused(mock_smtp_ssl, db):
+    mock_server = MagicMock()
+    mock_server.sendmail.side_effect = [smtplib.SMTPRecipientsRefused({}), {}]
+    mock_smtp_ssl.return_value.__enter__.return_value = mock_server
+    queue_mails(db, 2)
+
+    dispatcher = EmailDispatcher(batch_size=10, max_attempts=3, poll_seconds=1, backoff_seconds=60)
+    assert dispatcher.dispatch_pending(db) == 2
+
+    statuses = sorted(entry.status for entry in db.query(EmailOutbox).all())
+    assert statuses == ["pending", "sent"]
@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from app.utils.hashing import HashingPool, HashingPoolSaturated
+
+
+def test_hashing_pool_run():
+    pool = HashingPool(max_workers=2, max_pending=2)
+    assert pool.run(lambda a, b: a + b, 1, 2) == 3
+
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["running"] == 0
+    assert stats["queued"] == 0
+
+def test_hashing_pool_saturated():
+    pool = HashingPool(max_workers=1, max_pending=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=pool.run, args=(block,))
+    worker.start()
+    started.wait(5)
+
+    assert pool.stats()["running"] == 1
+    with pytest.raises(HashingPoolSaturated):
+        pool.run(lambda: None)
+    assert pool.stats()["rejected"] == 1
+
+    release.set()
+    worker.join(5)
+    assert pool.run(lambda: "ok") == "ok"
+
+def test_hashing_pool_check_request_threads():
+    pool = HashingPool(max_workers=4, max_pending=32)
+    # Konfiguration wird nicht umgeschrieben, sondern abgelehnt
+    assert pool.max_pending == 32
+    with pytest.raises(ValueError, match="hashing_reserved_threads"):
+        pool.check_request_threads(request_threads=40, reserved_threads=30)
+
+    HashingPool(max_workers=4, max_pending=4).check_request_threads(request_threads=40, reserved_threads=30)
+
+def test_startup_rejects_hashing_config(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import main
+
+    monkeypatch.setattr(main.settings, "hashing_reserved_threads", 39)
+    with pytest.raises(ValueError, match="hashing_reserved_threads"):
+        with TestClient(main.app):
+            pass
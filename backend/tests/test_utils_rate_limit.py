@@ -0,0 +1,126 @@
+import pytest
+from fastapi import Request
+from sqlalchemy import text
+
+from app.utils.rate_limit import DatabaseBucketStore, MemoryBucketStore, RateLimiter, RateLimitExceeded, client_ip, parse_trusted_proxies, retry_after_header
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("app.utils.rate_limit.time.monotonic", clock)
+    return clock
+
+
+def test_memory_store_refill(clock):
+    store = MemoryBucketStore()
+    assert store.take(["a"], 2, 1) == 0
+    assert store.take(["a"], 2, 1) == 0
+    assert store.take(["a"], 2, 1) == pytest.approx(1)
+
+    clock.now += 0.5
+    assert store.take(["a"], 2, 1) == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert store.take(["a"], 2, 1) == 0
+
+    # nie mehr als capacity Tokens
+    clock.now += 100
+    assert store.take(["a"], 2, 1) == 0
+    assert store.take(["a"], 2, 1) == 0
+    assert store.take(["a"], 2, 1) > 0
+
+def test_memory_store_takes_all_or_nothing(clock):
+    store = MemoryBucketStore()
+    assert store.take(["ip", "email"], 1, 1) == 0
+    assert store.take(["ip", "other"], 1, 1) > 0
+    # abgewiesener Versuch hat "other" nicht belastet
+    clock.now += 1
+    assert store.take(["other"], 1, 1) == 0
+    assert store.take(["other"], 1, 1) > 0
+
+def test_memory_store_prunes_full_buckets(clock):
+    store = MemoryBucketStore(max_keys=2)
+    store.take(["a"], 5, 1)
+    store.take(["b"], 5, 1)
+    clock.now += 10
+    store.take(["c"], 5, 1)
+    assert store.size() == 1
+
+def test_rate_limiter_check(clock):
+    limiter = RateLimiter(MemoryBucketStore(), burst=1, per_minute=60)
+    limiter.check("login", "1.2.3.4", "User@Example.com")
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        limiter.check("login", "5.6.7.8", "user@example.com ")
+    assert retry_after_header(exc_info.value) == "1"
+
+    # eigene Buckets je Scope
+    limiter.check("verify", "1.2.3.4", "user@example.com")
+
+    stats = limiter.stats()
+    assert stats["allowed"] == {"login": 1, "verify": 1}
+    assert stats["rejected"] == {"login": 1}
+    assert stats["buckets"] == 5
+
+def test_rate_limiter_disabled():
+    limiter = RateLimiter(MemoryBucketStore(), burst=1, per_minute=1, enabled=False)
+    for _ in range(3):
+        limiter.check("login", "1.2.3.4", "user@example.com")
+    assert limiter.stats()["allowed"] == {}
+
+def test_database_store(db):
+    store = DatabaseBucketStore(prune_every=3)
+    store.reset()
+    try:
+        assert store.take(["login:ip:1.2.3.4", "login:email:a@example.com"], 2, 0.01) == 0
+        assert store.take(["login:ip:1.2.3.4", "login:email:b@example.com"], 2, 0.01) == 0
+        wait = store.take(["login:ip:1.2.3.4", "login:email:c@example.com"], 2, 0.01)
+        assert 0 < wait <= 100
+
+        tokens = dict(db.execute(text("SELECT key, tokens FROM rate_limit_buckets")).all())
+        assert tokens["login:email:a@example.com"] == pytest.approx(1, abs=0.01)
+        # abgewiesener Versuch: nichts abgezogen
+        assert tokens["login:email:c@example.com"] == pytest.approx(2)
+        assert tokens["login:ip:1.2.3.4"] < 1
+
+        store.refund(["login:ip:1.2.3.4"], 2)
+        ip_tokens = db.execute(text("SELECT tokens FROM rate_limit_buckets WHERE key = 'login:ip:1.2.3.4'")).scalar()
+        assert ip_tokens == pytest.approx(tokens["login:ip:1.2.3.4"] + 1)
+    finally:
+        db.rollback()
+        store.reset()
+
+def test_refund_after_success(clock):
+    limiter = RateLimiter(MemoryBucketStore(), burst=2, per_minute=1)
+    for _ in range(10):
+        limiter.check("login", "10.0.0.1", "user@example.com")
+        limiter.refund("login", "10.0.0.1", "user@example.com")
+
+    limiter.check("login", "10.0.0.1", "user@example.com")
+    limiter.check("login", "10.0.0.1", "user@example.com")
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("login", "10.0.0.1", "user@example.com")
+    assert limiter.stats()["refunded"] == {"login": 10}
+
+def test_client_ip_behind_trusted_proxy():
+    trusted = parse_trusted_proxies("127.0.0.1, 10.0.0.0/8")
+
+    def request(host, forwarded=None):
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return Request({"type": "http", "client": (host, 1234), "headers": headers})
+
+    assert client_ip(request("203.0.113.5", "198.51.100.1"), trusted) == "203.0.113.5"
+    assert client_ip(request("127.0.0.1", "198.51.100.1"), trusted) == "198.51.100.1"
+    # vom Client gesetzte Einträge links vom letzten Proxy zählen nicht
+    assert client_ip(request("127.0.0.1", "1.1.1.1, 198.51.100.1, 10.1.2.3"), trusted) == "198.51.100.1"
+    assert client_ip(request("127.0.0.1"), trusted) == "127.0.0.1"
+    assert client_ip(request("127.0.0.1", "198.51.100.1"), []) == "127.0.0.1"
@@ -0,0 +1,86 @@
+import time
+from unittest import mock
+
+from sqlalchemy import select
+
+from app.models import CatalogVersion, ModelChoice
+from app.utils.reference_cache import ReferenceCache, ReferenceCacheListener
+
+
+def test_reference_cache_rows(db):
+    cache = ReferenceCache(ttl=60)
+    rows = cache.rows(db, "model_choices")
+    assert [row.name for row in rows] == ["unknown", "web"]
+
+    assert cache.rows(db, "model_choices") is rows
+    assert cache.stats()["loads"] == 1
+    assert cache.stats()["hits"] == 1
+
+def test_reference_cache_ttl(db):
+    cache = ReferenceCache(ttl=60)
+    cache.rows(db, "risk")
+
+    with mock.patch("app.utils.reference_cache.time.monotonic", return_value=time.monotonic() + 61):
+        cache.rows(db, "risk")
+    assert cache.stats()["loads"] == 2
+
+def test_reference_cache_get_reloads_on_miss(db):
+    cache = ReferenceCache(ttl=60)
+    assert cache.get(db, "model_choices", 1).name == "unknown"
+
+    mc = ModelChoice(name="company")
+    db.add(mc)
+    db.commit()
+
+    assert cache.get(db, "model_choices", mc.id).name == "company"
+    assert cache.get(db, "model_choices", 9999) is None
+    assert cache.missing(db, "application_area", [1, 3, 9999]) == [9999]
+
+def test_reference_cache_invalidate(db):
+    cache = ReferenceCache(ttl=60)
+    cache.rows(db, "model_choices")
+    cache.rows(db, "risk")
+
+    cache.invalidate("model_choices")
+    assert cache.stats()["cached"] == ["risk"]
+
+    cache.invalidate()
+    assert cache.stats()["cached"] == []
+
+def test_reference_cache_reloads_on_newer_version(db):
+    """Schreibzugriff über einen Worker (Cache a), Lesen über einen anderen (Cache b)."""
+    def current_version():
+        return db.execute(select(CatalogVersion.version).where(CatalogVersion.scope == "model_choices")).scalar()
+
+    worker_a = ReferenceCache(ttl=300)
+    worker_b = ReferenceCache(ttl=300)
+    assert [row.name for row in worker_b.rows(db, "model_choices", current_version())] == ["unknown", "web"]
+
+    db.add(ModelChoice(name="company"))
+    db.commit()
+    worker_a.invalidate("model_choices")
+    assert [row.name for row in worker_a.rows(db, "model_choices", current_version())] == ["company", "unknown", "web"]
+
+    # ohne Zähler bleibt b bis zum TTL beim alten Stand, mit Zähler wird neu geladen
+    assert [row.name for row in worker_b.rows(db, "model_choices")] == ["unknown", "web"]
+    assert [row.name for row in worker_b.rows(db, "model_choices", current_version())] == ["company", "unknown", "web"]
+    assert worker_b.stats()["loads"] == 2
+
+def test_reference_cache_listener(db):
+    cache = ReferenceCache(ttl=60)
+    listener = ReferenceCacheListener(cache, poll_seconds=0.1)
+    listener.start()
+    try:
+        assert listener.connected.wait(5)
+        cache.rows(db, "model_choices")
+        assert cache.stats()["cached"] == ["model_choices"]
+
+        db.query(ModelChoice).filter(ModelChoice.id == 1).update({"name": "changed"})
+        db.commit()
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and cache.stats()["cached"]:
+            time.sleep(0.05)
+        assert cache.stats()["cached"] == []
+    finally:
+        listener.stop()
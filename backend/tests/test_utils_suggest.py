@@ -0,0 +1,77 @@
+import time
+from unittest import mock
+
+from app.models import Application, Manufacturer
+from app.utils.suggest import SuggestIndex, entry_keys
+
+
+def names(entries):
+    return [(entry.type, entry.name) for entry in entries]
+
+def test_entry_keys():
+    assert entry_keys("Visual Studio Code") == ["visual studio code", "studio code", "code"]
+    assert entry_keys("GPT-4 (Turbo)") == ["gpt-4 (turbo)", "4 (turbo)", "turbo)"]
+
+def test_suggest_prefix(db):
+    index = SuggestIndex(ttl=60)
+    assert names(index.suggest(db, "o")) == [("application", "Office")]
+    assert names(index.suggest(db, "MIC")) == [("manufacturer", "Microsoft")]
+    # Wortanfänge innerhalb des Namens
+    assert names(index.suggest(db, "code")) == [("application", "Visual Studio Code")]
+    # inaktive Anwendungen fehlen
+    assert index.suggest(db, "alexa") == []
+    assert index.suggest(db, "xyz") == []
+    assert index.stats()["loads"] == 1
+
+def test_suggest_limit_and_order(db):
+    db.add_all([
+        Application(name=f"Office {i}", description="software", manufacturer_id=1, languagemodel_id=1, modelchoice_id=1, is_active=True)
+        for i in range(5)
+    ])
+    db.commit()
+
+    index = SuggestIndex(ttl=60)
+    assert [entry.name for entry in index.suggest(db, "off", limit=3)] == ["Office", "Office 0", "Office 1"]
+
+def test_suggest_upsert(db):
+    index = SuggestIndex(ttl=60)
+    index.suggest(db, "o")
+
+    index.upsert("application", 1, "Teams", True)
+    index.upsert("manufacturer", 99, "Tesla", True)
+    assert names(index.suggest(db, "te")) == [("application", "Teams"), ("manufacturer", "Tesla")]
+    assert index.suggest(db, "off") == []
+
+    index.upsert("manufacturer", 99, "Tesla", False)
+    assert names(index.suggest(db, "te")) == [("application", "Teams")]
+    # keine Datenbankabfrage für die Aktualisierung
+    assert index.stats()["loads"] == 1
+
+def test_suggest_invalidate_and_ttl(db):
+    index = SuggestIndex(ttl=60)
+    index.suggest(db, "o")
+
+    db.add(Manufacturer(name="OpenAI", description="Tech", is_active=True))
+    db.commit()
+
+    index.invalidate("risk")
+    assert names(index.suggest(db, "op")) == []
+
+    index.invalidate("manufacturers")
+    assert names(index.suggest(db, "op")) == [("manufacturer", "OpenAI")]
+    assert index.stats()["loads"] == 2
+
+    db.add(Manufacturer(name="Opera", description="Tech", is_active=True))
+    db.commit()
+
+    # abgelaufen: alter Stand sofort, Neuladen im Hintergrund
+    with mock.patch("app.utils.suggest.time.monotonic", return_value=time.monotonic() + 61):
+        assert names(index.suggest(db, "op")) == [("manufacturer", "OpenAI")]
+        index._refresh_thread.join(5)
+    assert index.stats()["loads"] == 3
+    assert names(index.suggest(db, "op")) == [("manufacturer", "OpenAI"), ("manufacturer", "Opera")]
+
+def test_suggest_blank_prefix(db):
+    index = SuggestIndex(ttl=60)
+    assert index.suggest(db, "   ") == []
+    assert index.stats()["loads"] == 0
@@ -0,0 +1,75 @@
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+from app.utils.user_cache import CachedUser, UserCache
+
+
+def cached_user(user_id=1, is_admin=False):
+    return CachedUser(id=user_id, email=f"user{user_id}@example.com", is_active=True, is_admin=is_admin)
+
+def test_user_cache_get_put():
+    cache = UserCache(ttl=60)
+    assert cache.get(1) is None
+
+    user = cache.put(cached_user())
+    assert cache.get(1) == user
+
+def test_user_cache_ttl():
+    cache = UserCache(ttl=60)
+    cache.put(cached_user())
+
+    with mock.patch("app.utils.user_cache.time.monotonic", return_value=time.monotonic() + 61):
+        assert cache.get(1) is None
+
+def test_user_cache_max_size():
+    cache = UserCache(ttl=60, max_size=2)
+    cache.put(cached_user(1))
+    cache.put(cached_user(2))
+    cache.put(cached_user(3))
+
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    assert cache.get(3) is not None
+
+def test_user_cache_invalidate():
+    cache = UserCache(ttl=60)
+    issued_at = time.time() - 10
+    cache.put(cached_user())
+
+    assert cache.invalidated_since(1, issued_at) is False
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    assert cache.invalidated_since(1, issued_at) is True
+    assert cache.invalidated_since(1, time.time() + 10) is False
+    assert cache.invalidated_since(2, issued_at) is False
+
+def test_user_cache_invalidations_expire():
+    cache = UserCache(ttl=60, invalidation_ttl=3600)
+    now = time.time()
+    with mock.patch("app.utils.user_cache.time.time", return_value=now):
+        cache.invalidate(1)
+        cache.invalidate(2)
+    with mock.patch("app.utils.user_cache.time.time", return_value=now + 1800):
+        cache.invalidate(1)
+
+    # ohne einen einzigen Cache-Treffer: alte Einträge fallen beim nächsten invalidate() weg
+    with mock.patch("app.utils.user_cache.time.time", return_value=now + 3700):
+        cache.invalidate(3)
+    assert sorted(cache._invalidated) == [1, 3]
+    assert cache.invalidated_since(1, now + 1000) is True
+    assert cache.invalidated_since(2, now - 10) is False
+
+def test_cached_user_from_claims():
+    expire = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    user = CachedUser.from_claims({
+        "user_id": 5,
+        "email": "claims@example.com",
+        "is_active": True,
+        "is_admin": False,
+        "expire": expire.isoformat(),
+    })
+    assert user.id == 5
+    assert user.is_active is True
+    assert user.is_admin is False
+    assert user.expire == expire
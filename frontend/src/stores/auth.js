@@ -12,8 +12,13 @@ export const useAuthStore = defineStore('auth', {
   actions: {
     async login(email, password, otp) {
       try {
-        const loginRes = await axios.post('/api/auth/login', { email, password, otp })
-        this.user = loginRes.data
+        // Passwort und OTP in einem Aufruf, liefert Token und Benutzer
+        const tokenRes = await axios.post('/api/auth/token', { email, password, otp })
+        this.user = tokenRes.data.user
+        this.token = tokenRes.data.access_token
+
+        localStorage.setItem('token', this.token)
+        axios.defaults.headers.common['Authorization'] = `Bearer ${this.token}`
       } catch (error) {
         console.error('Login failed:', error.response?.data || error.message)
         throw error